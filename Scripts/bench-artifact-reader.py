@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+bench-artifact-reader.py - Benchmark the hooks' shared artifact reader
+
+Writes a synthetic progress.json of about --mb megabytes to a temp dir and
+compares, for the key paths the hooks actually read, a full
+json.loads(read_text()) against shipkit-artifacts.py: streamed extraction
+(cold) and the summary sidecar (warm). Reports best-of wall time and the
+tracemalloc peak of each.
+
+Usage:
+    python Scripts/bench-artifact-reader.py              # 10 MB progress file
+    python Scripts/bench-artifact-reader.py --mb 50 --repeat 3
+"""
+
+import argparse
+import importlib.util
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ARTIFACTS = REPO_ROOT / "install" / "shared" / "hooks" / "shipkit-artifacts.py"
+
+# What each hook reads from progress.json.
+READS = {
+    "session-start  sessions[-1]": [("sessions", -1)],
+    "subagent-ctx   currentLoop/Dispatch": [("currentLoop",), ("currentDispatch",)],
+}
+
+
+def _load_artifacts():
+    spec = importlib.util.spec_from_file_location("shipkit_artifacts", ARTIFACTS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_progress(path: Path, megabytes: float) -> int:
+    """progress.json with a long session history; returns the session count."""
+    target = int(megabytes * 1024 * 1024)
+    session = {
+        "date": "2026-01-01",
+        "summary": "Implemented the checkout flow; reconciled ADR-012 with the ED. " * 2,
+        "filesChanged": [f"src/mod{i}/file{i}.ts" for i in range(20)],
+        "decisions": [{"id": f"D-{i}", "note": "kept the queue in-process " * 3} for i in range(5)],
+    }
+    per_session = len(json.dumps({"sessions": [session]}, indent=2))
+    count = max(1, target // per_session)
+    sessions = [dict(session, timestamp=f"2026-01-01T00:{i % 60:02d}:00Z") for i in range(count)]
+    data = {
+        "$schema": "shipkit-artifact",
+        "type": "progress",
+        "currentLoop": "build",
+        "currentDispatch": "spec-042",
+        "sessions": sessions,
+        "summary": {"sessionCount": count},
+    }
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return count
+
+
+def measure(fn, repeat: int) -> tuple[float, float]:
+    """(best-of-repeat ms, tracemalloc peak MB of one run)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best * 1000, peak / (1024 * 1024)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark the hooks' shared artifact reader.")
+    p.add_argument("--mb", type=float, default=10, help="progress.json size in MB (default: 10)")
+    p.add_argument("--repeat", type=int, default=5, help="runs per measurement, best kept (default: 5)")
+    args = p.parse_args()
+
+    artifacts = _load_artifacts()
+    tmp = Path(tempfile.mkdtemp(prefix="shipkit-bench-"))
+    try:
+        progress = tmp / "progress.json"
+        count = build_progress(progress, args.mb)
+        size = progress.stat().st_size / (1024 * 1024)
+        print(f"progress.json: {size:.1f} MB, {count} sessions")
+        full_ms, full_mb = measure(lambda: json.loads(progress.read_text(encoding="utf-8")), args.repeat)
+        for label, paths in READS.items():
+            sidecar = tmp / f"summaries-{len(paths)}.json"
+            expected = artifacts._walk  # sanity: streamed values match a full parse
+            data = json.loads(progress.read_text(encoding="utf-8"))
+            assert artifacts.extract(progress, paths) == {q: expected(data, q)[1] for q in paths}
+            del data
+            artifacts.read_paths(progress, paths, cache_file=sidecar)  # prime the sidecar
+            stream_ms, stream_mb = measure(lambda: artifacts.extract(progress, paths), args.repeat)
+            warm_ms, warm_mb = measure(
+                lambda: artifacts.read_paths(progress, paths, cache_file=sidecar), args.repeat)
+            print(f"\n[{label}]")
+            print(f"  full json.loads:      {full_ms:9.1f} ms   peak {full_mb:7.2f} MB")
+            print(f"  streamed extract:     {stream_ms:9.1f} ms   peak {stream_mb:7.2f} MB")
+            print(f"  summary sidecar:      {warm_ms:9.2f} ms   peak {warm_mb:7.2f} MB")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
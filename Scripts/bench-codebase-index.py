@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+bench-codebase-index.py - Benchmark the codebase-index generator
+
+Builds a synthetic project tree in a temp dir and times generate_index.py's
+hot paths against the approach they replaced.
+
+Usage:
+    python Scripts/bench-codebase-index.py                 # all cases, 5k files
+    python Scripts/bench-codebase-index.py --files 50000 --case scan
+    python Scripts/bench-codebase-index.py --files 50000 --case hash --jobs 8
+
+Cases:
+    scan   single-pass scan_tree() snapshot vs the old multi-pass probes
+           (walk + list_directories/list_config_files/parse_scripts twice)
+    hash   cold-cache update_manifest() (every file hashed, as on a full
+           rebuild or the first refresh after a cache miss): the old
+           whole-file read, then serial vs pooled hashing (--jobs)
+    session  time the session-start hook spends on the index before it can
+           render the digest: synchronous refresh vs deferred (background)
+           refresh, with a warm cache and with a cold one
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "install" / "skills" / "shipkit-codebase-index" / "scripts"))
+import generate_index as gi  # noqa: E402
+
+HOOKS_DIR = REPO_ROOT / "install" / "shared" / "hooks"
+SESSION_START = HOOKS_DIR / "shipkit-session-start.py"
+
+
+def build_tree(root: Path, n_files: int) -> None:
+    """Synthetic repo: n_files source files across nested dirs + common configs."""
+    for d in ("src/app", "src/components", "src/lib", "prisma", "tests", "docs", "node_modules/pkg"):
+        (root / d).mkdir(parents=True, exist_ok=True)
+    for name in ("tsconfig.json", "next.config.js", "prisma/schema.prisma", "node_modules/pkg/index.js"):
+        (root / name).write_text("{}\n", encoding="utf-8")
+    (root / "package.json").write_text(
+        json.dumps({"scripts": {"dev": "next dev", "build": "next build"}}), encoding="utf-8")
+    per_dir = 200
+    for i in range(n_files):
+        d = root / "src" / f"mod{i // per_dir:04d}"
+        if i % per_dir == 0:
+            d.mkdir(parents=True, exist_ok=True)
+        (d / f"file{i}.ts").write_text(f"export const v{i} = {i};\n" * 20, encoding="utf-8")
+
+
+def legacy_probes(root: Path) -> None:
+    """Structural probes alone (what the git engine pays, since it skips the walk)."""
+    for _ in range(2):
+        [c for c in gi.DIRECTORY_CANDIDATES if (root / c).is_dir()]
+        [c for c in gi.CONFIG_CANDIDATES if (root / c).exists()]
+        gi.parse_scripts(root)
+
+
+def legacy_multi_pass(root: Path) -> None:
+    """The pre-snapshot refresh: a source walk, then every candidate probed and
+    package.json parsed once for the digest and again for build_mechanical."""
+    list(gi._iter_source_files(root))
+    legacy_probes(root)
+
+
+def single_pass(root: Path) -> None:
+    gi.scan_tree(root)
+
+
+def snapshot_no_walk(root: Path) -> None:
+    gi.scan_tree(root, walk_sources=False)
+
+
+def timed(fn, root: Path, repeat: int) -> float:
+    """Best-of-repeat wall time in ms (best-of filters scheduler noise)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(root)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def case_scan(root: Path, repeat: int, jobs: int) -> None:
+    legacy = timed(legacy_multi_pass, root, repeat)
+    snap = timed(single_pass, root, repeat)
+    print(f"  multi-pass (walk + 2x probes):  {legacy:9.1f} ms")
+    print(f"  single-pass scan_tree():        {snap:9.1f} ms   ({legacy / snap:.2f}x)")
+    legacy = timed(legacy_probes, root, repeat)
+    snap = timed(snapshot_no_walk, root, repeat)
+    print(f"  git engine, 2x probes:          {legacy:9.2f} ms")
+    print(f"  git engine, scan_tree(no walk): {snap:9.2f} ms   ({legacy / snap:.2f}x)")
+
+
+def _whole_file_manifest(root, rel_paths):
+    """update_manifest() as it hashed before: each file read whole."""
+    manifest = {}
+    for rel in rel_paths:
+        path = root / rel
+        st = os.stat(path)
+        with open(path, 'rb') as f:
+            sha = hashlib.sha256(f.read()).hexdigest()
+        manifest[rel] = [st.st_size, st.st_mtime_ns, st.st_ino, sha]
+    return manifest
+
+
+def case_hash(root: Path, repeat: int, jobs: int) -> None:
+    rel_paths = gi.scan_tree(root)['source_files']
+    whole = timed(lambda r: _whole_file_manifest(r, rel_paths), root, repeat)
+    serial = timed(lambda r: gi.update_manifest(r, rel_paths, jobs=1), root, repeat)
+    pooled = timed(lambda r: gi.update_manifest(r, rel_paths, jobs=jobs), root, repeat)
+    expected = _whole_file_manifest(root, rel_paths)
+    assert gi.update_manifest(root, rel_paths, jobs=1) == expected, "serial manifest differs"
+    assert gi.update_manifest(root, rel_paths, jobs=jobs) == expected, "pooled manifest differs"
+    print(f"  {len(rel_paths)} files, cold manifest, {os.cpu_count()} CPU(s)")
+    print(f"  whole-file reads:               {whole:9.1f} ms")
+    print(f"  serial (--jobs 1):              {serial:9.1f} ms   ({whole / serial:.2f}x)")
+    print(f"  {f'pooled (--jobs {jobs}):':<32}{pooled:9.1f} ms   ({whole / pooled:.2f}x)")
+
+
+def _load_session_start():
+    sys.path.insert(0, str(HOOKS_DIR))  # for `import shipkit_runtime`
+    spec = importlib.util.spec_from_file_location("shipkit_session_start", SESSION_START)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def case_session(root: Path, repeat: int, jobs: int) -> None:
+    hook = _load_session_start()
+    skills_dir = REPO_ROOT / "install" / "skills"
+    if not (root / ".git").exists():
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        gi.generate_full(str(root))
+    cache = root / gi.CACHE_PATH
+
+    def to_digest(defer, cold):
+        def run(r):
+            if cold:
+                cache.unlink(missing_ok=True)
+            proc = hook.refresh_codebase_index(skills_dir, r, defer=defer)
+            hook.get_codebase_digest(r / ".shipkit", str(r))
+            return proc
+        return run
+
+    pending = []
+    for cold in (False, True):
+        label = "cold cache" if cold else "warm cache"
+        sync = timed(to_digest(False, cold), root, repeat)
+        deferred_run = to_digest(True, cold)
+        deferred = timed(lambda r: pending.append(deferred_run(r)), root, repeat)
+        # Let the background refreshes finish before the next measurement.
+        for proc in pending:
+            if proc is not None:
+                proc.wait()
+        pending.clear()
+        print(f"  {label}, sync refresh:        {sync:9.1f} ms")
+        print(f"  {label}, deferred refresh:    {deferred:9.1f} ms   ({sync / deferred:.1f}x sooner)")
+
+
+CASES = {
+    "scan": case_scan,
+    "hash": case_hash,
+    "session": case_session,
+}
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark generate_index.py hot paths.")
+    p.add_argument("--files", type=int, default=5000, help="synthetic source files (default: 5000)")
+    p.add_argument("--repeat", type=int, default=5, help="runs per measurement, best kept (default: 5)")
+    p.add_argument("--case", choices=sorted(CASES), action="append",
+                   help="case(s) to run (default: all)")
+    p.add_argument("--jobs", type=int, default=gi.DEFAULT_JOBS,
+                   help=f"hashing threads for the hash case (default: {gi.DEFAULT_JOBS})")
+    args = p.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="shipkit-bench-"))
+    try:
+        print(f"Building synthetic tree ({args.files} files) in {tmp} ...")
+        build_tree(tmp, args.files)
+        for name in args.case or sorted(CASES):
+            print(f"\n[{name}]")
+            CASES[name](tmp, args.repeat, args.jobs)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
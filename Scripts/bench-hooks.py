@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+bench-hooks.py - Benchmark per-event hook start-up
+
+Every hook event is a fresh `python -X utf8 <hook>.py` process, so interpreter
+start and module imports are paid on every Skill call, commit and subagent
+dispatch. This spawns each hook the way Claude Code does — payload on stdin,
+CLAUDE_PROJECT_DIR set — against a small synthetic project in a temp dir, and
+reports wall time per event next to the bare-interpreter floor.
+
+Usage:
+    python Scripts/bench-hooks.py                       # every event, 10 runs each
+    python Scripts/bench-hooks.py --event PostToolUse:Skill --repeat 30
+    python Scripts/bench-hooks.py --importtime          # + slowest imports per hook
+    python Scripts/bench-hooks.py --hooks-dir /path/to/old/install/shared/hooks
+    python Scripts/bench-hooks.py --daemon              # through shipkit-hook.py + a warm daemon
+    python Scripts/bench-hooks.py --check-update        # offline self-check of the update check
+
+--hooks-dir points at another copy of install/shared/hooks (e.g. a git worktree
+of an older commit) to compare before/after. --daemon runs every event the way
+the installed settings do, through the shipkit-hook.py client, with
+shipkit-hookd.py serving the synthetic project. --check-update benchmarks
+nothing: it drives session start's stale-while-revalidate update check against
+file:// URLs and exits non-zero if the lease, the retry backoff or the cached
+answer misbehave.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOOKS_DIR = REPO_ROOT / "install" / "shared" / "hooks"
+
+# (event label, hook script, payload). cwd/session_id are filled in per run.
+EVENTS = [
+    ("SessionStart", "shipkit-session-start.py", {"source": "startup"}),
+    ("PostToolUse:Skill", "shipkit-track-skill-usage.py",
+     {"tool_name": "Skill", "tool_input": {"skill": "shipkit-spec"}}),
+    ("PostToolUse:Bash(git commit)", "shipkit-codebase-index-refresh.py",
+     {"tool_name": "Bash", "tool_input": {"command": "git commit -m x"}}),
+    ("PostToolUseFailure", "shipkit-diagnostics.py",
+     {"tool_name": "Skill", "tool_input": {"skill": "shipkit-spec"}, "error": "boom"}),
+    ("SubagentStart", "shipkit-subagent-context.py", {"agent_type": "shipkit-builder"}),
+    ("InstructionsLoaded", "shipkit-prereq-check.py",
+     {"file_path": ".claude/skills/shipkit-spec/SKILL.md"}),
+    ("TaskCreated", "shipkit-task-created-hook.py", {"task_title": "Wire checkout"}),
+    ("TaskCompleted", "shipkit-task-completed-hook.py", {"task_description": "Wire checkout"}),
+    ("TeammateIdle", "shipkit-teammate-idle-hook.py", {}),
+    ("PermissionDenied", "shipkit-permission-denied-hook.py",
+     {"tool_name": "Read", "tool_input": {"file_path": "x"}, "denial_reason": "auto"}),
+    ("PreCompact", "shipkit-pre-compact.py", {"trigger": "auto"}),
+    ("PostCompact", "shipkit-post-compact.py", {"trigger": "auto"}),
+    ("SessionEnd", "shipkit-session-end.py", {"reason": "exit"}),
+]
+
+
+def build_project(root: Path) -> None:
+    """A small activated Shipkit project, nested one level so root lookup walks."""
+    shipkit = root / ".shipkit"
+    (shipkit / "goals").mkdir(parents=True)
+    (root / "src" / "app").mkdir(parents=True)
+    (shipkit / "why.json").write_text(json.dumps(
+        {"projectName": "bench", "stage": "mvp", "approach": {"oneLiner": "ship it"}}), encoding="utf-8")
+    (shipkit / "progress.json").write_text(json.dumps(
+        {"currentLoop": "build", "sessions": [{"summary": f"session {i}"} for i in range(50)]}),
+        encoding="utf-8")
+    (shipkit / "goals" / "strategic.json").write_text(json.dumps(
+        {"stage": {"current": "mvp", "target": "beta"}, "gates": []}), encoding="utf-8")
+    (shipkit / "orchestration.json").write_text(json.dumps({"loop": "build"}), encoding="utf-8")
+    (root / "CLAUDE.md").write_text("# bench\n@.shipkit/why.json\n", encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=False)
+
+
+def spawn(cmd: list[str], payload: bytes, env: dict, cwd: Path) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(cmd, input=payload, env=env, cwd=cwd,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - t0) * 1000
+
+
+def slowest_imports(cmd: list[str], payload: bytes, env: dict, cwd: Path, top: int = 5):
+    """Top-level imports by cumulative time, from -X importtime."""
+    out = subprocess.run([cmd[0], "-X", "importtime", *cmd[1:]], input=payload, env=env,
+                         cwd=cwd, capture_output=True).stderr.decode(errors="replace")
+    rows = []
+    for line in out.splitlines():
+        parts = line.split("|")
+        # "import time: self | cumulative | <indent>name" — top level has one space.
+        if len(parts) != 3 or not parts[1].strip().isdigit() or parts[2][1:2] == " ":
+            continue
+        rows.append((int(parts[1]) / 1000, parts[2].strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def check_update_cycle(hooks_dir: Path) -> int:
+    """Offline self-check of check_for_updates / refresh_update_check; 0 when all hold.
+
+    The background half runs as the real detached child would
+    (`--update-check <root>`), with SHIPKIT_VERSION_URL at a file:// URL.
+    """
+    sys.path.insert(0, str(hooks_dir))
+    spec = importlib.util.spec_from_file_location("session_start", hooks_dir / "shipkit-session-start.py")
+    ss = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(ss)
+    failed = []
+
+    def check(ok: bool, what: str) -> None:
+        print(f"  {'ok  ' if ok else 'FAIL'}  {what}")
+        if not ok:
+            failed.append(what)
+
+    def near(value, expected, slack=60):
+        return isinstance(value, (int, float)) and abs(value - expected) <= slack
+
+    tmp = Path(tempfile.mkdtemp(prefix="shipkit-update-check-"))
+    try:
+        (tmp / ".shipkit").mkdir()
+        (tmp / ".shipkit" / "VERSION").write_text("1.0.0\n", encoding="utf-8")
+        check_file = tmp / ".shipkit" / ".update-check.local"
+        remote = tmp / "VERSION"
+        spawned = []
+        ss._spawn_detached = lambda cmd, cwd: spawned.append(cmd)
+
+        def refresh(payload: str | None) -> dict:
+            if payload is None:
+                remote.unlink(missing_ok=True)
+            else:
+                remote.write_text(payload, encoding="utf-8")
+            env = dict(os.environ, SHIPKIT_VERSION_URL=remote.as_uri())
+            subprocess.run([sys.executable, "-X", "utf8", str(hooks_dir / "shipkit-session-start.py"),
+                            "--update-check", str(tmp)], env=env, check=True)
+            return json.loads(check_file.read_text(encoding="utf-8"))
+
+        def make_due():
+            state = json.loads(check_file.read_text(encoding="utf-8"))
+            state["nextCheckAt"] = 0
+            check_file.write_text(json.dumps(state), encoding="utf-8")
+
+        print("update check (offline):")
+        check(ss.check_for_updates(tmp) is None and len(spawned) == 1
+              and "--update-check" in spawned[0], "first session spawns one background check")
+        state = json.loads(check_file.read_text(encoding="utf-8"))
+        check(near(state.get("nextCheckAt"), time.time() + ss.UPDATE_CHECK_LEASE),
+              "it takes a lease before spawning")
+        ss.check_for_updates(tmp)
+        check(len(spawned) == 1, "a second session inside the lease spawns nothing")
+
+        state = refresh("2.0.0\n")
+        check(state.get("remote") == "2.0.0" and state.get("failures") == 0
+              and near(state.get("nextCheckAt"), time.time() + ss.UPDATE_CHECK_INTERVAL),
+              "a good answer is kept for UPDATE_CHECK_INTERVAL")
+        notice = ss.check_for_updates(tmp)
+        check(bool(notice) and "2.0.0" in notice and len(spawned) == 1,
+              "the next session reports it from the cache, without spawning")
+
+        backoff, ok = ss.UPDATE_CHECK_RETRY, True
+        for failures in range(1, 10):
+            make_due()
+            state = refresh(None if failures % 2 else "<html>offline</html>")
+            ok = ok and state.get("failures") == failures and state.get("remote") == "2.0.0" \
+                and near(state.get("nextCheckAt"), time.time() + backoff)
+            backoff = min(backoff * 2, ss.UPDATE_CHECK_MAX_BACKOFF)
+        check(ok, "failures retry after 1h, doubling, and keep the last good version")
+        check(near(state.get("nextCheckAt"), time.time() + ss.UPDATE_CHECK_MAX_BACKOFF),
+              "the retry is capped at UPDATE_CHECK_MAX_BACKOFF")
+        notice = ss.check_for_updates(tmp)
+        check(bool(notice) and "2.0.0" in notice and len(spawned) == 1,
+              "while the refresh fails, sessions still serve the cached answer")
+
+        make_due()
+        state = refresh("2.1.0")
+        check(state.get("remote") == "2.1.0" and state.get("failures") == 0
+              and "lastError" not in state, "a later success resets the backoff")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print(f"{len(failed)} failed" if failed else "all passed")
+    return 1 if failed else 0
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark per-event hook start-up.")
+    p.add_argument("--repeat", type=int, default=10, help="runs per event (default: 10)")
+    p.add_argument("--event", action="append", help="event label(s) to run (default: all)")
+    p.add_argument("--hooks-dir", type=Path, default=HOOKS_DIR,
+                   help="hooks directory to benchmark (default: this checkout's)")
+    p.add_argument("--importtime", action="store_true", help="also list each hook's slowest imports")
+    p.add_argument("--daemon", action="store_true",
+                   help="go through the shipkit-hook.py client with a running shipkit-hookd.py")
+    p.add_argument("--check-update", action="store_true",
+                   help="self-check the update check offline instead of benchmarking")
+    args = p.parse_args()
+    if args.check_update:
+        return check_update_cycle(args.hooks_dir)
+
+    events = [e for e in EVENTS if not args.event or e[0] in args.event]
+    tmp = Path(tempfile.mkdtemp(prefix="shipkit-bench-"))
+    try:
+        build_project(tmp)
+        cwd = tmp / "src" / "app"
+        env = dict(os.environ, CLAUDE_PROJECT_DIR=str(tmp),
+                   # Keep the update check off the network and the root cache out of ~/.cache.
+                   SHIPKIT_VERSION_URL="http://127.0.0.1:9/VERSION",
+                   SHIPKIT_ROOT_CACHE=str(tmp / "project-roots.json"))
+
+        hookd = args.hooks_dir / "shipkit-hookd.py"
+        if args.daemon:
+            subprocess.run([sys.executable, "-X", "utf8", str(hookd), "start"], env=env, cwd=tmp)
+            for _ in range(50):  # wait for the socket
+                status = subprocess.run([sys.executable, str(hookd), "status"], env=env, cwd=tmp,
+                                        capture_output=True, text=True).stdout
+                if status.startswith("running"):
+                    break
+                time.sleep(0.1)
+
+        floor = [spawn([sys.executable, "-X", "utf8", "-c", "pass"], b"", env, cwd)
+                 for _ in range(args.repeat)]
+        floor_ms = statistics.median(floor)
+        print(f"hooks: {args.hooks_dir}" + (" (via daemon)" if args.daemon else ""))
+        print(f"interpreter floor (python -X utf8 -c pass): {floor_ms:6.1f} ms median\n")
+        print(f"  {'event':<30}{'median':>9}{'min':>9}{'over floor':>12}")
+        for label, script, payload in events:
+            hook = args.hooks_dir / script
+            if not hook.exists():
+                print(f"  {label:<30}{'(missing)':>9}")
+                continue
+            data = json.dumps(dict(payload, cwd=str(cwd), session_id="bench")).encode()
+            cmd = [sys.executable, "-X", "utf8", str(hook)]
+            if args.daemon:
+                cmd = [sys.executable, "-X", "utf8", str(args.hooks_dir / "shipkit-hook.py"), script]
+            spawn(cmd, data, env, cwd)  # warm the page cache and .pyc files
+            runs = [spawn(cmd, data, env, cwd) for _ in range(args.repeat)]
+            median = statistics.median(runs)
+            print(f"  {label:<30}{median:8.1f}ms{min(runs):7.1f}ms{median - floor_ms:10.1f}ms")
+            if args.importtime:
+                for ms, name in slowest_imports(cmd, data, env, cwd):
+                    print(f"      {ms:6.1f} ms  {name}")
+    finally:
+        if args.daemon:
+            subprocess.run([sys.executable, str(hookd), "stop"], env=env, cwd=tmp,
+                           stdout=subprocess.DEVNULL)
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,11 @@ const { ensureDir, copyFile, copyDir, makeExecutable } = require('./copy');
 // Hook files: source name -> destination name (same as init)
 const HOOK_FILES = {
   'shipkit-session-start.py': 'session-start.py',
+  'shipkit_runtime.py': 'shipkit_runtime.py',
+  'shipkit_usage.py': 'shipkit_usage.py',
+  'shipkit-hook.py': 'shipkit-hook.py',
+  'shipkit-hookd.py': 'shipkit-hookd.py',
+  'shipkit-artifacts.py': 'shipkit-artifacts.py',
   'shipkit-track-skill-usage.py': 'shipkit-track-skill-usage.py',
   'shipkit-task-completed-hook.py': 'shipkit-task-completed-hook.py',
   'shipkit-teammate-idle-hook.py': 'shipkit-teammate-idle-hook.py',
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Shipkit artifact reader — pull a few key paths out of a large JSON artifact.
+
+Hooks that only need `sessions[-1]` of progress.json, or three keys of
+strategic.json, shouldn't materialise the whole document. read_paths() streams
+the file in chunks and keeps only the values on the requested paths: other
+top-level values are walked one member at a time with the C decoder and
+dropped, an array path like ('sessions', -1) keeps just the element it wants,
+and reading stops as soon as every requested top-level key has been seen.
+Memory is bounded by the largest value returned (or the largest member of a
+skipped one), not by the file.
+
+With a `cache_file`, the extracted values are also kept in a small summary
+sidecar keyed on the artifact's (size, mtime_ns), so a steady-state read is one
+stat plus a read of the sidecar.
+
+Not a hook — loaded by the hooks next to it via shipkit_runtime.load_sibling().
+Paths are tuples of object keys and array indices; a missing path is simply
+absent from the result. Stdlib only.
+"""
+
+import json
+import os
+import re
+from json.decoder import scanstring
+from pathlib import Path
+
+CHUNK_SIZE = 256 * 1024
+SUMMARY_CACHE_VERSION = 1
+
+_WS = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+# (resolved path, key paths) -> (stat key, result), for the life of the process.
+_memo = {}
+
+
+class _Stream:
+    """A sliding text window over a file. `pos` indexes into `buf`; compact()
+    drops everything before it, so only the value being decoded stays buffered."""
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=CHUNK_SIZE) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fh.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def compact(self):
+        # Amortised: slide only once a chunk's worth is behind pos, not per value.
+        if self.pos >= CHUNK_SIZE:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+
+    def peek(self) -> str:
+        """Next non-whitespace character (not consumed), '' at end of input."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"expected one of {chars!r} at offset {self.pos}, got {c!r}")
+        self.pos += 1
+        return c
+
+    def _decode(self, parse):
+        """Run parse(buf, pos) -> (value, end) until the buffered text holds the
+        whole value. Each retry reads twice as much, so a value that spans many
+        chunks is re-scanned O(log n) times, not once per chunk."""
+        self.peek()
+        size = CHUNK_SIZE
+        while True:
+            try:
+                value, end = parse(self.buf, self.pos)
+                # A number or literal that ends the window may continue past it.
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill(size)
+            size *= 2
+
+    def string(self) -> str:
+        """Decode the JSON string at pos (pos is on the opening quote)."""
+        return self._decode(lambda buf, pos: scanstring(buf, pos + 1))
+
+    def value(self):
+        """Decode one whole value (C decoder); only its text is buffered."""
+        return self._decode(_DECODER.raw_decode)
+
+    def members(self):
+        """Yield each member of the array or object at pos, decoded one at a
+        time, so a container is walked in memory bounded by its largest member."""
+        close = ']' if self.expect('[{') == '[' else '}'
+        if self.peek() == close:
+            self.pos += 1
+            return
+        while True:
+            if close == '}':
+                self.string()
+                self.expect(':')
+            yield self.value()
+            self.compact()
+            if self.expect(',' + close) == close:
+                return
+
+    def skip(self):
+        """Advance past one value, keeping at most one of its members in memory."""
+        if self.peek() in ('[', '{'):
+            for _ in self.members():
+                pass
+        else:
+            self.value()
+
+
+def _walk(value, path):
+    """Follow path into an already-decoded value → (found, value)."""
+    for step in path:
+        if isinstance(step, int):
+            if not isinstance(value, list) or not -len(value) <= step < len(value):
+                return False, None
+        elif not isinstance(value, dict) or step not in value:
+            return False, None
+        value = value[step]
+    return True, value
+
+
+def _read_array(stream, wanted):
+    """Stream an array, keeping only the elements whose index is in wanted.
+    Negative indices are resolved against the length once the array ends."""
+    found = {}
+    tail_n = max((-i for i in wanted if i < 0), default=0)
+    tail = []  # the last tail_n elements
+    index = 0
+    for element in stream.members():
+        if index in wanted:
+            found[index] = element
+        if tail_n:
+            tail.append(element)
+            del tail[:-tail_n]
+        index += 1
+    for i in wanted:
+        if i < 0 and -i <= index:
+            found[i] = tail[i]
+    return found
+
+
+def extract(path, paths) -> dict:
+    """Stream path and return {key_path: value} for the requested key paths.
+
+    The document must be a JSON object. Paths whose second step is an array
+    index (('sessions', -1, 'summary')) stream that array element by element;
+    any other path decodes its top-level value whole and walks into it.
+    """
+    paths = [tuple(p) for p in paths]
+    by_key = {}
+    for p in paths:
+        by_key.setdefault(p[0], []).append(p)
+    result = {}
+    with open(path, encoding='utf-8') as fh:
+        stream = _Stream(fh)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return result
+        while by_key:
+            if stream.peek() != '"':
+                raise ValueError(f"expected object key at offset {stream.pos}")
+            key = stream.string()
+            stream.expect(':')
+            key_paths = by_key.pop(key, None)
+            if key_paths is None:
+                stream.skip()
+            elif all(len(p) > 1 and isinstance(p[1], int) for p in key_paths) \
+                    and stream.peek() == '[':
+                elements = _read_array(stream, {p[1] for p in key_paths})
+                for p in key_paths:
+                    if p[1] in elements:
+                        ok, value = _walk(elements[p[1]], p[2:])
+                        if ok:
+                            result[p] = value
+            else:
+                whole = stream.value()
+                for p in key_paths:
+                    ok, value = _walk(whole, p[1:])
+                    if ok:
+                        result[p] = value
+            stream.compact()
+            if stream.expect(',}') == '}':
+                break
+    return result
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def read_paths(path, paths, cache_file=None) -> dict:
+    """{key_path: value} for each requested path present in the artifact.
+
+    Raises OSError / ValueError like json.loads(read_text()) would. Answers are
+    memoised in-process while the artifact's size and mtime are unchanged (it
+    pays off in the long-lived hook daemon). When cache_file is given, they are
+    also kept in that summary sidecar for the next process.
+    """
+    paths = [tuple(p) for p in paths]
+    key = _stat_key(path)
+    name = str(Path(path).resolve())
+    memo_key = (name, tuple(paths))
+    hit = _memo.get(memo_key)
+    if key is not None and hit and hit[0] == key:
+        return dict(hit[1])
+    result = _read_paths(path, paths, cache_file, key, name)
+    if key is not None and _stat_key(path) == key:
+        _memo[memo_key] = (key, result)
+    return dict(result)
+
+
+def _read_paths(path, paths, cache_file, key, name) -> dict:
+    if cache_file is None:
+        return extract(path, paths)
+
+    try:
+        cache = json.loads(Path(cache_file).read_text(encoding='utf-8'))
+        if cache.get('version') != SUMMARY_CACHE_VERSION:
+            cache = {}
+    except Exception:
+        cache = {}
+    entry = cache.get('artifacts', {}).get(name)
+    if key is not None and entry and entry.get('key') == key:
+        stored = entry.get('paths', {})
+        encoded = [json.dumps(p) for p in paths]
+        if all(e in stored for e in encoded):
+            return {p: stored[e][1] for p, e in zip(paths, encoded) if stored[e][0]}
+
+    result = extract(path, paths)
+    if key is None or _stat_key(path) != key:
+        return result  # changed underneath us; don't cache a torn read
+    stored = entry.get('paths', {}) if entry and entry.get('key') == key else {}
+    for p in paths:
+        stored[json.dumps(p)] = [p in result, result.get(p)]
+    cache.setdefault('artifacts', {})[name] = {'key': key, 'paths': stored}
+    cache['version'] = SUMMARY_CACHE_VERSION
+    try:
+        cache_file = Path(cache_file)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f"{cache_file.name}.tmp.{os.getpid()}")
+        tmp.write_text(json.dumps(cache, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+    return result
@@ -6,23 +6,45 @@ Deterministic (no-LLM) freshness for .shipkit/codebase-index.json.
 
 Wired as a PostToolUse hook scoped to `git commit` (if:"Bash(git commit *)") and
 also invoked from session-start. It is a THIN wrapper: it locates the index
-generator and runs it in --refresh-mechanical mode, which refreshes only the
-script-owned mechanical fields and preserves the Claude-judgment fields.
+generator, imports it and calls refresh_mechanical(root) in-process — the same
+work as `generate_index.py --refresh-mechanical`, minus a second interpreter
+start. That refreshes only the script-owned mechanical fields and preserves the
+Claude-judgment fields. Either way the refresh gets REFRESH_TIMEOUT seconds: the
+in-process one runs on a worker thread the hook stops waiting for, so a slow git
+call can't hang the PostToolUse hook. Copies of the generator that predate the
+`deadline` parameter run git in the working directory, so for those the hook
+first moves into the project root. Only a generator that fails to import, or
+has no refresh_mechanical() at all, runs as a subprocess (in the root too).
 
 Design contract:
 - Never raises, always exits 0 (a refresh failure must never break a commit/turn).
-- Early-exits silently when there is no git repo, no existing index, or no generator.
+- Early-exits silently when there is no git repo, no existing index, no generator,
+  or a live `generate_index.py --watch` already keeping the index fresh.
 - Idempotent and fork-safe (the generator writes atomically); PostToolUse hooks
-  fire at every fork depth, so this may run concurrently — that is tolerated.
+  fire at every fork depth, so this may run concurrently — the generator
+  serialises concurrent refreshes and lets waiters reuse a fresh result.
 """
 
+import importlib.util
+import io
 import os
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 
+import shipkit_runtime as rt
+
 HOOK_NAME = "codebase-index-refresh"
 
+# Heartbeat file of a running `generate_index.py --watch`; it is rewritten every
+# ~10s, so anything younger than this means the watcher owns freshness.
+WATCH_PID_PATH = Path(".shipkit") / "cache" / "codebase-index.watch.pid"
+WATCH_STALE_SECONDS = 30
+# Budget for one refresh, waiting on a concurrent one included.
+REFRESH_TIMEOUT = 30
+
 
 def _resolve_root(project_dir: str) -> str | None:
     """Repo root via git, anchored at the session's project dir."""
@@ -38,6 +60,13 @@ def _resolve_root(project_dir: str) -> str | None:
         return None
 
 
+def _watcher_alive(root: str) -> bool:
+    try:
+        return time.time() - (Path(root) / WATCH_PID_PATH).stat().st_mtime < WATCH_STALE_SECONDS
+    except OSError:
+        return False
+
+
 def _find_generator(root: str) -> Path | None:
     """generate_index.py at project scope first, then user scope (~/.claude)."""
     candidates = [
@@ -50,6 +79,55 @@ def _find_generator(root: str) -> Path | None:
     return None
 
 
+def _load_generator(gen: Path):
+    """Import generate_index.py as a module; None if it lacks the in-process API."""
+    try:
+        spec = importlib.util.spec_from_file_location("shipkit_generate_index", gen)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        return None
+    if not hasattr(module, "refresh_mechanical"):
+        return None
+    return module
+
+
+def _refresh(root: str, gen: Path) -> None:
+    """In-process refresh; the subprocess path is kept as an isolation fallback."""
+    module = _load_generator(gen)
+    if module is not None:
+        kwargs = {}
+        if "deadline" in module.refresh_mechanical.__code__.co_varnames:
+            kwargs["deadline"] = time.monotonic() + REFRESH_TIMEOUT
+        else:
+            # An older generator: its run_git() uses the cwd, not root. This hook
+            # always runs as its own process (never in the daemon), so a chdir
+            # affects nothing else.
+            os.chdir(root)
+
+        def work():
+            try:
+                module.refresh_mechanical(root, **kwargs)
+            except Exception:
+                pass  # best-effort; never break the commit/turn
+
+        # The generator reports progress on stdout; a hook's stdout is the
+        # harness channel, so swallow it.
+        saved, sys.stdout = sys.stdout, io.StringIO()
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        worker.join(REFRESH_TIMEOUT)
+        if not worker.is_alive():
+            sys.stdout = saved
+        # Otherwise it's stuck (e.g. on git): stdout stays swallowed while the
+        # hook exits; the atomic writes leave the index as it was.
+        return
+    subprocess.run(
+        [sys.executable, "-X", "utf8", str(gen), "--refresh-mechanical"],
+        cwd=root, capture_output=True, text=True, timeout=REFRESH_TIMEOUT,
+    )
+
+
 def main() -> int:
     # Drain stdin (the hook payload) so we never block the caller; we don't need it
     # — the if:"Bash(git commit *)" matcher already scopes when we fire.
@@ -68,23 +146,20 @@ def main() -> int:
     if not (Path(root) / ".shipkit" / "codebase-index.json").exists():
         return 0
 
+    # A live --watch process already refreshes on every change.
+    if _watcher_alive(root):
+        return 0
+
     gen = _find_generator(root)
     if gen is None:
         return 0
 
     try:
-        subprocess.run(
-            [sys.executable, "-X", "utf8", str(gen), "--refresh-mechanical"],
-            cwd=root, capture_output=True, text=True, timeout=30,
-        )
+        _refresh(root, gen)
     except Exception:
         pass  # best-effort; never break the commit/turn
     return 0
 
 
 if __name__ == "__main__":
-    try:
-        sys.exit(main())
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+    rt.run(main, HOOK_NAME)
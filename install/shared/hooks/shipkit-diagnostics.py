@@ -14,29 +14,17 @@ import json
 import os
 import sys
 from datetime import datetime, timezone
-from pathlib import Path
+
+import shipkit_runtime as rt
 
 HOOK_NAME = "diagnostics"
 MAX_ENTRIES = 100
 
 
-def find_project_root(cwd: str) -> Path | None:
-    current = Path(cwd).resolve()
-    for _ in range(20):
-        if (current / '.shipkit').is_dir() or (current / '.claude').is_dir():
-            return current
-        parent = current.parent
-        if parent == current:
-            break
-        current = parent
-    return None
-
-
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    try:
-        hook_input = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
+    hook_input = rt.read_input()
+    if not hook_input:
         sys.exit(1)
 
     # Only log Skill dispatch failures
@@ -45,7 +33,7 @@ def main():
         sys.exit(1)
 
     cwd = hook_input.get('cwd', os.getcwd())
-    project_root = find_project_root(cwd)
+    project_root = rt.find_project_root(cwd)
     if not project_root:
         sys.exit(1)
 
@@ -89,8 +77,4 @@ def main():
 
 
 if __name__ == '__main__':
-    try:
-        main()
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+    rt.run(main, HOOK_NAME)
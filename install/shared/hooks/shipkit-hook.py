@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Shipkit hook client — the command every hook event runs.
+
+    python -X utf8 .claude/hooks/shipkit-hook.py <hook-script> [args...]
+
+When a hook daemon (shipkit-hookd.py) is serving this project, the event's
+stdin, cwd and CLAUDE_*/SHIPKIT_* environment are forwarded over its Unix
+socket and the hook's stdout, stderr and exit code are replayed from the reply
+— the hook itself runs in the already-warm daemon. Otherwise (no daemon, no
+CLAUDE_PROJECT_DIR, no AF_UNIX, the daemon drops the request or doesn't answer
+within REPLY_TIMEOUT) the hook script runs right here, exactly as if it had been
+the command. LOCAL_HOOKS — the ones that legitimately run for tens of seconds —
+are never forwarded.
+
+Deliberately small: only os, sys and the C-level _socket are imported before
+the daemon answers (`socket` itself pulls in enum and selectors, ~10 ms). No
+JSON — the wire format is NUL-separated fields:
+
+    request:  hook \\0 cwd \\0 KEY=VALUE \\0 ... \\0 \\0 <stdin bytes>
+    reply:    rc \\0 <stdout> \\0 <stderr>
+"""
+
+import _socket
+import os
+import sys
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ENV_PREFIXES = ('CLAUDE_', 'SHIPKIT_')
+CONNECT_TIMEOUT = 0.5
+# Well under the harness's hook timeout, so a stuck daemon costs one local run
+# rather than the event.
+REPLY_TIMEOUT = 10.0
+# Builds, test runs and git scans: they'd gain nothing from a warm process.
+LOCAL_HOOKS = ('shipkit-task-completed-hook.py', 'shipkit-codebase-index-refresh.py')
+
+
+def socket_path(project_root: str) -> str:
+    """Where the daemon for project_root listens: a per-user 0700 directory,
+    one socket per project keyed on its (device, inode)."""
+    st = os.stat(project_root)
+    base = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(base, f'shipkit-{uid}', f'hookd-{st.st_dev:x}-{st.st_ino:x}.sock')
+
+
+def _recv_all(sock) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def forward(hook: str, stdin: bytes) -> bytes | None:
+    """The daemon's reply for hook, or None when it can't be reached, gave none
+    or didn't answer within REPLY_TIMEOUT."""
+    root = os.environ.get('CLAUDE_PROJECT_DIR', '')
+    if not root or hook in LOCAL_HOOKS or not hasattr(_socket, 'AF_UNIX'):
+        return None
+    try:
+        path = socket_path(root)
+        sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    except OSError:
+        return None
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(path)
+        sock.settimeout(REPLY_TIMEOUT)
+        env = [f'{k}={v}' for k, v in os.environ.items() if k.startswith(ENV_PREFIXES)]
+        header = '\0'.join([hook, os.getcwd(), *env]) + '\0\0'
+        sock.sendall(header.encode('utf-8', 'surrogateescape') + stdin)
+        sock.shutdown(_socket.SHUT_WR)
+        return _recv_all(sock) or None
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+
+def run_local(hook: str, argv: list[str], stdin: bytes | None) -> None:
+    """Run the hook script in this process, as `python <hook>` would have.
+    (Not runpy: it drags in pkgutil and typing, ~10 ms.)"""
+    import io
+    path = os.path.join(HOOKS_DIR, hook)
+    if stdin is not None:
+        sys.stdin = io.TextIOWrapper(io.BytesIO(stdin), encoding='utf-8')
+    sys.argv = [path, *argv]
+    with open(path, 'rb') as fh:
+        code = compile(fh.read(), path, 'exec')
+    module = type(sys)('__main__')
+    module.__file__ = path
+    sys.modules['__main__'] = module
+    exec(code, module.__dict__)
+
+
+def main() -> int:
+    if len(sys.argv) < 2:
+        print("usage: shipkit-hook.py <hook-script> [args...]", file=sys.stderr)
+        return 2
+    hook, argv = os.path.basename(sys.argv[1]), sys.argv[2:]
+    if argv:
+        # Flags (--update-check, --ed-drift) are one-off CLI modes, not events.
+        run_local(hook, argv, None)
+        return 0
+    stdin = sys.stdin.buffer.read()
+    reply = forward(hook, stdin)
+    if reply is None:
+        run_local(hook, argv, stdin)
+        return 0
+    rc, _, rest = reply.partition(b'\0')
+    out, _, err = rest.partition(b'\0')
+    sys.stdout.buffer.write(out)
+    sys.stderr.buffer.write(err)
+    return int(rc or 0)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Shipkit hook daemon — optional; runs hook main()s in one warm process.
+
+Every hook event normally costs a fresh interpreter plus the hook's imports.
+Under agent teams that is hundreds of starts an hour. This daemon listens on a
+per-project Unix socket (see shipkit-hook.py's socket_path()) and imports each
+Shipkit hook in SERVED_HOOKS once, up front; other scripts in the hooks dir are
+never imported or served. Each event the client forwards is served by a
+forked worker: it inherits the warm modules, applies the event's stdin, cwd and
+CLAUDE_*/SHIPKIT_* environment, runs the hook's main() and sends back
+stdout/stderr and the exit code. Events are served concurrently, and since
+every worker is its own process, one event's stdio, cwd or environment (or a
+section thread that outlives its deadline) never leaks into another's.
+
+The long-running hooks (the client's LOCAL_HOOKS) and any hook that failed to
+import get no reply, so the client runs those itself. Any change to a file in the hooks directory (a Shipkit update)
+makes the daemon drop the request — the client then runs the script itself —
+and exit. It also exits after SHIPKIT_HOOK_DAEMON_IDLE seconds without a
+request (default 1800).
+
+    python -X utf8 .claude/hooks/shipkit-hookd.py start|stop|status|serve
+
+Opt in with SHIPKIT_HOOK_DAEMON=1 and session start launches it in the
+background. Unix only; elsewhere the client always runs the scripts.
+"""
+
+import importlib.util
+import io
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+
+import shipkit_runtime as rt
+
+HOOK_NAME = 'hookd'
+HOOKS_DIR = Path(__file__).resolve().parent
+IDLE_SECONDS = 1800
+STOP_REQUEST = '--stop'
+PING_REQUEST = '--ping'
+REAP_SECONDS = 5.0
+# The Shipkit event hooks the installers copy (install.py, cli/src/init.js), by
+# installed name — plus session start's source-tree name. Nothing else in the
+# hooks dir (a user's own hooks included) is imported or served; the client's
+# LOCAL_HOOKS are left out on purpose.
+SERVED_HOOKS = frozenset({
+    'session-start.py', 'shipkit-session-start.py',
+    'shipkit-track-skill-usage.py', 'shipkit-teammate-idle-hook.py',
+    'shipkit-task-created-hook.py', 'shipkit-permission-denied-hook.py',
+    'shipkit-subagent-context.py', 'shipkit-diagnostics.py', 'shipkit-prereq-check.py',
+    'shipkit-pre-compact.py', 'shipkit-post-compact.py', 'shipkit-session-end.py',
+})
+
+_client = rt.load_sibling('shipkit-hook.py')
+rt.IN_DAEMON = True
+
+
+def _hooks_fingerprint() -> dict:
+    return {p.name: p.stat().st_mtime_ns for p in HOOKS_DIR.glob('*.py')}
+
+
+def _parse_request(data: bytes):
+    """(hook, cwd, env, stdin) from the client's NUL-separated request."""
+    header, _, stdin = data.partition(b'\0\0')
+    fields = header.decode('utf-8', 'surrogateescape').split('\0')
+    env = dict(f.split('=', 1) for f in fields[2:] if '=' in f)
+    return fields[0], fields[1] if len(fields) > 1 else '', env, stdin
+
+
+class HookDaemon:
+    def __init__(self, project_root: Path, idle: float):
+        self.project_root = project_root
+        self.idle = idle
+        self.fingerprint = _hooks_fingerprint()
+        self.modules = {}
+        self.workers = set()
+        for hook in sorted(SERVED_HOOKS):
+            if not (HOOKS_DIR / hook).is_file():
+                continue
+            try:
+                self._load(hook)
+            except BaseException:
+                # SystemExit at import included: the daemon stays up and the
+                # client runs that hook itself.
+                self.modules.pop(hook, None)
+
+    def _load(self, hook: str):
+        """The hook's module, imported once (not as __main__, so it just defines main)."""
+        module = self.modules.get(hook)
+        if module is None:
+            path = HOOKS_DIR / hook
+            name = 'shipkit_hook_' + path.stem.replace('-', '_')
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self.modules[hook] = module
+        return module
+
+    def call(self, hook: str, cwd: str, env: dict, stdin: bytes) -> tuple[int, str, str]:
+        """Run hook's main() with this event's stdio, cwd and environment.
+
+        Only ever called in a forked worker, which exits right after: nothing
+        set here needs restoring.
+        """
+        out, err = io.StringIO(), io.StringIO()
+        for key in [k for k in os.environ if k.startswith(_client.ENV_PREFIXES)]:
+            del os.environ[key]
+        os.environ.update(env)
+        sys.stdin = io.TextIOWrapper(io.BytesIO(stdin), encoding='utf-8')
+        sys.stdout, sys.stderr = out, err
+        try:
+            os.chdir(cwd or self.project_root)
+            rc = self._load(hook).main()
+        except SystemExit as e:
+            rc = e.code
+            if isinstance(rc, str):
+                print(rc, file=err)
+                rc = 1
+        except Exception as e:
+            # Same contract as rt.run(): a hook error never blocks the session.
+            print(f"[shipkit:{hook}] ERROR: {e}", file=err)
+            rc = 0
+        return rc or 0, out.getvalue(), err.getvalue()
+
+    def handle(self, conn) -> bool:
+        """Serve one connection; False when the daemon should exit."""
+        data = _client._recv_all(conn)
+        hook, cwd, env, stdin = _parse_request(data)
+        if hook == PING_REQUEST:
+            conn.sendall(str(os.getpid()).encode())
+            return True
+        if hook == STOP_REQUEST:
+            conn.sendall(b'stopping')
+            return False
+        if _hooks_fingerprint() != self.fingerprint:
+            return False  # hooks were updated: no reply, the client runs the new script
+        if hook in _client.LOCAL_HOOKS:
+            return True  # no reply: the client runs it itself
+        if hook not in SERVED_HOOKS:
+            conn.sendall(f"2\0\0[shipkit:{HOOK_NAME}] unknown hook {hook!r}\n".encode())
+            return True
+        if hook not in self.modules:
+            return True  # failed to import: no reply, the client runs it and reports why
+        pid = os.fork()
+        if pid:
+            self.workers.add(pid)
+            return True
+        # The client gives up after REPLY_TIMEOUT; don't let a stuck worker linger.
+        signal.alarm(int(_client.REPLY_TIMEOUT) * 3)
+        try:
+            rc, out, err = self.call(hook, cwd, env, stdin)
+            conn.sendall(f"{rc}\0{out}\0{err}".encode('utf-8', 'surrogateescape'))
+        finally:
+            os._exit(0)
+
+    def _reap(self) -> None:
+        for pid in list(self.workers):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self.workers.discard(pid)
+
+    def serve(self, server) -> None:
+        server.settimeout(min(self.idle, REAP_SECONDS))
+        last_request = time.monotonic()
+        while True:
+            self._reap()
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                if time.monotonic() - last_request >= self.idle:
+                    return
+                continue
+            last_request = time.monotonic()
+            with conn:
+                conn.settimeout(None)
+                try:
+                    if not self.handle(conn):
+                        return
+                except OSError:
+                    pass  # the client went away mid-request
+
+
+def _request(path: str, body: str) -> bytes | None:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_client.CONNECT_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(body.encode() + b'\0\0')
+            sock.shutdown(socket.SHUT_WR)
+            return _client._recv_all(sock)
+    except OSError:
+        return None
+
+
+def serve(project_root: Path) -> int:
+    """Bind the project's socket and serve until idle, stopped or outdated."""
+    path = _client.socket_path(str(project_root))
+    run_dir = os.path.dirname(path)
+    os.makedirs(run_dir, mode=0o700, exist_ok=True)
+    st = os.stat(run_dir)
+    if hasattr(os, 'getuid') and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        print(f"[shipkit:{HOOK_NAME}] refusing {run_dir}: not private to this user", file=sys.stderr)
+        return 1
+    if _request(path, PING_REQUEST):
+        return 0  # already serving this project
+    try:
+        os.unlink(path)  # stale socket from a daemon that died
+    except OSError:
+        pass
+    idle = float(os.environ.get('SHIPKIT_HOOK_DAEMON_IDLE', '') or IDLE_SECONDS)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(path)
+        server.listen(64)
+        os.chdir(project_root)
+        HookDaemon(project_root, idle).serve(server)
+    finally:
+        server.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return 0
+
+
+def start(project_root: Path) -> int:
+    """Launch `serve` in the background, detached from this process."""
+    subprocess = rt.lazy_import('subprocess')
+    subprocess.Popen([sys.executable, '-X', 'utf8', str(Path(__file__).resolve()), 'serve'],
+                     cwd=str(project_root), env=dict(os.environ, CLAUDE_PROJECT_DIR=str(project_root)),
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+    return 0
+
+
+def main() -> int:
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command not in ('serve', 'start', 'stop', 'status'):
+        print("usage: shipkit-hookd.py start|stop|status|serve", file=sys.stderr)
+        return 2
+    if not hasattr(socket, 'AF_UNIX') or _client is None:
+        print(f"[shipkit:{HOOK_NAME}] not supported here; hooks run as scripts", file=sys.stderr)
+        return 1
+    project_root = rt.project_dir({})
+    path = _client.socket_path(str(project_root))
+    if command == 'serve':
+        return serve(project_root)
+    if command == 'start':
+        return 0 if _request(path, PING_REQUEST) else start(project_root)
+    reply = _request(path, STOP_REQUEST if command == 'stop' else PING_REQUEST)
+    if command == 'stop':
+        print("stopped" if reply else "not running")
+    else:
+        print(f"running (pid {reply.decode()}) on {path}" if reply else "not running")
+    return 0
+
+
+if __name__ == '__main__':
+    rt.run(main, HOOK_NAME)
@@ -27,9 +27,10 @@ Input: JSON on stdin with PermissionDenied event data.
 Output: JSON on stdout (systemMessage + PermissionDenied hookSpecificOutput).
 """
 
-import json
 import sys
 
+import shipkit_runtime as rt
+
 HOOK_NAME = "permission-denied"
 
 # Tools whose auto-mode denial is typically a benign/recoverable classifier
@@ -72,15 +73,10 @@ def is_retry_safe(hook_input: dict) -> bool:
 
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    try:
-        hook_input = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
-        hook_input = {}
+    hook_input = rt.read_input()
 
     permission = describe_permission(hook_input)
-    denial_reason = ""
-    if isinstance(hook_input, dict):
-        denial_reason = hook_input.get("denial_reason", "") or ""
+    denial_reason = hook_input.get("denial_reason", "") or ""
 
     message = (
         f"Auto-mode denied: {permission}. "
@@ -103,13 +99,9 @@ def main():
         "systemMessage": message,
         "hookSpecificOutput": hook_specific,
     }
-    print(json.dumps(output))
+    rt.emit(output)
     sys.exit(0)
 
 
-if __name__ == "__main__":
-    try:
-        main()
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+if __name__ == '__main__':
+    rt.run(main, HOOK_NAME)
@@ -10,36 +10,18 @@ Exit 0 always — this is observability only, never blocks.
 """
 
 import json
-import os
 import sys
 from datetime import datetime
-from pathlib import Path
 
-HOOK_NAME = "post-compact"
+import shipkit_runtime as rt
 
-def find_project_root(start: Path) -> Path | None:
-    """Walk up from start to find the project root."""
-    current = start.resolve()
-    for _ in range(20):
-        if (current / '.shipkit').is_dir() or (current / '.claude').is_dir():
-            return current
-        parent = current.parent
-        if parent == current:
-            break
-        current = parent
-    return None
+HOOK_NAME = "post-compact"
 
 
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    try:
-        hook_input = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
-        hook_input = {}
-
-    env_dir = os.environ.get("CLAUDE_PROJECT_DIR", "")
-    start_dir = Path(env_dir) if env_dir else Path(hook_input.get("cwd", os.getcwd()))
-    project_dir = find_project_root(start_dir) or start_dir
+    hook_input = rt.read_input()
+    project_dir = rt.project_dir(hook_input)
     shipkit_dir = project_dir / ".shipkit"
 
     if not shipkit_dir.exists():
@@ -85,9 +67,5 @@ def main():
     sys.exit(0)
 
 
-if __name__ == "__main__":
-    try:
-        main()
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+if __name__ == '__main__':
+    rt.run(main, HOOK_NAME)
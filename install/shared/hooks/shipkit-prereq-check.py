@@ -11,11 +11,12 @@ Exit 0 + JSON: additionalContext with missing prerequisites
 Exit 1: not a Shipkit skill, or all prerequisites met
 """
 
-import json
 import os
 import sys
 from pathlib import Path
 
+import shipkit_runtime as rt
+
 HOOK_NAME = "prereq-check"
 # Skill name → list of (required file, skill to create it)
 SKILL_PREREQUISITES = {
@@ -70,18 +71,6 @@ SKILL_PREREQUISITES = {
 }
 
 
-def find_project_root(cwd: str) -> Path | None:
-    current = Path(cwd).resolve()
-    for _ in range(20):
-        if (current / '.shipkit').is_dir() or (current / '.claude').is_dir():
-            return current
-        parent = current.parent
-        if parent == current:
-            break
-        current = parent
-    return None
-
-
 def extract_skill_name(file_path: str) -> str | None:
     """Extract skill name from an InstructionsLoaded file path."""
     # Match paths like .claude/skills/shipkit-spec/SKILL.md or install/skills/shipkit-spec/SKILL.md
@@ -96,9 +85,8 @@ def extract_skill_name(file_path: str) -> str | None:
 
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    try:
-        hook_input = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
+    hook_input = rt.read_input()
+    if not hook_input:
         sys.exit(1)
 
     # Only process skill loads, not CLAUDE.md or rules
@@ -113,7 +101,7 @@ def main():
         sys.exit(1)
 
     cwd = hook_input.get('cwd', os.getcwd())
-    project_root = find_project_root(cwd)
+    project_root = rt.find_project_root(cwd)
     if not project_root:
         sys.exit(1)
 
@@ -132,19 +120,9 @@ def main():
         sys.exit(1)  # All good
 
     msg = f"[Shipkit] /{skill_name} prerequisites missing:\n" + "\n".join(missing)
-    output = {
-        "hookSpecificOutput": {
-            "hookEventName": "InstructionsLoaded",
-            "additionalContext": msg
-        }
-    }
-    print(json.dumps(output))
+    rt.emit_context("InstructionsLoaded", msg)
     sys.exit(0)
 
 
 if __name__ == '__main__':
-    try:
-        main()
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+    rt.run(main, HOOK_NAME)
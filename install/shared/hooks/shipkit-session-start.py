@@ -3,25 +3,77 @@
 Shipkit - Session Start Hook
 
 Context loader: resumes progress, lists available context files, checks for updates.
+
+`shipkit-session-start.py --update-check <project_root>` is the detached
+background half of the update check (see check_for_updates).
+`shipkit-session-start.py --ed-drift [M-###]` lists the ADR chain behind a
+mechanism (or every stale one) from the ED↔ADR drift index.
 """
 
+from __future__ import annotations
+
 import sys
 import os
+import importlib.util
 import json
 import re
 import subprocess
-import urllib.request
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
+import shipkit_runtime as rt
+import shipkit_usage
+
+# Off the common path: urllib only in the detached `--update-check` child.
+# (subprocess is imported eagerly: every session spawns something, from several
+# section threads at once, and a lazy module's first load isn't thread-safe
+# before Python 3.12.)
+urllib_request = rt.lazy_import('urllib.request')
+
 HOOK_NAME = "session-start"
 GITHUB_VERSION_URL = "https://raw.githubusercontent.com/stefan-stepzero/shipkit/main/VERSION"
 
+# Update-check schedule (seconds): a successful check is good for a day; failures
+# retry after an hour, doubling per consecutive failure, capped at a week. The
+# lease stops concurrent sessions from each spawning a check.
+UPDATE_CHECK_INTERVAL = 24 * 3600
+UPDATE_CHECK_RETRY = 3600
+UPDATE_CHECK_MAX_BACKOFF = 7 * 24 * 3600
+UPDATE_CHECK_LEASE = 600
+
 # Per the context-import policy: large artefacts are referenced (read on demand);
 # only lean, bounded SLICES are injected always-on. Cap each injected digest so a
 # large repo's index / goals file can never bloat context (AC-5 / AC-2).
 MAX_DIGEST_CHARS = 3500  # ~3-4 KB per injected digest
 
+# One token budget for everything a session starts with: the files CLAUDE.md
+# `@`-imports (loaded by Claude Code, fixed cost) plus every block this hook
+# injects. When the total is over, the hook trims its own sections, lowest
+# priority first (higher number = trimmed sooner; 0 = never trimmed).
+# SHIPKIT_CONTEXT_BUDGET overrides the limit. Tokens are counted with
+# SHIPKIT_TOKENIZER when set (see load_tokenizer), else ~4 bytes per token.
+CONTEXT_BUDGET_TOKENS = 15_000
+SECTION_PRIORITY = {
+    'engine': 0,
+    'footer': 0,
+    'update': 1,
+    'import-warning': 1,
+    'ed-adr-drift': 1,
+    'size-budgets': 1,
+    'progress': 2,
+    'strategic': 3,
+    'context-table': 4,
+    'codebase': 5,
+}
+# A section trimmed below this is dropped rather than left as a stub.
+MIN_SECTION_TOKENS = 60
+CONTEXT_BUDGET_REPORT = 'context-budget.{session}.local.json'  # in .shipkit/observability/
+# Budget reports are kept for this long, and at most this many (newest first).
+CONTEXT_BUDGET_KEEP_DAYS = 7
+CONTEXT_BUDGET_KEEP = 20
+
 # Artefacts the CLAUDE.md template `@`-imports (install/claude-md/shipkit.md).
 # A missing one makes the `@`-import silently no-op, so the hook warns instead.
 IMPORTED_ARTIFACTS = ['architecture.json', 'stack.json', 'why.json']
@@ -51,11 +103,72 @@ SIZE_BUDGETS = {
     ),
 }
 
+# Files listed in the "Available Context" table, in display order.
+CONTEXT_FILES = [
+    ('why.json', 'Project vision & purpose'),
+    ('product-discovery.json', 'Personas, journeys, needs'),
+    ('product-definition.json', 'Product blueprint'),
+    ('engineering-definition.json', 'Engineering blueprint'),
+    ('stack.json', 'Tech stack & patterns'),
+    ('architecture.json', 'Architecture decisions'),
+    ('codebase-index.json', 'Semantic file map'),
+    ('progress.json', 'Session continuity'),
+    ('spec-roadmap.json', 'Spec priority order'),
+    ('orchestration.json', 'Pipeline state & crash recovery'),
+]
+
+# Rendered sections are cached here, each keyed on the (path, size, mtime_ns) of
+# the files it reads — an unchanged section costs a stat per input, not a parse.
+SECTION_CACHE_PATH = Path('.shipkit') / 'cache' / 'session-start.cache.json'
+SECTION_CACHE_VERSION = 1
+
+# Compact ED↔ADR drift index (see load_drift_index).
+ED_DRIFT_INDEX_PATH = Path('.shipkit') / 'cache' / 'ed-adr-drift.json'
+ED_DRIFT_INDEX_VERSION = 2
+
+# Sections still building this long after they start are dropped from the output.
+# Generous: the update check and the default index refresh run detached, so only
+# a sync-mode refresh or a very slow disk gets near it.
+SECTION_DEADLINE_SECONDS = 3.5
+
 # The codebase index's JUDGMENT layer (framework/concepts/coreFiles) is considered
 # stale after this many days. The mechanical layer auto-refreshes on commit, so the
 # nudge keys off fullRefreshedAt — NOT file mtime, which now moves on every commit.
 INDEX_STALE_DAYS = 14
 
+# Heartbeat file of a running `generate_index.py --watch` (rewritten every ~10s).
+# While it is fresh the watcher owns mechanical freshness and we skip the refresh.
+INDEX_WATCH_PID = Path('.shipkit') / 'cache' / 'codebase-index.watch.pid'
+INDEX_WATCH_STALE_SECONDS = 30
+
+
+_ARTIFACTS = rt.load_sibling('shipkit-artifacts.py')
+
+
+def read_artifact_paths(path: Path, paths: list) -> dict:
+    """{key path: value} for the requested key paths of a JSON artifact.
+
+    Streams the file through shipkit-artifacts.py so only those values are decoded;
+    an install without that module falls back to a full parse. Raises like
+    json.loads(path.read_text()) on an unreadable or malformed file.
+    """
+    if _ARTIFACTS is not None:
+        return _ARTIFACTS.read_paths(path, paths)
+    data = json.loads(path.read_text(encoding='utf-8'))
+    found = {}
+    for p in paths:
+        value = data
+        for step in p:
+            if isinstance(step, int):
+                if not isinstance(value, list) or not -len(value) <= step < len(value):
+                    break
+            elif not isinstance(value, dict) or step not in value:
+                break
+            value = value[step]
+        else:
+            found[p] = value
+    return found
+
 
 def _date_age_days(date_str: str) -> float:
     """Age in days from a 'YYYY-MM-DD' stamp; -1 if unparseable/empty."""
@@ -68,28 +181,188 @@ def _date_age_days(date_str: str) -> float:
         return -1
 
 
-def refresh_codebase_index(skills_dir: Path, project_root: Path) -> None:
+def _spawn_detached(args: list[str], cwd: Path) -> subprocess.Popen | None:
+    """Start args in the background, outliving this hook; None if it can't start."""
+    try:
+        kwargs = {'cwd': str(cwd), 'stdin': subprocess.DEVNULL,
+                  'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs['start_new_session'] = True
+        return subprocess.Popen(args, **kwargs)
+    except Exception:
+        return None
+
+
+def start_hook_daemon(project_root: Path) -> None:
+    """With SHIPKIT_HOOK_DAEMON=1, launch shipkit-hookd.py for this project in
+    the background; it exits at once if one is already serving. Not from inside
+    the daemon itself, and not where there are no Unix sockets."""
+    if os.environ.get('SHIPKIT_HOOK_DAEMON', '') != '1' or rt.IN_DAEMON or os.name == 'nt':
+        return None
+    hookd = Path(__file__).resolve().parent / 'shipkit-hookd.py'
+    if hookd.exists():
+        _spawn_detached([sys.executable, '-X', 'utf8', str(hookd), 'serve'], project_root)
+    return None
+
+
+def refresh_codebase_index(skills_dir: Path, project_root: Path,
+                           defer: bool | None = None) -> subprocess.Popen | None:
     """Deterministic (no-LLM) mechanical refresh of the codebase index at session start.
 
     Catches commits made outside Claude (e.g. the user's own terminal) that the
     PostToolUse git-commit hook never saw. Best-effort: only refreshes an EXISTING
-    index (never creates one), short timeout, never raises.
+    index (never creates one), never raises.
+
+    Deferred by default: the refresh is started as a detached background process
+    (returned, so a caller may wait on it) and this session's digest renders from
+    the index already on disk. The digest is built from judgment fields the
+    refresh never touches (only a monorepo's package shard lines can lag, by one
+    session), and the next consumer reads the fresher file.
+    SHIPKIT_INDEX_REFRESH=sync (or defer=False) refreshes before returning
+    instead: in-process (generate_index is imported, its output silenced), or as a
+    subprocess with a short timeout for a generator without that API.
     """
     if project_root is None:
-        return
+        return None
     index_file = project_root / '.shipkit' / 'codebase-index.json'
     if not index_file.exists():
-        return
+        return None
+    try:
+        if time.time() - (project_root / INDEX_WATCH_PID).stat().st_mtime < INDEX_WATCH_STALE_SECONDS:
+            return None
+    except OSError:
+        pass
     generator = skills_dir / 'shipkit-codebase-index' / 'scripts' / 'generate_index.py'
     if not generator.exists():
-        return
+        return None
+    if defer is None:
+        defer = os.environ.get('SHIPKIT_INDEX_REFRESH', '').lower() != 'sync'
+    if defer:
+        return _spawn_detached(
+            [sys.executable, '-X', 'utf8', str(generator), '--refresh-mechanical'], project_root)
     try:
-        subprocess.run(
-            [sys.executable, '-X', 'utf8', str(generator), '--refresh-mechanical'],
-            cwd=str(project_root), capture_output=True, text=True, timeout=20,
-        )
+        spec = importlib.util.spec_from_file_location('shipkit_generate_index', generator)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        refresh = module.refresh_mechanical
+    except Exception:
+        refresh = None
+    try:
+        if refresh is None:
+            subprocess.run(
+                [sys.executable, '-X', 'utf8', str(generator), '--refresh-mechanical'],
+                cwd=str(project_root), capture_output=True, text=True, timeout=20,
+            )
+            return None
+        root = module.find_root(str(project_root))
+        if root:
+            # Silence the generator's progress output by shadowing print in its
+            # module only — redirect_stdout would swap sys.stdout for every thread,
+            # including the one emitting this hook's JSON.
+            module.print = lambda *args, **kwargs: None
+            refresh(root)
     except Exception:
         pass
+    return None
+
+
+def _stat_key(path: Path) -> list | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class SectionCache:
+    """Rendered session-start sections, invalidated independently.
+
+    get() returns the cached value for a section when every input's (size,
+    mtime_ns) — and the caller's `extra` salt, for output that also depends on
+    the clock or cwd — matches what it was rendered from; otherwise it builds,
+    stores and returns a fresh value. Missing inputs are part of the key, so a
+    file appearing or vanishing invalidates too. save() writes only when
+    something was rebuilt. Never raises: a broken cache is just a miss.
+
+    Shared by every section thread, and one that missed its deadline may still
+    be storing while save() runs, so both go through a lock (builds don't).
+    """
+
+    def __init__(self, project_root: Path):
+        self.path = project_root / SECTION_CACHE_PATH
+        self.root = project_root
+        self.dirty = False
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except Exception:
+            data = None
+        ok = isinstance(data, dict) and data.get('version') == SECTION_CACHE_VERSION
+        self.sections = data.get('sections', {}) if ok else {}
+
+    def get(self, name: str, inputs: list[Path], build, extra=None):
+        key = [[os.path.relpath(p, self.root), _stat_key(p)] for p in inputs]
+        # Round-trip so the key compares equal to its JSON-loaded form.
+        key = json.loads(json.dumps([key, extra]))
+        with self._lock:
+            entry = self.sections.get(name)
+        if isinstance(entry, dict) and entry.get('key') == key:
+            return entry.get('value')
+        value = build()
+        with self._lock:
+            self.sections[name] = {'key': key, 'value': value}
+            self.dirty = True
+        return value
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.dirty:
+                return
+            try:
+                payload = json.dumps({'version': SECTION_CACHE_VERSION, 'sections': self.sections},
+                                     separators=(',', ':'))
+            except Exception:
+                return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            ignore = self.path.parent / '.gitignore'
+            if not ignore.exists():
+                ignore.write_text('*\n', encoding='utf-8')
+            tmp = self.path.with_name(f"{self.path.name}.tmp.{os.getpid()}")
+            tmp.write_text(payload, encoding='utf-8')
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+
+_MISSED = object()
+
+
+class _Task:
+    """One session-start section, built on a daemon thread as soon as its deps finish."""
+
+    def __init__(self, build, *deps):
+        self.done = threading.Event()
+        self.value = None
+        threading.Thread(target=self._run, args=(build, deps), daemon=True).start()
+
+    def _run(self, build, deps):
+        try:
+            for dep in deps:
+                dep.done.wait()
+            self.value = build()
+        except Exception:
+            self.value = None  # every section is best-effort
+        finally:
+            self.done.set()
+
+    def result(self, deadline: float):
+        """The section's value, or _MISSED if it isn't ready by deadline (monotonic)."""
+        if self.done.wait(max(0.0, deadline - time.monotonic())):
+            return self.value
+        return _MISSED
 
 
 def get_installed_version(project_root: Path) -> str:
@@ -132,46 +405,93 @@ def parse_version(version_str: str) -> tuple:
         return (0, 0, 0)
 
 
+def _read_update_state(check_file: Path) -> dict:
+    """Update-check state; {} when missing. Reads the legacy two-line
+    (timestamp, version) file as a check due 24h after it was written."""
+    try:
+        text = check_file.read_text(encoding='utf-8')
+    except OSError:
+        return {}
+    try:
+        state = json.loads(text)
+        if isinstance(state, dict):
+            return state
+    except ValueError:
+        pass
+    lines = text.strip().split('\n')
+    if len(lines) < 2:
+        return {}
+    try:
+        next_check = check_file.stat().st_mtime + UPDATE_CHECK_INTERVAL
+    except OSError:
+        next_check = 0
+    return {'remote': lines[1].strip(), 'checkedAt': lines[0].strip(), 'nextCheckAt': next_check}
+
+
+def _write_update_state(check_file: Path, state: dict) -> None:
+    try:
+        check_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = check_file.with_name(f"{check_file.name}.tmp.{os.getpid()}")
+        tmp.write_text(json.dumps(state), encoding='utf-8')
+        os.replace(tmp, check_file)
+    except Exception:
+        pass
+
+
 def check_for_updates(project_root: Path) -> str | None:
-    """Check if newer Shipkit version is available (once per day, 3s timeout)."""
+    """Report a newer Shipkit version — from the cached check, never the network.
+
+    Stale-while-revalidate: the answer always comes from .update-check.local. When
+    that record is due (see refresh_update_check for the schedule), a detached
+    `--update-check` run of this script refreshes it for the next session, after
+    a short lease is written so concurrent sessions don't all spawn one.
+    """
     check_file = project_root / '.shipkit' / '.update-check.local'
     installed_version = get_installed_version(project_root)
 
     if installed_version == "unknown":
         return None
 
-    # Rate limit: skip if checked within last 24 hours
-    if check_file.exists():
-        age_days = get_file_age_days(check_file)
-        if 0 <= age_days < 1:
-            try:
-                lines = check_file.read_text(encoding='utf-8').strip().split('\n')
-                if len(lines) >= 2 and parse_version(lines[1]) > parse_version(installed_version):
-                    return f"Shipkit {lines[1]} available (you have {installed_version}). Run `/shipkit-update`"
-            except Exception:
-                pass
-            return None
+    state = _read_update_state(check_file)
+    if time.time() >= state.get('nextCheckAt', 0):
+        state['nextCheckAt'] = time.time() + UPDATE_CHECK_LEASE
+        _write_update_state(check_file, state)
+        _spawn_detached([sys.executable, '-X', 'utf8', str(Path(__file__).resolve()),
+                         '--update-check', str(project_root)], project_root)
 
-    try:
-        request = urllib.request.Request(GITHUB_VERSION_URL, headers={'User-Agent': 'Shipkit/1.0'})
-        with urllib.request.urlopen(request, timeout=3) as response:
-            remote_version = response.read().decode('utf-8').strip()
-
-        if not re.match(r'^\d+\.\d+(\.\d+)?$', remote_version):
-            return None
+    remote_version = state.get('remote')
+    if isinstance(remote_version, str) and parse_version(remote_version) > parse_version(installed_version):
+        return f"Shipkit {remote_version} available (you have {installed_version}). Run `/shipkit-update`"
+    return None
 
-        try:
-            check_file.parent.mkdir(parents=True, exist_ok=True)
-            check_file.write_text(f"{datetime.now().isoformat()}\n{remote_version}")
-        except Exception:
-            pass
 
-        if parse_version(remote_version) > parse_version(installed_version):
-            return f"Shipkit {remote_version} available (you have {installed_version}). Run `/shipkit-update`"
-    except Exception:
-        pass
+def refresh_update_check(project_root: Path) -> int:
+    """Fetch the latest version into .update-check.local (the background half).
 
-    return None
+    A good answer — newer or not — is kept for UPDATE_CHECK_INTERVAL. A failure
+    (offline, firewalled, a garbage response) keeps the last known version and
+    retries after UPDATE_CHECK_RETRY, doubling per consecutive failure up to
+    UPDATE_CHECK_MAX_BACKOFF. SHIPKIT_VERSION_URL points it at a local stand-in.
+    """
+    check_file = project_root / '.shipkit' / '.update-check.local'
+    state = _read_update_state(check_file)
+    url = os.environ.get('SHIPKIT_VERSION_URL') or GITHUB_VERSION_URL
+    now = time.time()
+    try:
+        request = urllib_request.Request(url, headers={'User-Agent': 'Shipkit/1.0'})
+        with urllib_request.urlopen(request, timeout=10) as response:
+            remote_version = response.read(64).decode('utf-8').strip()
+        if not re.match(r'^\d+\.\d+(\.\d+)?$', remote_version):
+            raise ValueError(f"unexpected version payload {remote_version[:20]!r}")
+        state.update(remote=remote_version, checkedAt=datetime.now().isoformat(),
+                     failures=0, nextCheckAt=now + UPDATE_CHECK_INTERVAL)
+        state.pop('lastError', None)
+    except Exception as e:
+        failures = int(state.get('failures', 0)) + 1
+        backoff = min(UPDATE_CHECK_RETRY * 2 ** (failures - 1), UPDATE_CHECK_MAX_BACKOFF)
+        state.update(failures=failures, lastError=str(e)[:200], nextCheckAt=now + backoff)
+    _write_update_state(check_file, state)
+    return 0
 
 
 def get_progress_summary(project_root: Path) -> str | None:
@@ -181,12 +501,9 @@ def get_progress_summary(project_root: Path) -> str | None:
         return None
 
     try:
-        data = json.loads(progress_file.read_text(encoding='utf-8'))
-
-        # Handle JSON artifact format
-        sessions = data.get('sessions', [])
-        if sessions:
-            last = sessions[-1]
+        # Only the last session is needed — progress.json grows every session.
+        last = read_artifact_paths(progress_file, [('sessions', -1)]).get(('sessions', -1))
+        if last:
             summary = last.get('summary', '')
             timestamp = last.get('timestamp', last.get('date', ''))
             if summary:
@@ -246,6 +563,202 @@ def get_size_budget_warnings(project_root: Path) -> str | None:
     return '\n'.join(out)
 
 
+def load_tokenizer(project_root: Path):
+    """(name, count) — count(text) -> tokens, chosen by SHIPKIT_TOKENIZER.
+
+    `tiktoken` or `tiktoken:<encoding>` uses tiktoken (offline once its encoding
+    is cached); `module:function` or `path/to/file.py:function` (relative to the
+    project) calls any callable returning a count or a token sequence. Unset, or
+    a tokenizer that fails to load, falls back to ~4 bytes per token.
+    """
+    def by_bytes(text: str) -> int:
+        return -(-len(text.encode('utf-8')) // 4)
+
+    spec = os.environ.get('SHIPKIT_TOKENIZER', '').strip()
+    if not spec or spec == 'bytes':
+        return 'bytes/4', by_bytes
+    try:
+        if spec == 'tiktoken' or spec.startswith('tiktoken:'):
+            import tiktoken
+            encoding = tiktoken.get_encoding(spec.partition(':')[2] or 'cl100k_base')
+            probe = lambda text: len(encoding.encode(text, disallowed_special=()))
+        else:
+            module_ref, _, attr = spec.rpartition(':')
+            if module_ref.endswith('.py'):
+                module_path = Path(module_ref)
+                if not module_path.is_absolute():
+                    module_path = project_root / module_path
+                mod_spec = importlib.util.spec_from_file_location('shipkit_tokenizer', module_path)
+                module = importlib.util.module_from_spec(mod_spec)
+                mod_spec.loader.exec_module(module)
+            else:
+                module = importlib.import_module(module_ref)
+            fn = getattr(module, attr)
+
+            def probe(text: str) -> int:
+                result = fn(text)
+                return result if isinstance(result, int) else len(result)
+        probe('shipkit')
+        return spec, probe
+    except Exception as e:
+        print(f"[shipkit:{HOOK_NAME}] tokenizer {spec!r} unavailable ({e}); "
+              f"counting ~4 bytes per token", file=sys.stderr)
+        return 'bytes/4', by_bytes
+
+
+def claude_md_imports(project_root: Path) -> list[Path]:
+    """CLAUDE.md and the files it `@`-imports (line-leading `@path`), existing only."""
+    claude_md = project_root / 'CLAUDE.md'
+    try:
+        text = claude_md.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return []
+    files = [claude_md]
+    for line in text.splitlines():
+        m = re.match(r'@(\S+)', line.strip())
+        if m:
+            target = Path(os.path.expanduser(m.group(1)))
+            target = target if target.is_absolute() else project_root / target
+            if target.is_file() and target not in files:
+                files.append(target)
+    return files
+
+
+class ContextBudget:
+    """Counts a session's context against CONTEXT_BUDGET_TOKENS and trims to fit.
+
+    measure_imports() prices the always-loaded `@`-import files; fit() prices the
+    hook's own blocks and, when the total is over, trims the lowest-priority
+    sections first (cut at a line boundary, or dropped when what would remain is
+    too small to be useful). report() is the per-session record written to
+    .shipkit/observability/.
+    """
+
+    def __init__(self, project_root: Path, tokenizer=None, limit: int | None = None):
+        self.root = project_root
+        self.tokenizer, self.count = tokenizer or load_tokenizer(project_root)
+        if limit is None:
+            try:
+                limit = int(os.environ.get('SHIPKIT_CONTEXT_BUDGET', '') or CONTEXT_BUDGET_TOKENS)
+            except ValueError:
+                limit = CONTEXT_BUDGET_TOKENS
+        self.limit = limit
+        self.imports = []
+        self.sections = []
+
+    def measure_imports(self, files: list[Path]) -> list[dict]:
+        """[{'path', 'bytes', 'tokens'}] for each always-loaded file."""
+        measured = []
+        for f in files:
+            try:
+                size = f.stat().st_size
+                if self.tokenizer == 'bytes/4':
+                    tokens = -(-size // 4)
+                else:
+                    tokens = self.count(f.read_text(encoding='utf-8', errors='replace'))
+            except OSError:
+                continue
+            measured.append({'path': os.path.relpath(f, self.root).replace(os.sep, '/'),
+                             'bytes': size, 'tokens': tokens})
+        return measured
+
+    def _truncate(self, text: str, keep: int) -> str:
+        note = "\n... (trimmed to fit the session context budget)"
+        tokens = self.count(text)
+        for _ in range(4):
+            chars = max(0, int(len(text) * keep / max(tokens, 1)) - len(note))
+            cut = text[:chars]
+            cut = cut[:cut.rfind('\n')] if '\n' in cut else cut
+            cut = cut.rstrip() + note + ('\n' if text.endswith('\n') else '')
+            if self.count(cut) <= keep:
+                return cut
+            keep -= self.count(cut) - keep
+        return ''
+
+    def fit(self, blocks: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """Blocks (name, text) in output order, trimmed so the whole session fits."""
+        entries = [{'name': n, 'text': t, 'tokens': self.count(t)} for n, t in blocks]
+        for e in entries:
+            e['kept'] = e['tokens']
+        over = (sum(i['tokens'] for i in self.imports)
+                + sum(e['tokens'] for e in entries) - self.limit)
+        trim_order = sorted((e for e in entries if SECTION_PRIORITY.get(e['name'], 1) > 0),
+                            key=lambda e: -SECTION_PRIORITY.get(e['name'], 1))
+        for e in trim_order:
+            if over <= 0:
+                break
+            keep = e['tokens'] - over
+            text = self._truncate(e['text'], keep) if keep >= MIN_SECTION_TOKENS else ''
+            e['text'] = text
+            e['kept'] = self.count(text) if text else 0
+            over -= e['tokens'] - e['kept']
+        self.sections = entries
+        trimmed = [e['name'] for e in entries if e['kept'] < e['tokens']]
+        if trimmed:
+            print(f"[shipkit:{HOOK_NAME}] over the {self.limit:,}-token context budget, trimmed: "
+                  f"{', '.join(trimmed)}", file=sys.stderr)
+        return [(e['name'], e['text']) for e in entries if e['text']]
+
+    def report(self, session_id: str) -> dict:
+        imported = sum(i['tokens'] for i in self.imports)
+        injected = sum(e['kept'] for e in self.sections)
+        return {
+            'session': session_id,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'tokenizer': self.tokenizer,
+            'budget': self.limit,
+            'total': imported + injected,
+            'overBudget': imported + injected > self.limit,
+            'imports': self.imports,
+            'importedTokens': imported,
+            'sections': [
+                {'name': e['name'], 'priority': SECTION_PRIORITY.get(e['name'], 1),
+                 'tokens': e['tokens'], 'kept': e['kept'],
+                 **({'trimmed': 'dropped' if not e['kept'] else 'cut'}
+                    if e['kept'] < e['tokens'] else {})}
+                for e in self.sections
+            ],
+            'injectedTokens': injected,
+        }
+
+    def write_report(self, shipkit_dir: Path, session_id: str) -> None:
+        try:
+            obs_dir = shipkit_dir / 'observability'
+            obs_dir.mkdir(parents=True, exist_ok=True)
+            out = obs_dir / context_budget_report_name(session_id)
+            out.write_text(json.dumps(self.report(session_id), indent=2), encoding='utf-8')
+        except Exception:
+            pass
+
+
+def context_budget_report_name(session_id: str) -> str:
+    safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', session_id) or 'unknown'
+    return CONTEXT_BUDGET_REPORT.format(session=safe_id)
+
+
+def prune_context_budget_reports(obs_dir: Path, session_id: str, now: float | None = None) -> None:
+    """Drop budget reports older than CONTEXT_BUDGET_KEEP_DAYS or beyond the newest
+    CONTEXT_BUDGET_KEEP. Never this session's: other sessions may still be running,
+    which is why this ages reports out instead of clearing them."""
+    current = context_budget_report_name(session_id)
+    cutoff = (now if now is not None else time.time()) - CONTEXT_BUDGET_KEEP_DAYS * 86400
+    reports = []
+    for path in obs_dir.glob(CONTEXT_BUDGET_REPORT.format(session='*')):
+        if path.name == current:
+            continue
+        try:
+            reports.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    reports.sort(reverse=True)
+    for i, (mtime, path) in enumerate(reports):
+        if mtime < cutoff or i >= CONTEXT_BUDGET_KEEP:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
 def get_missing_import_warning(shipkit_dir: Path) -> str | None:
     """Warn when a CLAUDE.md `@`-imported artefact is absent.
 
@@ -273,7 +786,8 @@ def get_strategic_digest(shipkit_dir: Path) -> str | None:
     if not strategic_file.exists():
         return None
     try:
-        data = json.loads(strategic_file.read_text(encoding='utf-8'))
+        data = {p[0]: v for p, v in read_artifact_paths(
+            strategic_file, [('stage',), ('stageImplications',), ('gates',)]).items()}
     except Exception:
         return None
 
@@ -349,69 +863,213 @@ def get_ed_adr_drift_warning(shipkit_dir: Path) -> str | None:
     Reads `architecture-archive.json` (full ADR bodies retain scope + status + links) as the
     authoritative ADR source; falls back to the lean `architecture.json` (best-effort — the
     lean file's superseded stubs drop scope, so only dormant/amended-active entries surface).
+    Both are read through the drift index (see load_drift_index), so a session only
+    re-parses the file that changed.
     """
-    ed_file = shipkit_dir / 'engineering-definition.json'
-    if not ed_file.exists():
-        return None
-    adr_file = shipkit_dir / 'architecture-archive.json'
-    if not adr_file.exists():
-        adr_file = shipkit_dir / 'architecture.json'
-    if not adr_file.exists():
-        return None
-    try:
-        ed = json.loads(ed_file.read_text(encoding='utf-8'))
-        adr = json.loads(adr_file.read_text(encoding='utf-8'))
-    except Exception:
+    index = load_drift_index(shipkit_dir)
+    if not index or not index['stale']:
         return None
+    stale = index['stale']
+    ids = ', '.join(sorted(stale))
+    n = len(stale)
+    return (
+        f"WARNING: engineering-definition has {n} mechanism(s) stale vs the ADR log "
+        f"({ids}) — a load-bearing ADR superseded/retired/amended them but the "
+        f"engineering-definition still describes the old approach. Reconcile before "
+        f"building against them: re-run `/shipkit-engineering-definition`, or treat the "
+        f"ADR log (`architecture.json`) as the live authority. "
+        f"Chain per mechanism: `python -X utf8 {Path(__file__).resolve().as_posix()} --ed-drift M-###`."
+    )
 
-    mechanisms = ed.get('mechanisms', [])
+
+# An ADR signals its scoped mechanism is stale when the decision was replaced
+# (superseded), retired (dormant/deprecated), or partially changed (amended).
+STALE_ADR_STATUSES = {'superseded', 'dormant', 'deprecated'}
+ADR_LINK_FIELDS = ('supersedes', 'supersededBy', 'amendedBy')
+UNNUMBERED_ADR = '(no id)'
+
+
+def _index_decisions(adr: dict) -> dict | None:
+    """mechanism id -> [compact ADR entries scoped to it], from an ADR log."""
     decisions = adr.get('decisions', [])
-    if not isinstance(mechanisms, list) or not isinstance(decisions, list):
+    if not isinstance(decisions, list):
         return None
-
-    # Map ED mechanism id -> already-acknowledged? (an explicit supersededByADR/staleSince
-    # marker means a session has reconciled it, so it is no longer an UNRESOLVED drift).
-    ed_ids = {}
-    for m in mechanisms:
-        if isinstance(m, dict) and m.get('id'):
-            ed_ids[m['id']] = bool(m.get('supersededByADR') or m.get('staleSince'))
-
-    # An ADR signals its scoped mechanism is stale when the decision was replaced
-    # (superseded), retired (dormant/deprecated), or partially changed (amended).
-    stale_statuses = {'superseded', 'dormant', 'deprecated'}
-    stale = set()
+    by_mechanism = {}
     for d in decisions:
         if not isinstance(d, dict):
             continue
         mech_ids = _mechanism_ids_from_scope(d.get('scope'))
         if not mech_ids:
             continue
-        status = str(d.get('status', '')).lower()
-        signals_stale = status in stale_statuses or bool(d.get('amendedBy'))
-        if not signals_stale:
-            continue
+        # An ADR without an id still marks its mechanisms stale; it is listed unnumbered.
+        entry = {'id': str(d.get('id') or UNNUMBERED_ADR), 'status': str(d.get('status', '')).lower()}
+        for link in ADR_LINK_FIELDS:
+            if d.get(link):
+                entry[link] = d[link]
         for mid in mech_ids:
-            if mid in ed_ids and not ed_ids[mid]:
-                stale.add(mid)
+            by_mechanism.setdefault(mid, []).append(entry)
+    return by_mechanism
+
 
-    if not stale:
+def _index_mechanisms(ed: dict) -> dict | None:
+    """ED mechanism id -> already acknowledged? An explicit supersededByADR/staleSince
+    marker means a session has reconciled it, so it is no longer an UNRESOLVED drift."""
+    mechanisms = ed.get('mechanisms', [])
+    if not isinstance(mechanisms, list):
         return None
-    ids = ', '.join(sorted(stale))
-    n = len(stale)
-    return (
-        f"WARNING: engineering-definition has {n} mechanism(s) stale vs the ADR log "
-        f"({ids}) — a load-bearing ADR superseded/retired/amended them but the "
-        f"engineering-definition still describes the old approach. Reconcile before "
-        f"building against them: re-run `/shipkit-engineering-definition`, or treat the "
-        f"ADR log (`architecture.json`) as the live authority."
-    )
+    return {m['id']: bool(m.get('supersededByADR') or m.get('staleSince'))
+            for m in mechanisms if isinstance(m, dict) and m.get('id')}
 
 
-def get_codebase_digest(shipkit_dir: Path) -> str | None:
+def load_drift_index(shipkit_dir: Path) -> dict | None:
+    """The ED↔ADR drift index, brought up to date with its two sources.
+
+    A sidecar in .shipkit/cache/ holds, per mechanism, the compact ADR entries
+    scoped to it (id, status, supersede/amend links) and whether the ED already
+    acknowledges it, each half keyed on its source file's (name, size, mtime_ns).
+    Only a half whose file moved is re-parsed — an ED edit never re-reads a large
+    archive — and `stale` (mechanism -> invalidating ADR ids) is recomputed from
+    the two halves. None when either source is missing or unreadable.
+    """
+    ed_file = shipkit_dir / 'engineering-definition.json'
+    adr_file = shipkit_dir / 'architecture-archive.json'
+    if not adr_file.exists():
+        adr_file = shipkit_dir / 'architecture.json'
+    ed_key, adr_key = _stat_key(ed_file), _stat_key(adr_file)
+    if ed_key is None or adr_key is None:
+        return None
+    ed_key, adr_key = [ed_file.name, *ed_key], [adr_file.name, *adr_key]
+
+    index_file = shipkit_dir.parent / ED_DRIFT_INDEX_PATH
+    try:
+        index = json.loads(index_file.read_text(encoding='utf-8'))
+        if not isinstance(index, dict) or index.get('version') != ED_DRIFT_INDEX_VERSION:
+            index = {}
+    except Exception:
+        index = {}
+
+    changed = False
+    try:
+        if index.get('adrKey') != adr_key:
+            decisions = _index_decisions(json.loads(adr_file.read_text(encoding='utf-8')))
+            if decisions is None:
+                return None
+            index.update(adrKey=adr_key, decisions=decisions)
+            changed = True
+        if index.get('edKey') != ed_key:
+            mechanisms = _index_mechanisms(json.loads(ed_file.read_text(encoding='utf-8')))
+            if mechanisms is None:
+                return None
+            index.update(edKey=ed_key, mechanisms=mechanisms)
+            changed = True
+    except Exception:
+        return None
+    if not changed:
+        return index
+
+    stale = {}
+    for mid, entries in index['decisions'].items():
+        if mid not in index['mechanisms'] or index['mechanisms'][mid]:
+            continue
+        invalidating = [e['id'] for e in entries
+                        if e['status'] in STALE_ADR_STATUSES or e.get('amendedBy')]
+        if invalidating:
+            stale[mid] = invalidating
+    index.update(version=ED_DRIFT_INDEX_VERSION, stale=stale)
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = index_file.with_name(f"{index_file.name}.tmp.{os.getpid()}")
+        tmp.write_text(json.dumps(index, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, index_file)
+    except Exception:
+        pass
+    return index
+
+
+def print_drift_chain(project_root: Path, mechanism: str | None = None) -> int:
+    """CLI: the ADR chain behind one mechanism, or every stale mechanism — from the index."""
+    index = load_drift_index(project_root / '.shipkit')
+    if index is None:
+        print("No engineering-definition.json + ADR log to compare.")
+        return 1
+    targets = [mechanism] if mechanism else sorted(index['stale'])
+    if not targets:
+        print("No ED mechanism is stale vs the ADR log.")
+        return 0
+    for mid in targets:
+        entries = sorted(index['decisions'].get(mid, []), key=lambda e: e['id'])
+        if mid not in index['mechanisms']:
+            state = "not in engineering-definition"
+        elif index['mechanisms'][mid]:
+            state = "acknowledged in engineering-definition"
+        elif mid in index['stale']:
+            state = "STALE — invalidated by " + ', '.join(index['stale'][mid])
+        else:
+            state = "current"
+        print(f"{mid}: {state}")
+        if not entries:
+            print("  (no ADR scoped to this mechanism)")
+        for e in entries:
+            links = []
+            if e.get('supersedes'):
+                links.append(f"supersedes {e['supersedes']}")
+            if e.get('supersededBy'):
+                links.append(f"superseded by {e['supersededBy']}")
+            if e.get('amendedBy'):
+                amended = e['amendedBy']
+                links.append("amended by " + (', '.join(amended) if isinstance(amended, list) else str(amended)))
+            print(f"  {e['id']} [{e['status'] or '?'}]" + (f" — {'; '.join(links)}" if links else ''))
+    return 0
+
+
+def _workspace_digest(shipkit_dir: Path, data: dict, cwd: str | None) -> list[str]:
+    """Monorepo lines: the package shard containing cwd, else a one-line package list.
+
+    Only the relevant shard is read — the others stay on disk behind the pointer.
+    """
+    workspaces = data.get('workspaces')
+    if not isinstance(workspaces, list) or not workspaces:
+        return []
+    project_root = shipkit_dir.parent
+    rel = ''
+    if cwd:
+        try:
+            rel = Path(cwd).resolve().relative_to(project_root.resolve()).as_posix()
+        except (ValueError, OSError):
+            rel = ''
+    current = None
+    for ws in workspaces:
+        path = ws.get('path') if isinstance(ws, dict) else None
+        if path and (rel == path or rel.startswith(path + '/')):
+            if current is None or len(path) > len(current['path']):
+                current = ws
+    if current is None:
+        names = ', '.join(f"`{ws.get('path')}`" for ws in workspaces[:20] if isinstance(ws, dict))
+        more = f" (+{len(workspaces) - 20} more)" if len(workspaces) > 20 else ''
+        return [f"**Workspace packages ({len(workspaces)}):** {names}{more} — "
+                f"per-package shards in `.shipkit/codebase-shards/`.", '']
+    try:
+        shard = json.loads((project_root / current['shard']).read_text(encoding='utf-8'))
+    except Exception:
+        return []
+    out = [f"**Package `{current['path']}`** ({shard.get('name', current['path'])}) — "
+           f"shard `{current['shard']}`"]
+    scripts = shard.get('scripts')
+    if isinstance(scripts, dict) and scripts:
+        out.append("- scripts: " + ', '.join(f"`{k}`" for k in list(scripts)[:12]))
+    active = shard.get('recentlyActive')
+    if isinstance(active, list) and active:
+        out.append("- recently active: " + ', '.join(f"`{f}`" for f in active[:8]))
+    out.append('')
+    return out
+
+
+def get_codebase_digest(shipkit_dir: Path, cwd: str | None = None) -> str | None:
     """Inject a lean navigation digest from codebase-index.json — kills default-to-grep.
 
     concepts (concept -> files) + entryPoints + skip, size-capped. On a large index,
     inject top-N concepts + a pointer to the full on-disk file (never the whole thing).
+    In a monorepo, only the shard of the package containing cwd is loaded.
     """
     index_file = shipkit_dir / 'codebase-index.json'
     if not index_file.exists():
@@ -442,7 +1100,13 @@ def get_codebase_digest(shipkit_dir: Path) -> str | None:
             out.append("**Entry points:** " + ', '.join(pairs))
             out.append('')
 
+    out.extend(_workspace_digest(shipkit_dir, data, cwd))
+
     pointer = "*Full index on disk — `Read .shipkit/codebase-index.json` for per-file detail.*"
+    symbols = data.get('symbols')
+    if isinstance(symbols, dict) and symbols.get('path'):
+        pointer += (f"\n*Exported symbols per file — grep `{symbols['path']}` "
+                    f"before searching the tree for a definition.*")
 
     concepts = data.get('concepts', {})
     concept_lines = []
@@ -487,11 +1151,8 @@ def get_codebase_digest(shipkit_dir: Path) -> str | None:
 
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    # Parse hook input
-    try:
-        hook_input = json.load(sys.stdin)
-    except Exception:
-        hook_input = {}
+    hook_input = rt.read_input()
+    session_id = str(hook_input.get('session_id') or 'unknown')
 
     # Resolve skills_dir from the hook's OWN location — works whether installed
     # in a project's .claude/, at user level ~/.claude/, or run from source.
@@ -506,7 +1167,7 @@ def main():
     # hook path would wrongly point at $HOME. CLAUDE_PROJECT_DIR is the session's
     # project root; fall back to the hook input's cwd.
     env_dir = os.environ.get('CLAUDE_PROJECT_DIR', '')
-    input_cwd = hook_input.get('cwd', '') if isinstance(hook_input, dict) else ''
+    input_cwd = hook_input.get('cwd', '')
     if env_dir:
         project_root = Path(env_dir)
     elif input_cwd:
@@ -543,92 +1204,133 @@ def main():
     # ── Activated Shipkit project: point at the engine, don't inject its body. ──
     # Hooks inject STATE, not instructions. The engine's full protocol (~1700 tokens)
     # loads when the skill is invoked; its listing description already routes to it.
-    lines.append(
+    # Output is assembled as named blocks so the context budget can price and trim them.
+    blocks = [('engine', (
         "**Shipkit active.** Engine: `/shipkit-orchestrate` — drives any set of steps to a "
         "confirmed ground-truth bar (delegate → reconcile → re-dispatch loop).\n"
         "Phase skills (build/review/direction) call it; invoke it directly to drive work to done.\n"
-        "Its full protocol loads on invocation — do not re-implement orchestration inline."
-    )
-    lines.append('')
-    lines.append('---')
-    lines.append('')
+        "Its full protocol loads on invocation — do not re-implement orchestration inline.\n"
+        "\n---\n"
+    ))]
+
+    # ── Sections: built concurrently, emitted in a fixed order ──
+    # Each builder is independent (file reads, spawning background work), so they
+    # run on threads and the slow ones — a sync-mode index refresh above all —
+    # overlap local parsing. The codebase digest waits for the refresh,
+    # since in sync mode it must read the refreshed index. A section not ready by
+    # the deadline is dropped; its thread is a daemon, so it can't hold up exit.
+    section_cache = SectionCache(project_root)
+    progress_file = shipkit_dir / 'progress.json'
+    strategic_file = shipkit_dir / 'goals' / 'strategic.json'
+    digest_cwd = input_cwd or os.getcwd()
+
+    def clean_old_logs():
+        obs_dir = shipkit_dir / 'observability'
+        if obs_dir.exists():
+            # Skill usage is kept by age and size, budget reports by age and count.
+            shipkit_usage.prune(obs_dir)
+            prune_context_budget_reports(obs_dir, session_id)
+
+    # Keep the codebase index fresh (deterministic, no LLM). Catches commits made
+    # outside Claude that the git-commit hook never saw. Runs in the background by
+    # default, so the digest reads the index already on disk.
+    refresh = _Task(lambda: refresh_codebase_index(skills_dir, project_root))
+
+    # Price the always-loaded `@`-imports (and load the tokenizer) alongside the sections.
+    def start_budget():
+        budget = ContextBudget(project_root)
+        files = claude_md_imports(project_root)
+        budget.imports = section_cache.get(
+            'budget-imports', files, lambda: budget.measure_imports(files), extra=budget.tokenizer)
+        return budget
+    budget_task = _Task(start_budget)
+    sections = [
+        # Version check
+        ('update', _Task(lambda: check_for_updates(project_root))),
+        # Clean old observability logs (no output)
+        ('log-cleanup', _Task(clean_old_logs)),
+        # Optional warm hook daemon (no output)
+        ('hook-daemon', _Task(lambda: start_hook_daemon(project_root))),
+        # Progress resume
+        ('progress', _Task(lambda: section_cache.get(
+            'progress', [progress_file], lambda: get_progress_summary(project_root),
+            extra=format_age(get_file_age_days(progress_file))))),
+        # Missing `@`-import warning (hook-warn guard)
+        ('import-warning', _Task(lambda: get_missing_import_warning(shipkit_dir))),
+        # ED↔ADR staleness: flag mechanisms a load-bearing ADR has invalidated
+        ('ed-adr-drift', _Task(lambda: section_cache.get(
+            'ed-adr-drift',
+            [shipkit_dir / n for n in ('engineering-definition.json', 'architecture-archive.json',
+                                       'architecture.json')],
+            lambda: get_ed_adr_drift_warning(shipkit_dir)))),
+        # Size budgets on always-loaded artifacts (loud when over, silent when fine)
+        ('size-budgets', _Task(lambda: section_cache.get(
+            'size-budgets', [project_root / rel for rel in SIZE_BUDGETS],
+            lambda: get_size_budget_warnings(project_root)))),
+        # Stage & gates: lean always-on "definition of done"
+        ('strategic', _Task(lambda: section_cache.get(
+            'strategic', [strategic_file], lambda: get_strategic_digest(shipkit_dir),
+            extra=format_age(get_file_age_days(strategic_file))))),
+        # Codebase navigation map: lean digest (stops default-to-grep)
+        ('codebase', _Task(lambda: section_cache.get(
+            'codebase',
+            [shipkit_dir / 'codebase-index.json', project_root / '.shipkit' / 'codebase-shards'],
+            lambda: get_codebase_digest(shipkit_dir, digest_cwd),
+            # The staleness nudge ages by the day; the shard shown depends on cwd.
+            extra=[datetime.now().strftime('%Y-%m-%d'), digest_cwd]), refresh)),
+        # Available context files
+        ('context-table', _Task(lambda: section_cache.get(
+            'context-table',
+            [shipkit_dir / name for name, _ in CONTEXT_FILES]
+            + [shipkit_dir / 'specs' / 'active', shipkit_dir / 'plans' / 'active',
+               shipkit_dir / 'goals'],
+            lambda: build_context_table(shipkit_dir),
+            extra=[format_age(get_file_age_days(shipkit_dir / name)) for name, _ in CONTEXT_FILES]))),
+    ]
 
-    # ── Version check ──
-    update_msg = check_for_updates(project_root)
-    if update_msg:
-        lines.append(update_msg)
-        lines.append('')
+    deadline = time.monotonic() + SECTION_DEADLINE_SECONDS
+    missed = []
+    artifact_count = 0
+    for name, task in sections:
+        value = task.result(deadline)
+        if value is _MISSED:
+            missed.append(name)
+        elif name == 'context-table' and value:
+            table = value['lines']
+            artifact_count = value['found'] + value['specs'] + value['plans']
+            if artifact_count == 0:
+                table = table + ["No context files yet. Start with `/shipkit-project-context`.", '']
+            blocks.append((name, '\n'.join(table)))
+        elif isinstance(value, str) and value:
+            blocks.append((name, value + '\n'))
+    if missed:
+        print(f"[shipkit:{HOOK_NAME}] past the {SECTION_DEADLINE_SECONDS}s deadline, dropped: "
+              f"{', '.join(missed)}", file=sys.stderr)
+
+    blocks.append(('footer', "*Read context files before re-discovering patterns.*\n"))
+
+    # One budget across imports + injected blocks; trims lowest-priority sections.
+    budget = budget_task.result(deadline)
+    if budget is not _MISSED and budget is not None:
+        blocks = budget.fit(blocks)
+        budget.write_report(shipkit_dir, session_id)
+
+    section_cache.save()
+    _emit_context('\n'.join(text for _, text in blocks), project_root, artifact_count)
+    return 0
 
-    # ── Clean old observability logs ──
-    obs_dir = shipkit_dir / 'observability'
-    if obs_dir.exists():
-        for old_log in obs_dir.glob('skill-usage.*.local.jsonl'):
-            try:
-                old_log.unlink()
-            except OSError:
-                pass
 
-    # ── Progress resume ──
-    progress = get_progress_summary(project_root)
-    if progress:
-        lines.append(progress)
-        lines.append('')
-
-    # ── Missing `@`-import warning (hook-warn guard) ──
-    import_warning = get_missing_import_warning(shipkit_dir)
-    if import_warning:
-        lines.append(import_warning)
-        lines.append('')
-
-    # ── ED↔ADR staleness: flag mechanisms a load-bearing ADR has invalidated ──
-    ed_drift = get_ed_adr_drift_warning(shipkit_dir)
-    if ed_drift:
-        lines.append(ed_drift)
-        lines.append('')
-
-    # ── Size budgets on always-loaded artifacts (loud when over, silent when fine) ──
-    size_warning = get_size_budget_warnings(project_root)
-    if size_warning:
-        lines.append(size_warning)
-        lines.append('')
-
-    # ── Stage & gates: lean always-on "definition of done" ──
-    strategic = get_strategic_digest(shipkit_dir)
-    if strategic:
-        lines.append(strategic)
-        lines.append('')
-
-    # ── Keep the codebase index fresh (deterministic, no LLM) before digesting it.
-    #    Catches commits made outside Claude that the git-commit hook never saw. ──
-    refresh_codebase_index(skills_dir, project_root)
-
-    # ── Codebase navigation map: lean digest (stops default-to-grep) ──
-    codebase = get_codebase_digest(shipkit_dir)
-    if codebase:
-        lines.append(codebase)
-        lines.append('')
-
-    # ── Available context files ──
+def build_context_table(shipkit_dir: Path) -> dict:
+    """The "Available Context" table: present files with age/size, plus spec, plan and
+    goal counts. Returns {'lines', 'found', 'specs', 'plans'}."""
+    lines = []
     lines.append("## Available Context")
     lines.append('')
     lines.append("| File | Age | Size | Purpose |")
     lines.append("|------|-----|------|---------|")
 
-    context_files = [
-        ('why.json', 'Project vision & purpose'),
-        ('product-discovery.json', 'Personas, journeys, needs'),
-        ('product-definition.json', 'Product blueprint'),
-        ('engineering-definition.json', 'Engineering blueprint'),
-        ('stack.json', 'Tech stack & patterns'),
-        ('architecture.json', 'Architecture decisions'),
-        ('codebase-index.json', 'Semantic file map'),
-        ('progress.json', 'Session continuity'),
-        ('spec-roadmap.json', 'Spec priority order'),
-        ('orchestration.json', 'Pipeline state & crash recovery'),
-    ]
-
     found_count = 0
-    for filename, purpose in context_files:
+    for filename, purpose in CONTEXT_FILES:
         file_path = shipkit_dir / filename
         if file_path.exists():
             age = format_age(get_file_age_days(file_path))
@@ -659,17 +1361,7 @@ def main():
             lines.append(f"| `goals/` | {names} | — | Success criteria |")
 
     lines.append('')
-
-    if found_count == 0 and spec_count == 0 and plan_count == 0:
-        lines.append("No context files yet. Start with `/shipkit-project-context`.")
-        lines.append('')
-
-    lines.append("*Read context files before re-discovering patterns.*")
-    lines.append('')
-
-    artifact_count = found_count + spec_count + plan_count
-    _emit_context('\n'.join(lines), project_root, artifact_count)
-    return 0
+    return {'lines': lines, 'found': found_count, 'specs': spec_count, 'plans': plan_count}
 
 
 def _emit_context(content: str, project_root: Path = None, artifact_count: int = 0):
@@ -687,21 +1379,16 @@ def _emit_context(content: str, project_root: Path = None, artifact_count: int =
     project_name = project_root.name if project_root else "project"
     session_title = f"Shipkit — {project_name} ({artifact_count} artifacts)"
     watch_dir = str(project_root / ".shipkit") if project_root else ".shipkit"
-    output = {
-        "hookSpecificOutput": {
-            "hookEventName": "SessionStart",
-            "additionalContext": content,
-            "sessionTitle": session_title,
-            "reloadSkills": True,
-            "watchPaths": [watch_dir]
-        }
-    }
-    print(json.dumps(output))
+    rt.emit_context("SessionStart", content, sessionTitle=session_title,
+                    reloadSkills=True, watchPaths=[watch_dir])
 
 
 if __name__ == '__main__':
-    try:
-        sys.exit(main())
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+    if len(sys.argv) == 3 and sys.argv[1] == '--update-check':
+        # Background refresh spawned by check_for_updates(); not a hook event.
+        sys.exit(refresh_update_check(Path(sys.argv[2])))
+    if len(sys.argv) in (2, 3) and sys.argv[1] == '--ed-drift':
+        # Developer CLI: list the ADR chain behind a mechanism (or all stale ones).
+        root = Path(os.environ.get('CLAUDE_PROJECT_DIR', '') or os.getcwd())
+        sys.exit(print_drift_chain(root, sys.argv[2] if len(sys.argv) == 3 else None))
+    rt.run(main, HOOK_NAME)
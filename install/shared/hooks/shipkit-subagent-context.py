@@ -15,28 +15,42 @@ import os
 import sys
 from pathlib import Path
 
+import shipkit_runtime as rt
+
 HOOK_NAME = "subagent-context"
 # Built-in agents that don't need orchestration context
 SKIP_AGENTS = {"Explore", "Plan", "Bash", "general-purpose", "statusline-setup", "claude-code-guide"}
 
-
-def find_project_root(cwd: str) -> Path | None:
-    current = Path(cwd).resolve()
-    for _ in range(20):
-        if (current / '.shipkit').is_dir():
-            return current
-        parent = current.parent
-        if parent == current:
-            break
-        current = parent
-    return None
+# The few fields read per dispatch are kept here, keyed on each artifact's size +
+# mtime, so a dispatch storm doesn't re-parse a large progress.json every time.
+SUMMARY_CACHE_PATH = Path('.shipkit') / 'cache' / 'artifact-summaries.json'
 
 
-def read_json_safe(path: Path) -> dict | None:
+def read_paths_safe(path: Path, paths: list, cache_file: Path) -> dict | None:
+    """{key path: value} for the requested paths of a JSON artifact, or None when
+    it can't be read. Served from the summary sidecar while the file is unchanged;
+    a full parse when shipkit-artifacts.py isn't installed."""
+    if not path.exists():
+        return None
+    artifacts = rt.load_sibling('shipkit-artifacts.py')
     try:
-        return json.loads(path.read_text(encoding='utf-8'))
-    except (OSError, json.JSONDecodeError):
+        if artifacts is not None:
+            return artifacts.read_paths(path, paths, cache_file=cache_file)
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
         return None
+    found = {}
+    for p in paths:
+        value = data
+        for step in p:
+            if not isinstance(value, dict) or step not in value:
+                break
+            value = value[step]
+        else:
+            found[p] = value
+    return found
 
 
 def build_context(project_root: Path) -> str | None:
@@ -46,12 +60,16 @@ def build_context(project_root: Path) -> str | None:
 
     parts = []
 
+    cache_file = project_root / SUMMARY_CACHE_PATH
+
     # Project identity from why.json
-    why = read_json_safe(shipkit / 'why.json')
-    if why:
-        name = why.get('projectName') or why.get('name') or project_root.name
-        approach = why.get('approach', {}).get('oneLiner', '')
-        stage = why.get('stage', '')
+    why = read_paths_safe(shipkit / 'why.json',
+                          [('projectName',), ('name',), ('approach', 'oneLiner'), ('stage',)],
+                          cache_file)
+    if why is not None:
+        name = why.get(('projectName',)) or why.get(('name',)) or project_root.name
+        approach = why.get(('approach', 'oneLiner'), '')
+        stage = why.get(('stage',), '')
         parts.append(f"Project: {name}")
         if stage:
             parts.append(f"Stage: {stage}")
@@ -59,10 +77,11 @@ def build_context(project_root: Path) -> str | None:
             parts.append(f"Approach: {approach}")
 
     # Current orchestration state from progress.json
-    progress = read_json_safe(shipkit / 'progress.json')
+    progress = read_paths_safe(shipkit / 'progress.json',
+                               [('currentLoop',), ('currentDispatch',)], cache_file)
     if progress:
-        current_loop = progress.get('currentLoop', '')
-        current_dispatch = progress.get('currentDispatch', '')
+        current_loop = progress.get(('currentLoop',), '')
+        current_dispatch = progress.get(('currentDispatch',), '')
         if current_loop:
             parts.append(f"Loop: {current_loop}")
         if current_dispatch:
@@ -93,9 +112,8 @@ def build_context(project_root: Path) -> str | None:
 
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    try:
-        hook_input = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
+    hook_input = rt.read_input()
+    if not hook_input:
         sys.exit(1)
 
     # Skip built-in agents
@@ -104,7 +122,7 @@ def main():
         sys.exit(1)
 
     cwd = hook_input.get('cwd', os.getcwd())
-    project_root = find_project_root(cwd)
+    project_root = rt.find_project_root(cwd, markers=('.shipkit',))
     if not project_root:
         sys.exit(1)
 
@@ -112,19 +130,9 @@ def main():
     if not context:
         sys.exit(1)
 
-    output = {
-        "hookSpecificOutput": {
-            "hookEventName": "SubagentStart",
-            "additionalContext": f"[Shipkit] {context}"
-        }
-    }
-    print(json.dumps(output))
+    rt.emit_context("SubagentStart", f"[Shipkit] {context}")
     sys.exit(0)
 
 
 if __name__ == '__main__':
-    try:
-        main()
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+    rt.run(main, HOOK_NAME)
@@ -20,9 +20,10 @@ Input: JSON on stdin with TaskCreated event data (task_title, task_id, ...)
 Output: stderr for feedback message when blocking (exit 2)
 """
 
-import json
 import sys
 
+import shipkit_runtime as rt
+
 HOOK_NAME = "task-created"
 
 
@@ -37,10 +38,7 @@ def first_nonempty(hook_input: dict, *keys: str) -> str:
 
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    try:
-        hook_input = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
-        hook_input = {}
+    hook_input = rt.read_input()
 
     # Accept either the documented (task_*) or bare key names defensively.
     title = first_nonempty(hook_input, "task_title", "title", "subject")
@@ -71,9 +69,5 @@ def main():
     sys.exit(0)
 
 
-if __name__ == "__main__":
-    try:
-        main()
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+if __name__ == '__main__':
+    rt.run(main, HOOK_NAME)
@@ -17,38 +17,19 @@ Output: stderr for feedback messages when keeping teammate working (exit 2)
 """
 
 import json
-import os
 import sys
-from pathlib import Path
 
-HOOK_NAME = "teammate-idle"
+import shipkit_runtime as rt
 
-def find_project_root(start: Path) -> Path | None:
-    """Walk up from start to find the project root (directory containing .shipkit/ or .claude/)."""
-    current = start.resolve()
-    for _ in range(20):
-        if (current / '.shipkit').is_dir() or (current / '.claude').is_dir():
-            return current
-        parent = current.parent
-        if parent == current:
-            break
-        current = parent
-    return None
+HOOK_NAME = "teammate-idle"
 
 
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    # Read hook input from stdin
-    hook_input = {}
-    try:
-        hook_input = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
-        pass
+    hook_input = rt.read_input()
 
     # Find project directory — walk up from CWD to handle subdirectories
-    env_dir = os.environ.get("CLAUDE_PROJECT_DIR", "")
-    start_dir = Path(env_dir) if env_dir else Path(hook_input.get("cwd", os.getcwd()))
-    project_dir = find_project_root(start_dir) or start_dir
+    project_dir = rt.project_dir(hook_input)
     shipkit_dir = project_dir / ".shipkit"
 
     # Quick exit if not in team mode
@@ -100,9 +81,5 @@ def main():
     sys.exit(0)
 
 
-if __name__ == "__main__":
-    try:
-        main()
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+if __name__ == '__main__':
+    rt.run(main, HOOK_NAME)
@@ -3,40 +3,25 @@
 Shipkit - Skill Usage Tracker
 
 Appends one JSONL line per Skill() invocation to .shipkit/observability/.
-Each session gets its own file (keyed by session_id). Session-start hook
-cleans old files.
+Each session gets its own live segment (keyed by session_id), sealed once it
+is full — see shipkit_usage.py. Session-start prunes segments by age and size.
 
 Hook type: PostToolUse (matcher: Skill)
 """
 
 import sys
-import os
-import json
 from pathlib import Path
 from datetime import datetime
 
-HOOK_NAME = "track-skill-usage"
+import shipkit_runtime as rt
+import shipkit_usage
 
-def _find_project_root(start: Path) -> Path | None:
-    """Walk up from start to find the project root (directory containing .shipkit/ or .claude/)."""
-    current = start.resolve()
-    for _ in range(20):  # Safety limit
-        if (current / '.shipkit').is_dir() or (current / '.claude').is_dir():
-            return current
-        parent = current.parent
-        if parent == current:
-            break  # Hit filesystem root
-        current = parent
-    return None
+HOOK_NAME = "track-skill-usage"
 
 
 def main():
     print(f"[shipkit:{HOOK_NAME}] running", file=sys.stderr)
-    # Read hook input from stdin
-    try:
-        hook_input = json.loads(sys.stdin.read())
-    except json.JSONDecodeError:
-        return 0  # Silent exit on parse error
+    hook_input = rt.read_input()
 
     # Extract skill name from tool_input
     tool_input = hook_input.get('tool_input', {})
@@ -50,7 +35,7 @@ def main():
     if not cwd:
         return 0
 
-    project_root = _find_project_root(Path(cwd))
+    project_root = rt.find_project_root(Path(cwd))
     if not project_root:
         return 0  # Not in a Shipkit project
 
@@ -73,11 +58,9 @@ def main():
     if agent_type:
         entry['agentType'] = agent_type
 
-    # Append to session-specific JSONL file (atomic append, no read-modify-write)
-    tracking_file = obs_dir / f'skill-usage.{session_id}.local.jsonl'
+    # Append to the session's live segment (atomic append, no read-modify-write)
     try:
-        with open(tracking_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        shipkit_usage.append(obs_dir, session_id, entry)
     except IOError:
         pass  # Silent fail on write error
 
@@ -85,8 +68,4 @@ def main():
 
 
 if __name__ == '__main__':
-    try:
-        sys.exit(main())
-    except Exception as e:
-        print(f"[shipkit:{HOOK_NAME}] ERROR: {e}", file=sys.stderr)
-        sys.exit(0)
+    rt.run(main, HOOK_NAME)
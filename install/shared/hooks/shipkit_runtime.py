@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Shipkit hook runtime — the shared fast path every hook starts with.
+
+Each hook event is a fresh interpreter, so start-up cost is paid on every Skill
+call, commit and subagent dispatch. This module keeps that cost down and in one
+place:
+
+- read_input() / emit() / emit_context(): one stdin-parse and stdout-emit path.
+- find_project_root() / project_dir(): one root resolver — CLAUDE_PROJECT_DIR
+  first, then a cwd → root map cached per user and checked with two stats.
+- lazy_import(): heavy stdlib modules (urllib.request, subprocess, ...) are
+  loaded on first use, not at import, so a hook that doesn't touch them on its
+  hot path never pays for them.
+- load_sibling(): hyphen-named helpers next to the hooks (shipkit-artifacts.py).
+- run(): the standard `__main__` wrapper — never let a hook error break a session.
+
+Hooks may also run inside the optional daemon (shipkit-hookd.py), which calls
+their main() directly with per-event stdio, cwd and environment; IN_DAEMON is
+True there.
+
+Imported by the hooks as `import shipkit_runtime as rt` (the hook's own
+directory is first on sys.path when it runs as a script). Not a hook itself.
+`Scripts/bench-hooks.py` tracks the per-event wall time this is meant to keep low.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+from stat import S_ISDIR
+
+# Directories that mark a project root when walking up from a cwd.
+ROOT_MARKERS = ('.shipkit', '.claude')
+MAX_ROOT_DEPTH = 20
+ROOT_CACHE_VERSION = 1
+ROOT_CACHE_MAX = 256
+
+# True inside shipkit-hookd.py, where hooks run in-process rather than as scripts.
+IN_DAEMON = False
+
+_roots = {}        # this process's validated cwd → root entries
+_disk_roots = None  # the per-user cache file, loaded on first miss
+
+
+def lazy_import(name: str):
+    """Module `name`, executed on first attribute access instead of now.
+
+    Already-imported modules are returned as-is. Use for modules only some code
+    paths need (`urllib.request` costs ~30 ms, `subprocess` ~5 ms). The first
+    attribute access isn't thread-safe before Python 3.12: a module first used
+    from several threads at once should be imported normally.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def read_input() -> dict:
+    """The hook payload from stdin; {} when it is empty, malformed or not an object."""
+    try:
+        data = json.load(sys.stdin)
+    except (ValueError, EOFError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def emit(payload: dict) -> None:
+    """Write a hook's JSON reply to stdout."""
+    print(json.dumps(payload))
+
+
+def emit_context(event: str, text: str, **fields) -> None:
+    """Reply with additionalContext (plus any other hookSpecificOutput fields) for event."""
+    emit({"hookSpecificOutput": {"hookEventName": event, "additionalContext": text, **fields}})
+
+
+def _root_cache_path() -> str:
+    """Per-user cwd → root map: SHIPKIT_ROOT_CACHE, else the user cache dir."""
+    override = os.environ.get('SHIPKIT_ROOT_CACHE', '')
+    if override:
+        return override
+    base = os.environ.get('XDG_CACHE_HOME') or (os.environ.get('LOCALAPPDATA') if os.name == 'nt' else '')
+    return os.path.join(base or os.path.join(os.path.expanduser('~'), '.cache'),
+                        'shipkit', 'project-roots.json')
+
+
+def _load_root_cache() -> dict:
+    try:
+        with open(_root_cache_path(), encoding='utf-8') as fh:
+            cache = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != ROOT_CACHE_VERSION:
+        return {}
+    entries = cache.get('roots')
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_root_cache(entries: dict) -> None:
+    path = _root_cache_path()
+    while len(entries) > ROOT_CACHE_MAX:
+        del entries[next(iter(entries))]  # oldest first
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump({'version': ROOT_CACHE_VERSION, 'roots': entries}, fh, separators=(',', ':'))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _root_entry_valid(entry, start: str) -> bool:
+    """Two stats: start is the same directory with the same mtime (no marker
+    created in it), and the root's marker is still the same directory."""
+    try:
+        st = os.stat(start)
+        marker = os.stat(os.path.join(entry['root'], entry['marker'][0]))
+        return [st.st_ino, st.st_mtime_ns] == entry['start'] \
+            and S_ISDIR(marker.st_mode) and marker.st_ino == entry['marker'][1]
+    except (OSError, KeyError, TypeError, IndexError):
+        return False
+
+
+def _walk_up(start: str, markers) -> tuple[str, str] | None:
+    """(root, marker) of the nearest directory at or above start holding a marker."""
+    current = os.path.realpath(start)
+    for _ in range(MAX_ROOT_DEPTH):
+        for m in markers:
+            if os.path.isdir(os.path.join(current, m)):
+                return current, m
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+    return None
+
+
+def find_project_root(start, markers=ROOT_MARKERS) -> Path | None:
+    """Nearest directory at or above start holding one of markers, or None.
+
+    CLAUDE_PROJECT_DIR wins when start is inside it and it holds a marker. Else
+    a found root is remembered — per process and in a per-user cache file
+    (_root_cache_path()) — keyed on start, and reused while start's inode and
+    mtime and the root marker's inode are unchanged: two stats however deep
+    start is. A marker created in a directory between start and its cached
+    root is not noticed until start itself changes or the entry is evicted.
+    """
+    start = os.path.abspath(start)
+    markers = tuple(markers)
+    env_dir = os.environ.get('CLAUDE_PROJECT_DIR', '')
+    if env_dir:
+        env_dir = os.path.abspath(env_dir)
+        if (start == env_dir or start.startswith(env_dir.rstrip(os.sep) + os.sep)) \
+                and any(os.path.isdir(os.path.join(env_dir, m)) for m in markers):
+            return Path(env_dir)
+
+    global _disk_roots
+    key = start + '\0' + ','.join(markers)
+    entry = _roots.get(key)
+    if entry is None:
+        if _disk_roots is None:
+            _disk_roots = _load_root_cache()
+        entry = _disk_roots.get(key)
+    if entry is not None and _root_entry_valid(entry, start):
+        _roots[key] = entry
+        return Path(entry['root'])
+
+    found = _walk_up(start, markers)
+    if found is None:
+        return None
+    root, marker = found
+    try:
+        st = os.stat(start)
+        entry = {'root': root, 'marker': [marker, os.stat(os.path.join(root, marker)).st_ino],
+                 'start': [st.st_ino, st.st_mtime_ns]}
+    except OSError:
+        return Path(root)
+    _roots[key] = entry
+    if _disk_roots is None:
+        _disk_roots = _load_root_cache()
+    _disk_roots.pop(key, None)
+    _disk_roots[key] = entry
+    _save_root_cache(_disk_roots)
+    return Path(root)
+
+
+def project_dir(hook_input: dict) -> Path:
+    """The session's project directory: CLAUDE_PROJECT_DIR, else the payload's cwd
+    (or the process cwd), walked up to its project root when there is one."""
+    env_dir = os.environ.get("CLAUDE_PROJECT_DIR", "")
+    start = Path(env_dir) if env_dir else Path(hook_input.get("cwd") or os.getcwd())
+    return find_project_root(start) or start
+
+
+def load_sibling(filename: str):
+    """Load a helper module that lives beside the hooks (e.g. shipkit-artifacts.py),
+    once per process. None when it is missing or fails to import."""
+    name = 'shipkit_' + Path(filename).stem.replace('shipkit-', '').replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+    path = Path(__file__).resolve().parent / filename
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        return None
+    sys.modules[name] = module
+    return module
+
+
+def run(main, hook_name: str) -> None:
+    """Run a hook's main() and exit with its return code. An uncaught error is
+    reported on stderr and exits 0 — a failing hook must never block the session."""
+    try:
+        sys.exit(main())
+    except Exception as e:
+        print(f"[shipkit:{hook_name}] ERROR: {e}", file=sys.stderr)
+        sys.exit(0)
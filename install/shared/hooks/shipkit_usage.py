@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Shipkit skill-usage store — segmented JSONL with per-segment rollups.
+
+The Skill tracker appends one JSON line per call to the session's live segment,
+`skill-usage.<session>.local.jsonl`. Once that reaches SEGMENT_MAX_BYTES it is
+sealed: renamed to `skill-usage.<session>.seg<time>-<pid>.local.jsonl`, never
+appended to again. Every segment still matches `skill-usage.*.local.jsonl` and
+holds the same lines as before, so anything that reads the raw logs keeps
+working.
+
+summary() answers per-skill counts, first/last timestamps and agent-type
+counts. A sealed segment is parsed once; its rollup is kept in
+`skill-usage.rollup.local.json`, keyed on the segment's (size, mtime_ns). Only
+live segments, each at most one segment long, are parsed again. UsageTail does
+the same for a long-lived reader, parsing only newly appended lines. prune()
+applies retention by age and total size, replacing the old wipe-every-session.
+
+Imported by the tracker and session-start hooks and by the dashboard
+(scripts/observability/watch.py). Stdlib only.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+USAGE_GLOB = 'skill-usage.*.local.jsonl'
+ROLLUP_FILE = 'skill-usage.rollup.local.json'
+ROLLUP_VERSION = 1
+SEGMENT_MAX_BYTES = 256 * 1024
+RETENTION_DAYS = 30
+RETENTION_MAX_BYTES = 8 * 1024 * 1024
+
+
+def live_segment(obs_dir: Path, session_id: str) -> Path:
+    return obs_dir / f'skill-usage.{session_id}.local.jsonl'
+
+
+def is_sealed(path: Path) -> bool:
+    """skill-usage.<session>.seg<time>-<pid>.local.jsonl (a live segment has no seg part)."""
+    parts = path.name.split('.')
+    return len(parts) == 5 and parts[2].startswith('seg')
+
+
+def append(obs_dir: Path, session_id: str, entry: dict) -> None:
+    """Append entry to the session's live segment; seal it once it is full.
+
+    One O_APPEND write per line, so concurrent writers in a session interleave
+    whole lines. A writer that still holds the file across a seal appends to the
+    sealed segment, whose rollup is then simply recomputed (its stat moved).
+    """
+    path = live_segment(obs_dir, session_id)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        size = f.tell()
+    if size >= SEGMENT_MAX_BYTES:
+        # Time-ordered and unique per writer, so a seal never replaces a segment.
+        sealed = obs_dir / f'skill-usage.{session_id}.seg{time.time_ns():x}-{os.getpid()}.local.jsonl'
+        try:
+            os.rename(path, sealed)
+        except OSError:
+            pass  # another writer sealed it first
+
+
+def rollup_lines(lines, rollup: dict | None = None) -> dict:
+    """{skill: {count, first, last, agentTypes: {agentType: count}}} for JSONL lines,
+    added to rollup when given. Blank, malformed or partial lines are skipped."""
+    rollup = {} if rollup is None else rollup
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            e = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(e, dict):
+            continue
+        add_entry(rollup, e)
+    return rollup
+
+
+def add_entry(rollup: dict, e: dict) -> None:
+    name = e.get('skill', 'unknown')
+    rec = rollup.get(name)
+    if rec is None:
+        rec = rollup[name] = {'count': 0, 'first': '', 'last': '', 'agentTypes': {}}
+    rec['count'] += 1
+    agent = e.get('agentType', '')
+    rec['agentTypes'][agent] = rec['agentTypes'].get(agent, 0) + 1
+    ts = e.get('timestamp', '')
+    if ts:
+        if not rec['first'] or ts < rec['first']:
+            rec['first'] = ts
+        if not rec['last'] or ts > rec['last']:
+            rec['last'] = ts
+
+
+def merge(into: dict, rollup: dict) -> dict:
+    """Fold rollup into `into` (in place) and return it."""
+    for name, rec in rollup.items():
+        cur = into.get(name)
+        if cur is None:
+            into[name] = {'count': rec['count'], 'first': rec['first'], 'last': rec['last'],
+                          'agentTypes': dict(rec['agentTypes'])}
+            continue
+        cur['count'] += rec['count']
+        for agent, n in rec['agentTypes'].items():
+            cur['agentTypes'][agent] = cur['agentTypes'].get(agent, 0) + n
+        if rec['first'] and (not cur['first'] or rec['first'] < cur['first']):
+            cur['first'] = rec['first']
+        if rec['last'] and rec['last'] > cur['last']:
+            cur['last'] = rec['last']
+    return into
+
+
+def read_rollup(path: Path) -> dict:
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return rollup_lines(f)
+
+
+def _load_index(obs_dir: Path) -> dict:
+    try:
+        index = json.loads((obs_dir / ROLLUP_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get('version') != ROLLUP_VERSION:
+        return {}
+    segments = index.get('segments')
+    return segments if isinstance(segments, dict) else {}
+
+
+def _save_index(obs_dir: Path, segments: dict) -> None:
+    path = obs_dir / ROLLUP_FILE
+    tmp = path.with_name(f'{path.name}.tmp.{os.getpid()}')
+    try:
+        tmp.write_text(json.dumps({'version': ROLLUP_VERSION, 'segments': segments},
+                                  separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def summary(obs_dir: Path) -> dict:
+    """Per-skill rollup over every segment in obs_dir.
+
+    Sealed segments come from the rollup index while their size and mtime match;
+    new or changed ones are parsed and written back. Live segments are parsed.
+    """
+    obs_dir = Path(obs_dir)
+    total = {}
+    if not obs_dir.is_dir():
+        return total
+    index = _load_index(obs_dir)
+    kept, changed = {}, False
+    for path in sorted(obs_dir.glob(USAGE_GLOB)):
+        try:
+            st = path.stat()
+            if not is_sealed(path):
+                merge(total, read_rollup(path))
+                continue
+            key = [st.st_size, st.st_mtime_ns]
+            entry = index.get(path.name)
+            if not entry or entry.get('key') != key:
+                entry = {'key': key, 'skills': read_rollup(path)}
+                changed = True
+        except OSError:
+            continue
+        kept[path.name] = entry
+        merge(total, entry['skills'])
+    if changed or kept.keys() != index.keys():
+        _save_index(obs_dir, kept)
+    return total
+
+
+def prune(obs_dir: Path, now: float | None = None,
+          max_age_days: float = RETENTION_DAYS, max_bytes: int = RETENTION_MAX_BYTES) -> list[Path]:
+    """Delete segments untouched for max_age_days, then the oldest ones until the
+    rest fit in max_bytes. Returns what was removed; their rollups drop out of
+    the index on the next summary()."""
+    obs_dir = Path(obs_dir)
+    if not obs_dir.is_dir():
+        return []
+    cutoff = (now if now is not None else time.time()) - max_age_days * 86400
+    segments = []
+    for path in obs_dir.glob(USAGE_GLOB):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        segments.append((st.st_mtime, st.st_size, path))
+    segments.sort(key=lambda s: s[0])
+    total = sum(size for _, size, _ in segments)
+    removed = []
+    for mtime, size, path in segments:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed.append(path)
+    return removed
+
+
+class UsageTail:
+    """A running summary() for a long-lived reader (the dashboard's --watch).
+
+    Keeps, per segment, the byte offset read up to and that segment's rollup.
+    poll() parses only what was appended since the last call, and only up to the
+    last newline: a line still being written is picked up whole on a later
+    poll. A sealed segment keeps its state across the rename (matched by
+    inode), and one first seen sealed is seeded from the rollup index. A
+    truncated or replaced file is re-read from the start.
+    """
+
+    def __init__(self, obs_dir: Path):
+        self.obs_dir = Path(obs_dir)
+        self.files = {}  # name -> {'ino', 'offset', 'rollup'}
+        self.total = {}
+        self._index = None
+
+    def _seed(self, path: Path, st) -> dict:
+        if self._index is None:
+            self._index = _load_index(self.obs_dir)
+        entry = self._index.get(path.name) if is_sealed(path) else None
+        if entry and entry.get('key') == [st.st_size, st.st_mtime_ns]:
+            return {'ino': st.st_ino, 'offset': st.st_size, 'rollup': entry['skills']}
+        return {'ino': st.st_ino, 'offset': 0, 'rollup': {}}
+
+    def _advance(self, path: Path, rec: dict, size: int) -> bool:
+        try:
+            with open(path, 'rb') as f:
+                f.seek(rec['offset'])
+                data = f.read(size - rec['offset'])
+        except OSError:
+            return False
+        end = data.rfind(b'\n') + 1
+        if not end:
+            return False  # only a partial line so far
+        rec['offset'] += end
+        rollup_lines(data[:end].decode('utf-8', errors='replace').splitlines(), rec['rollup'])
+        return True
+
+    def poll(self) -> bool:
+        """Catch up with the segments on disk; True when the summary changed."""
+        previous = self.files
+        by_ino = {rec['ino']: rec for rec in previous.values()}
+        current, changed = {}, False
+        paths = self.obs_dir.glob(USAGE_GLOB) if self.obs_dir.is_dir() else ()
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            rec = previous.get(path.name)
+            if rec is None or rec['ino'] != st.st_ino:
+                rec = by_ino.get(st.st_ino)  # sealed since the last poll
+                if rec is None:
+                    rec = self._seed(path, st)
+                changed = True
+            if st.st_size < rec['offset']:
+                rec = {'ino': st.st_ino, 'offset': 0, 'rollup': {}}
+                changed = True
+            if st.st_size > rec['offset'] and self._advance(path, rec, st.st_size):
+                changed = True
+            current[path.name] = rec
+        if current.keys() != previous.keys():
+            changed = True
+        self.files = current
+        if changed:
+            self.total = {}
+            for rec in current.values():
+                merge(self.total, rec['rollup'])
+        return changed
@@ -8,10 +8,33 @@ Can be run standalone or imported by watch.py.
 
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 
 
+def _hooks_dir() -> Path | None:
+    """The Shipkit hooks directory: installed (.shipkit/observability → .claude/hooks),
+    in the source tree (install/shared/scripts/observability → install/shared/hooks),
+    or a user-scope install (~/.claude/hooks)."""
+    here = Path(__file__).resolve().parent
+    for hooks_dir in (here.parent.parent / '.claude' / 'hooks', here.parent.parent / 'hooks',
+                      Path.home() / '.claude' / 'hooks'):
+        if (hooks_dir / 'shipkit_runtime.py').exists():
+            return hooks_dir
+    return None
+
+
+# The hooks' shared modules (root resolver, skill-usage store), when they're found.
+HOOKS_DIR = _hooks_dir()
+if HOOKS_DIR is not None:
+    sys.path.insert(0, str(HOOKS_DIR))
+try:
+    from shipkit_runtime import find_project_root
+except ImportError:
+    find_project_root = None
+
+
 def format_age(mtime: float) -> str:
     """Format file age as human-readable string."""
     delta = datetime.now().timestamp() - mtime
@@ -135,20 +158,25 @@ def scan(shipkit_dir: Path) -> dict:
     }
 
 
-def main():
-    """Run scan and write artifact-state.json."""
-    # Find .shipkit/ — walk up from cwd
-    cwd = Path.cwd()
-    shipkit_dir = None
-    current = cwd
+def find_shipkit_dir() -> Path | None:
+    """The .shipkit/ directory of the project containing cwd."""
+    if find_project_root is not None:
+        root = find_project_root(Path.cwd(), markers=('.shipkit',))
+        return root / '.shipkit' if root else None
+    current = Path.cwd()
     for _ in range(20):
         if (current / '.shipkit').is_dir():
-            shipkit_dir = current / '.shipkit'
-            break
+            return current / '.shipkit'
         parent = current.parent
         if parent == current:
             break
         current = parent
+    return None
+
+
+def main():
+    """Run scan and write artifact-state.json."""
+    shipkit_dir = find_shipkit_dir()
 
     if not shipkit_dir:
         print("No .shipkit/ directory found.")
@@ -2,12 +2,13 @@
 """
 Shipkit - Dashboard Renderer
 
-Combines orchestration.json, skill-usage JSONL, and artifact scan
+Combines orchestration.json, skill-usage rollups, and artifact scan
 into a single auto-refreshing HTML dashboard.
 
 Modes:
   python watch.py          — scan once, render once, exit
-  python watch.py --watch  — re-render on file changes (poll every 2s)
+  python watch.py --watch  — re-render on file changes (poll every 2s), reading
+                             only newly appended skill-usage lines each cycle
 """
 
 import json
@@ -18,9 +19,11 @@ from pathlib import Path
 from datetime import datetime
 from html import escape
 
-# Import scan module from same directory
+# Import scan module from same directory (it also puts the hooks dir on sys.path,
+# where the skill-usage store lives)
 sys.path.insert(0, str(Path(__file__).parent))
-from scan import scan
+from scan import scan, find_shipkit_dir
+import shipkit_usage
 
 
 # ── Data Loading ──────────────────────────────────────────────
@@ -36,51 +39,27 @@ def load_orchestration(shipkit_dir: Path) -> dict:
         return {}
 
 
-def load_skill_usage(obs_dir: Path) -> list[dict]:
-    """Merge all skill-usage JSONL files into a single list."""
-    entries = []
-    if not obs_dir.exists():
-        return entries
-    for f in obs_dir.glob('skill-usage.*.local.jsonl'):
-        try:
-            for line in f.read_text(encoding='utf-8').splitlines():
-                line = line.strip()
-                if line:
-                    entries.append(json.loads(line))
-        except (json.JSONDecodeError, IOError):
-            continue
-    entries.sort(key=lambda e: e.get('timestamp', ''))
-    return entries
-
-
-def summarize_skill_usage(entries: list[dict]) -> list[dict]:
-    """Aggregate skill usage entries into per-skill summaries."""
-    skills = {}
-    for e in entries:
-        name = e.get('skill', 'unknown')
-        if name not in skills:
-            skills[name] = {'skill': name, 'count': 0, 'agents': set(), 'first': None, 'last': None}
-        rec = skills[name]
-        rec['count'] += 1
-        agent = SKILL_AGENT_MAP.get(name, e.get('agentType', ''))
-        if agent:
-            rec['agents'].add(agent)
-        ts = e.get('timestamp', '')
-        if ts:
-            if not rec['first'] or ts < rec['first']:
-                rec['first'] = ts
-            if not rec['last'] or ts > rec['last']:
-                rec['last'] = ts
+def load_skill_usage(obs_dir: Path) -> dict:
+    """Per-skill rollup of every skill-usage segment (see shipkit_usage.summary)."""
+    return shipkit_usage.summary(obs_dir)
+
 
+def summarize_skill_usage(rollup: dict) -> list[dict]:
+    """Per-skill summaries from a skill-usage rollup, oldest first."""
     result = []
-    for rec in sorted(skills.values(), key=lambda r: r.get('first', ''), reverse=False):
+    for name, rec in rollup.items():
+        if name in SKILL_AGENT_MAP:
+            agents = {SKILL_AGENT_MAP[name]}
+        else:
+            agents = {a for a in rec['agentTypes'] if a}
         result.append({
-            'skill': rec['skill'],
+            'skill': name,
             'count': rec['count'],
-            'agents': ', '.join(sorted(rec['agents'])) if rec['agents'] else '',
-            'first': rec['first'] or '',
-            'last': rec['last'] or '',
+            'agents': ', '.join(sorted(agents)),
+            'first': rec['first'],
+            'last': rec['last'],
         })
+    result.sort(key=lambda r: (r['first'], r['skill']))
     return result
 
 
@@ -147,23 +126,22 @@ SKILL_MODEL_MAP = {
 }
 
 
-def estimate_model(entry: dict) -> str:
+def estimate_model(skill: str, agent_type: str = '') -> str:
     """Guess model from skill name or agent type."""
-    skill = entry.get('skill', '')
     if skill in SKILL_MODEL_MAP:
         return SKILL_MODEL_MAP[skill]
-    agent = entry.get('agentType', '')
-    if agent in AGENT_MODEL_MAP:
-        return AGENT_MODEL_MAP[agent]
+    if agent_type in AGENT_MODEL_MAP:
+        return AGENT_MODEL_MAP[agent_type]
     return 'unknown'
 
 
-def cost_summary(entries: list[dict]) -> dict:
+def cost_summary(rollup: dict) -> dict:
     """Count invocations per model."""
     counts = {'opus': 0, 'sonnet': 0, 'unknown': 0}
-    for e in entries:
-        model = estimate_model(e)
-        counts[model] = counts.get(model, 0) + 1
+    for name, rec in rollup.items():
+        for agent, n in rec['agentTypes'].items():
+            model = estimate_model(name, agent)
+            counts[model] = counts.get(model, 0) + n
     return counts
 
 
@@ -455,7 +433,7 @@ td { padding: 4px 8px; border-bottom: 1px solid #161b22; }
 '''
 
 
-def render_dashboard(orch: dict, scan_state: dict, usage: list[dict]) -> str:
+def render_dashboard(orch: dict, scan_state: dict, usage: dict) -> str:
     """Render the full dashboard HTML."""
     now = datetime.now().isoformat(timespec='seconds')
     status = orch.get('status') or 'unknown'
@@ -503,19 +481,6 @@ def render_dashboard(orch: dict, scan_state: dict, usage: list[dict]) -> str:
 
 # ── Main ──────────────────────────────────────────────────────
 
-def find_shipkit_dir() -> Path | None:
-    """Walk up from cwd to find .shipkit/ directory."""
-    current = Path.cwd()
-    for _ in range(20):
-        if (current / '.shipkit').is_dir():
-            return current / '.shipkit'
-        parent = current.parent
-        if parent == current:
-            break
-        current = parent
-    return None
-
-
 def get_mtimes(shipkit_dir: Path) -> dict:
     """Snapshot mtime of key files for change detection."""
     files = [
@@ -533,11 +498,16 @@ def get_mtimes(shipkit_dir: Path) -> dict:
     return mtimes
 
 
-def do_render(shipkit_dir: Path) -> None:
-    """Run one scan + render cycle."""
+def do_render(shipkit_dir: Path, usage_tail: shipkit_usage.UsageTail | None = None) -> None:
+    """Run one scan + render cycle. With usage_tail (watch mode), skill usage is
+    caught up incrementally instead of re-read."""
     orch = load_orchestration(shipkit_dir)
     obs_dir = shipkit_dir / 'observability'
-    usage = load_skill_usage(obs_dir)
+    if usage_tail is not None:
+        usage_tail.poll()
+        usage = usage_tail.total
+    else:
+        usage = load_skill_usage(obs_dir)
     scan_state = scan(shipkit_dir)
 
     # Write artifact-state.json
@@ -567,12 +537,15 @@ def main():
     # Watch mode: poll every 2s, re-render on changes
     print(f'Watching {shipkit_dir} for changes (Ctrl+C to stop)...')
     last_mtimes = {}
+    # Per-segment offsets and rollups live across cycles: each render parses
+    # only the skill-usage lines appended since the previous one.
+    usage_tail = shipkit_usage.UsageTail(shipkit_dir / 'observability')
     while True:
         try:
             current_mtimes = get_mtimes(shipkit_dir)
             # Also re-scan artifacts periodically (they change outside tracked files)
             if current_mtimes != last_mtimes:
-                do_render(shipkit_dir)
+                do_render(shipkit_dir, usage_tail)
                 last_mtimes = current_mtimes
             else:
                 # Still re-render every 10s even without changes (artifact ages update)
@@ -28,6 +28,15 @@ class Colors:
 
 def find_project_root():
     """Find project root by looking for .claude directory"""
+    # Prefer the hooks' shared resolver: installed (.shipkit/scripts → .claude/hooks)
+    # or in the source tree (install/shared/scripts/python → install/shared/hooks).
+    here = Path(__file__).resolve().parent
+    for hooks_dir in (here.parent.parent / ".claude" / "hooks", here.parent.parent / "hooks"):
+        if (hooks_dir / "shipkit_runtime.py").exists():
+            sys.path.insert(0, str(hooks_dir))
+            from shipkit_runtime import find_project_root as resolve
+            return resolve(Path.cwd(), markers=(".claude",)) or Path.cwd()
+
     current = Path.cwd()
 
     while current != current.parent:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+_ignore.py - gitignore-syntax exclusion matcher for the codebase-index walker.
+
+Each pattern is compiled to a regex once. Rules carry the directory they were
+declared in (a nested .gitignore only governs its own subtree) and are checked
+in declaration order, last match winning, so `!negation` works as in git. A
+path under an ignored directory is ignored without consulting its own rules —
+git can't re-include a file whose parent is excluded either, and it lets the
+walker prune a directory before descending into it. Not a CLI.
+"""
+
+import re
+
+
+def _translate(pattern):
+    """Glob body (no leading `!`, no trailing `/`) → regex source."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('/**', i) and i + 3 == n:
+            out.append('/.*')
+            i += 3
+            continue
+        c = pattern[i]
+        if c == '*':
+            out.append('.*' if pattern.startswith('**', i) else '[^/]*')
+            i += 2 if pattern.startswith('**', i) else 1
+            continue
+        if c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body[0] == '!':
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def compile_rule(line, base=''):
+    """One gitignore line → (base, negate, dir_only, regex), or None for blanks/comments."""
+    line = line.rstrip('\n').rstrip('\r')
+    if not line.endswith('\\ '):
+        line = line.rstrip(' ')
+    if not line or line.startswith('#'):
+        return None
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    elif line.startswith('\\'):
+        line = line[1:]  # `\#file` / `\!file`
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to its base directory.
+    anchored = '/' in line
+    line = line.lstrip('/')
+    prefix = '' if anchored else '(?:.*/)?'
+    return base, negate, dir_only, re.compile(prefix + _translate(line) + r'\Z')
+
+
+class IgnoreMatcher:
+    """Ordered gitignore rules over POSIX paths relative to the project root."""
+
+    def __init__(self):
+        self.rules = []
+        self._dirs = {}
+
+    def add_lines(self, lines, base=''):
+        for line in lines:
+            rule = compile_rule(line, base)
+            if rule is not None:
+                self.rules.append(rule)
+        self._dirs.clear()
+
+    def add_file(self, path, base=''):
+        """Add the rules of an ignore file; a missing/unreadable file adds none."""
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                self.add_lines(f, base)
+        except OSError:
+            pass
+
+    def _match(self, rel, is_dir):
+        ignored = False
+        for base, negate, dir_only, regex in self.rules:
+            if base:
+                if not rel.startswith(base + '/'):
+                    continue
+                sub = rel[len(base) + 1:]
+            else:
+                sub = rel
+            if dir_only and not is_dir:
+                continue
+            if regex.match(sub):
+                ignored = not negate
+        return ignored
+
+    def dir_ignored(self, rel_dir):
+        """True when rel_dir, or any directory above it, is excluded (memoised)."""
+        if not rel_dir:
+            return False
+        hit = self._dirs.get(rel_dir)
+        if hit is None:
+            parent = rel_dir.rpartition('/')[0]
+            hit = self.dir_ignored(parent) or self._match(rel_dir, True)
+            self._dirs[rel_dir] = hit
+        return hit
+
+    def ignored(self, rel):
+        """True when the file rel is excluded, directly or via a parent directory."""
+        if not self.rules:
+            return False
+        parent = rel.rpartition('/')[0]
+        return self.dir_ignored(parent) or self._match(rel, False)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+_imports.py - Import extraction + resolution for the codebase import graph.
+
+Two halves, kept apart so the graph can rebuild incrementally:
+  extract_imports()  raw specifiers of ONE file — depends only on its content,
+                     so results are cached per content hash.
+  Resolver           maps a specifier to a file in the tree — depends on the
+                     file set, so it is re-run (cheap set lookups) every build.
+
+Covers JS/TS (import / export-from / require / dynamic import, plus tsconfig
+`paths` aliases), Python (import / from-import, relative and absolute) and Go
+(module-path imports via go.mod). Anything that doesn't resolve to a file in
+the tree (packages, stdlib) is dropped. Not a CLI.
+"""
+
+import json
+import posixpath
+import re
+from pathlib import Path
+
+_JS_EXTS = ('.ts', '.tsx', '.js', '.jsx', '.vue', '.svelte')
+_JS_SPEC = re.compile(
+    r'''(?:\bimport\s+(?:[\w*${}\s,]+\s+from\s+)?|\bexport\s+[\w*${}\s,]+\s+from\s+|'''
+    r'''\brequire\s*\(\s*|\bimport\s*\(\s*)['"]([^'"\n]+)['"]'''
+)
+_PY_IMPORT = re.compile(r'^\s*import\s+(.+)$')
+_PY_FROM = re.compile(r'^\s*from\s+(\.*[\w.]*)\s+import\s+(.+)$')
+_GO_SINGLE = re.compile(r'^\s*import\s+(?:[\w.]+\s+)?"([^"]+)"')
+_GO_BLOCK_LINE = re.compile(r'^\s*(?:[\w.]+\s+)?"([^"]+)"')
+
+
+def extract_imports(rel_path, text):
+    """Raw import specifiers in one file, in source order (deduplicated).
+
+    Python specifiers are encoded as `module` or `module:name` (for
+    `from module import name`, where name may itself be a submodule).
+    """
+    ext = Path(rel_path).suffix
+    if ext in _JS_EXTS:
+        specs = _JS_SPEC.findall(text)
+    elif ext == '.py':
+        specs = _python_specs(text)
+    elif ext == '.go':
+        specs = _go_specs(text)
+    else:
+        return []
+    return list(dict.fromkeys(specs))
+
+
+def _python_specs(text):
+    specs = []
+    for line in text.splitlines():
+        m = _PY_FROM.match(line)
+        if m:
+            module, names = m.group(1), m.group(2)
+            names = names.strip().strip('()').split('#')[0]
+            for name in names.split(','):
+                name = name.strip().split(' as ')[0].strip()
+                if name and name != '*' and name.isidentifier():
+                    specs.append(f'{module}:{name}')
+            specs.append(module)
+            continue
+        m = _PY_IMPORT.match(line)
+        if m:
+            for part in m.group(1).split('#')[0].split(','):
+                module = part.strip().split(' as ')[0].strip()
+                if module:
+                    specs.append(module)
+    return specs
+
+
+def _go_specs(text):
+    specs = []
+    in_block = False
+    for line in text.splitlines():
+        if in_block:
+            if line.strip().startswith(')'):
+                in_block = False
+                continue
+            m = _GO_BLOCK_LINE.match(line)
+            if m:
+                specs.append(m.group(1))
+        elif re.match(r'^\s*import\s*\(', line):
+            in_block = True
+        else:
+            m = _GO_SINGLE.match(line)
+            if m:
+                specs.append(m.group(1))
+    return specs
+
+
+class Resolver:
+    """Resolve raw specifiers against the current set of source files."""
+
+    def __init__(self, root, files):
+        self.files = set(files)
+        self.go_dirs = {}
+        for rel in self.files:
+            if rel.endswith('.go') and not rel.endswith('_test.go'):
+                self.go_dirs.setdefault(posixpath.dirname(rel), []).append(rel)
+        self.go_module = _read_go_module(Path(root) / 'go.mod')
+        self.ts_paths, self.ts_base = _read_ts_paths(Path(root) / 'tsconfig.json')
+
+    def resolve(self, importer, spec):
+        """Files in the tree that spec (imported from importer) points at."""
+        ext = Path(importer).suffix
+        if ext in _JS_EXTS:
+            return self._resolve_js(importer, spec)
+        if ext == '.py':
+            return self._resolve_py(importer, spec)
+        if ext == '.go':
+            return self._resolve_go(spec)
+        return []
+
+    def _first_file(self, base):
+        """A JS module path → the file it loads (extension / index probing)."""
+        base = posixpath.normpath(base)
+        if base.startswith('../'):
+            return None
+        candidates = [base]
+        stem, dot_ext = posixpath.splitext(base)
+        if dot_ext in ('.js', '.jsx', '.mjs', '.cjs'):
+            # TS ESM imports name the emitted .js file
+            candidates += [stem + '.ts', stem + '.tsx']
+        candidates += [base + e for e in _JS_EXTS]
+        candidates += [posixpath.join(base, 'index' + e) for e in _JS_EXTS]
+        for c in candidates:
+            if c in self.files:
+                return c
+        return None
+
+    def _resolve_js(self, importer, spec):
+        if spec.startswith('.'):
+            hit = self._first_file(posixpath.join(posixpath.dirname(importer), spec))
+            return [hit] if hit else []
+        for pattern, targets in self.ts_paths:
+            prefix, star, suffix = pattern.partition('*')
+            if star and spec.startswith(prefix) and spec.endswith(suffix):
+                middle = spec[len(prefix):len(spec) - len(suffix)] if suffix else spec[len(prefix):]
+            elif not star and spec == pattern:
+                middle = ''
+            else:
+                continue
+            for target in targets:
+                hit = self._first_file(posixpath.join(self.ts_base, target.replace('*', middle)))
+                if hit:
+                    return [hit]
+        return []
+
+    def _py_module_file(self, dotted, base_dir=''):
+        path = posixpath.join(base_dir, *dotted.split('.')) if dotted else base_dir
+        for c in (path + '.py', posixpath.join(path, '__init__.py')):
+            c = posixpath.normpath(c)
+            if c in self.files:
+                return c
+        return None
+
+    def _resolve_py(self, importer, spec):
+        module, _, name = spec.partition(':')
+        if module.startswith('.'):
+            level = len(module) - len(module.lstrip('.'))
+            base = posixpath.dirname(importer)
+            for _ in range(level - 1):
+                base = posixpath.dirname(base)
+            roots = [base]
+            module = module[level:]
+        else:
+            roots = ['', 'src']
+        for base in roots:
+            if name:
+                hit = self._py_module_file(f'{module}.{name}' if module else name, base)
+                if hit:
+                    return [hit]
+                continue  # `module` itself is resolved by its own spec
+            hit = self._py_module_file(module, base)
+            if hit:
+                return [hit]
+        return []
+
+    def _resolve_go(self, spec):
+        if not self.go_module:
+            return []
+        if spec == self.go_module:
+            pkg_dir = ''
+        elif spec.startswith(self.go_module + '/'):
+            pkg_dir = spec[len(self.go_module) + 1:]
+        else:
+            return []
+        return sorted(self.go_dirs.get(pkg_dir, []))
+
+
+def _read_go_module(go_mod):
+    try:
+        for line in go_mod.read_text(encoding='utf-8').splitlines():
+            if line.startswith('module '):
+                return line.split()[1]
+    except OSError:
+        pass
+    return None
+
+
+def _read_ts_paths(tsconfig):
+    """tsconfig compilerOptions.paths as [(pattern, [targets])], plus baseUrl.
+
+    Plain JSON only — a tsconfig with comments/trailing commas simply yields no
+    aliases (relative imports still resolve).
+    """
+    try:
+        data = json.loads(tsconfig.read_text(encoding='utf-8'))
+        opts = data.get('compilerOptions', {})
+        base = posixpath.normpath(opts.get('baseUrl', '.'))
+        paths = opts.get('paths', {})
+        return [(k, v) for k, v in paths.items() if isinstance(v, list)], ('' if base == '.' else base)
+    except (OSError, ValueError, AttributeError):
+        return [], ''
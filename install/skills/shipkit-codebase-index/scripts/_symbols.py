@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+_symbols.py - Exported-symbol extraction for the codebase index.
+
+Line-oriented regexes, one table per SOURCE_EXTENSIONS language. Deliberately
+shallow: it lists what a file EXPORTS (the names other files can import), not
+every definition, and never evaluates code. Not a CLI — generate_index.py calls
+extract_symbols() for files whose content hash changed.
+
+Each symbol is [name, kind, line] (1-based line).
+"""
+
+import re
+from pathlib import Path
+
+_JS_PATTERNS = [
+    (re.compile(r'^\s*export\s+(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)'), 'function'),
+    (re.compile(r'^\s*export\s+(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)'), 'class'),
+    (re.compile(r'^\s*export\s+(?:declare\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)'), 'const'),
+    (re.compile(r'^\s*export\s+(?:declare\s+)?interface\s+([A-Za-z_$][\w$]*)'), 'interface'),
+    (re.compile(r'^\s*export\s+(?:declare\s+)?type\s+([A-Za-z_$][\w$]*)\s*[=<]'), 'type'),
+    (re.compile(r'^\s*export\s+(?:declare\s+)?(?:const\s+)?enum\s+([A-Za-z_$][\w$]*)'), 'enum'),
+    (re.compile(r'^\s*export\s+default\s+([A-Za-z_$][\w$]*)\s*;?\s*$'), 'default'),
+]
+# `export { a, b as c }` / `export { x } from './y'` — one or more names per line.
+_JS_EXPORT_LIST = re.compile(r'^\s*export\s+(?:type\s+)?\{([^}]*)\}')
+
+_PY_PATTERNS = [
+    (re.compile(r'^(?:async\s+)?def\s+([A-Za-z]\w*)'), 'function'),
+    (re.compile(r'^class\s+([A-Za-z]\w*)'), 'class'),
+]
+
+_GO_PATTERNS = [
+    (re.compile(r'^func\s+(?:\([^)]*\)\s*)?([A-Z]\w*)'), 'function'),
+    (re.compile(r'^type\s+([A-Z]\w*)\s+struct\b'), 'struct'),
+    (re.compile(r'^type\s+([A-Z]\w*)\s+interface\b'), 'interface'),
+    (re.compile(r'^type\s+([A-Z]\w*)\b'), 'type'),
+]
+
+_RS_PATTERNS = [
+    (re.compile(r'^\s*pub(?:\([^)]*\))?\s+(?:async\s+)?(?:unsafe\s+)?(?:const\s+)?fn\s+(\w+)'), 'function'),
+    (re.compile(r'^\s*pub(?:\([^)]*\))?\s+struct\s+(\w+)'), 'struct'),
+    (re.compile(r'^\s*pub(?:\([^)]*\))?\s+enum\s+(\w+)'), 'enum'),
+    (re.compile(r'^\s*pub(?:\([^)]*\))?\s+trait\s+(\w+)'), 'trait'),
+    (re.compile(r'^\s*pub(?:\([^)]*\))?\s+type\s+(\w+)'), 'type'),
+    (re.compile(r'^\s*pub(?:\([^)]*\))?\s+(?:const|static)\s+(\w+)'), 'const'),
+]
+
+_PATTERNS_BY_EXT = {
+    '.ts': _JS_PATTERNS, '.tsx': _JS_PATTERNS, '.js': _JS_PATTERNS, '.jsx': _JS_PATTERNS,
+    '.vue': _JS_PATTERNS, '.svelte': _JS_PATTERNS,
+    '.py': _PY_PATTERNS,
+    '.go': _GO_PATTERNS,
+    '.rs': _RS_PATTERNS,
+}
+
+_JSX_EXTS = {'.tsx', '.jsx'}
+
+
+def _js_export_list(line, lineno):
+    m = _JS_EXPORT_LIST.match(line)
+    if not m:
+        return []
+    out = []
+    for part in m.group(1).split(','):
+        name = part.strip().split(' as ')[-1].strip()
+        if name.startswith('type '):
+            name = name[len('type '):].strip()
+        if re.fullmatch(r'[A-Za-z_$][\w$]*', name) and name != 'default':
+            out.append([name, 'reexport', lineno])
+    return out
+
+
+def extract_symbols(rel_path, text):
+    """Exported symbols of one file: [[name, kind, line], ...] in source order.
+
+    In .tsx/.jsx, capitalised functions/consts are reported as `component`
+    (React's naming rule). A .vue/.svelte file is itself a component named after
+    the file stem, reported on line 1.
+    """
+    ext = Path(rel_path).suffix
+    patterns = _PATTERNS_BY_EXT.get(ext)
+    if patterns is None:
+        return []
+
+    symbols = []
+    if ext in ('.vue', '.svelte'):
+        symbols.append([Path(rel_path).stem, 'component', 1])
+
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if ext == '.py' and line.startswith(('def _', 'class _', 'async def _')):
+            continue  # private by convention
+        for pattern, kind in patterns:
+            m = pattern.match(line)
+            if m:
+                name = m.group(1)
+                if ext in _JSX_EXTS and kind in ('function', 'const', 'default') and name[:1].isupper():
+                    kind = 'component'
+                symbols.append([name, kind, lineno])
+                break
+        else:
+            if patterns is _JS_PATTERNS and 'export' in line:
+                symbols.extend(_js_export_list(line, lineno))
+    return symbols
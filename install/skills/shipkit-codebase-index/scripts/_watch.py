@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+_watch.py - filesystem change notification for `generate_index.py --watch`.
+
+Linux inotify through ctypes (stdlib only): one watch per non-ignored directory,
+added recursively, with new directories picked up as they appear. Anywhere
+inotify is unavailable (macOS, Windows, an exhausted max_user_watches)
+open_watcher() returns None and the caller polls instead; if watches run out
+later, on a directory created while watching, wait() returns FALLBACK and the
+caller switches to polling then. Not a CLI.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct('iIII')
+
+# Returned by wait() when the kernel queue overflowed: events were lost, so the
+# caller should treat everything as changed.
+OVERFLOW = object()
+# Returned by wait() when a new directory couldn't be watched (typically ENOSPC:
+# max_user_watches exhausted). The watcher has closed itself; the caller should
+# poll from now on, and refresh, since that directory's changes went unseen.
+FALLBACK = object()
+
+
+class InotifyWatcher:
+    """Recursive inotify watch over root, skipping directories ignore rules out."""
+
+    def __init__(self, root, ignore):
+        self.root = root
+        self.ignore = ignore
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs = {}  # wd → POSIX-relative dir ('' = root)
+
+    def add(self, rel_dir):
+        """Watch one directory; raises OSError when the kernel refuses (e.g. ENOSPC)."""
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (2, 20):  # ENOENT / ENOTDIR: gone before we got to it
+                return
+            raise OSError(err, os.strerror(err), path)
+        self._dirs[wd] = rel_dir
+
+    def add_tree(self, rel_dir=''):
+        """Watch rel_dir and every non-ignored directory beneath it."""
+        top = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        for dirpath, dirnames, _ in os.walk(top):
+            rel = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+            rel = '' if rel == '.' else rel
+            self.add(rel)
+            prefix = f'{rel}/' if rel else ''
+            dirnames[:] = [d for d in dirnames if not self.ignore.dir_ignored(prefix + d)]
+
+    def wait(self, timeout):
+        """Block up to timeout seconds → list of changed relative paths,
+        OVERFLOW, FALLBACK, or [] on timeout. Directory events end in '/'."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        buf = os.read(self.fd, 64 * 1024)
+        changed = []
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, length = _EVENT.unpack_from(buf, offset)
+            offset += _EVENT.size
+            name = buf[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return OVERFLOW
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None or not name:
+                continue
+            rel = f'{parent}/{name}' if parent else name
+            if mask & IN_ISDIR:
+                if self.ignore.dir_ignored(rel):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        self.add_tree(rel)
+                    except OSError:
+                        self.close()
+                        return FALLBACK
+                changed.append(rel + '/')
+            else:
+                changed.append(rel)
+        return changed
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def open_watcher(root, ignore, extra_dirs=()):
+    """An InotifyWatcher over root (plus the non-recursive extra_dirs), or None
+    when inotify can't be used here — the caller then polls."""
+    if not sys.platform.startswith('linux'):
+        return None
+    watcher = None
+    try:
+        watcher = InotifyWatcher(root, ignore)
+        watcher.add_tree()
+        for rel in extra_dirs:
+            watcher.add(rel)
+    except (OSError, AttributeError):
+        if watcher is not None:
+            watcher.close()
+        return None
+    return watcher
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+_workspaces.py - Monorepo workspace detection for the codebase index.
+
+Reads the workspace declarations of the common toolchains — pnpm-workspace.yaml,
+npm/yarn `workspaces` in package.json, a Cargo `[workspace]`, go.work — and
+expands their globs to package directories — those holding a package manifest.
+Shallow, line-oriented parsing (no YAML/TOML dependency); a declaration it
+can't read contributes no packages.
+Not a CLI — generate_index.py calls detect_workspaces() when one of the marker
+files is present.
+"""
+
+import json
+import os
+import re
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+# Root files that can declare workspaces.
+WORKSPACE_MARKERS = ('pnpm-workspace.yaml', 'package.json', 'Cargo.toml', 'go.work')
+# A globbed directory is a package only if it holds one of these.
+PACKAGE_MANIFESTS = ('package.json', 'pyproject.toml', 'setup.py', 'Cargo.toml', 'go.mod')
+# Never descended into while expanding a glob, even without an IgnoreMatcher.
+_ALWAYS_SKIP = {'node_modules', '.git'}
+
+_CARGO_WORKSPACE = re.compile(r'^\[workspace\]\s*$(.*?)(?=^\[|\Z)', re.M | re.S)
+_CARGO_MEMBERS = re.compile(r'^\s*members\s*=\s*\[(.*?)\]', re.M | re.S)
+_CARGO_EXCLUDE = re.compile(r'^\s*exclude\s*=\s*\[(.*?)\]', re.M | re.S)
+_CARGO_NAME = re.compile(r'^\[package\]\s*$.*?^\s*name\s*=\s*"([^"]+)"', re.M | re.S)
+_QUOTED = re.compile(r'"([^"]*)"|\'([^\']*)\'')
+_GO_MODULE = re.compile(r'^module\s+(\S+)', re.M)
+
+
+def _read(path):
+    try:
+        return Path(path).read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _quoted(text):
+    return [a or b for a, b in _QUOTED.findall(text)]
+
+
+def _pnpm_patterns(root):
+    text = _read(root / 'pnpm-workspace.yaml')
+    if text is None:
+        return []
+    patterns = []
+    in_packages = False
+    for line in text.splitlines():
+        stripped = line.split('#', 1)[0].rstrip()
+        if not stripped:
+            continue
+        if not line[0].isspace():
+            in_packages = stripped == 'packages:'
+            continue
+        if in_packages and stripped.lstrip().startswith('-'):
+            patterns.append(stripped.lstrip()[1:].strip().strip('\'"'))
+    return patterns
+
+
+def _npm_patterns(root):
+    text = _read(root / 'package.json')
+    try:
+        workspaces = json.loads(text).get('workspaces') if text else None
+    except (json.JSONDecodeError, AttributeError):
+        return []
+    if isinstance(workspaces, dict):  # yarn classic: {packages: [...], nohoist: [...]}
+        workspaces = workspaces.get('packages')
+    if not isinstance(workspaces, list):
+        return []
+    return [p for p in workspaces if isinstance(p, str)]
+
+
+def _cargo_patterns(root):
+    text = _read(root / 'Cargo.toml')
+    section = _CARGO_WORKSPACE.search(text or '')
+    if not section:
+        return []
+    members = _CARGO_MEMBERS.search(section.group(1))
+    patterns = _quoted(members.group(1)) if members else []
+    excluded = _CARGO_EXCLUDE.search(section.group(1))
+    if excluded:
+        patterns += ['!' + p for p in _quoted(excluded.group(1))]
+    return patterns
+
+
+def _go_patterns(root):
+    text = _read(root / 'go.work')
+    if text is None:
+        return []
+    patterns = []
+    in_block = False
+    for line in text.splitlines():
+        stripped = line.split('//', 1)[0].strip()
+        if in_block:
+            if stripped == ')':
+                in_block = False
+            elif stripped:
+                patterns.append(stripped.strip('"'))
+        elif stripped == 'use (':
+            in_block = True
+        elif stripped.startswith('use '):
+            patterns.append(stripped[4:].strip().strip('"'))
+    return patterns
+
+
+def _package_name(pkg_dir):
+    """Declared package name (package.json, Cargo.toml, go.mod), or None."""
+    text = _read(pkg_dir / 'package.json')
+    if text:
+        try:
+            name = json.loads(text).get('name')
+            if isinstance(name, str) and name:
+                return name
+        except (json.JSONDecodeError, AttributeError):
+            pass
+    match = _CARGO_NAME.search(_read(pkg_dir / 'Cargo.toml') or '')
+    if match:
+        return match.group(1)
+    match = _GO_MODULE.search(_read(pkg_dir / 'go.mod') or '')
+    return match.group(1) if match else None
+
+
+def _skipped(rel, ignore):
+    return rel.rsplit('/', 1)[-1] in _ALWAYS_SKIP or (ignore is not None and ignore.dir_ignored(rel))
+
+
+def _subdirs(root, rel, ignore, follow_symlinks=True):
+    """POSIX-relative child dirs of rel that aren't ignored."""
+    try:
+        with os.scandir(root / rel if rel else root) as entries:
+            children = [(f'{rel}/{e.name}' if rel else e.name) for e in entries
+                        if e.is_dir(follow_symlinks=follow_symlinks)]
+    except OSError:
+        return []
+    return [child for child in children if not _skipped(child, ignore)]
+
+
+def _glob_dirs(root, pattern, ignore):
+    """Dirs under root matching the glob pattern (`*`, `?`, `[..]`, `**`).
+
+    Matches segment by segment and prunes ignored dirs before descending, so
+    `packages/**` never walks a node_modules. `**` doesn't follow symlinks.
+    """
+    parts = pattern.split('/')
+    found, seen = set(), set()
+
+    def walk(rel, i):
+        if (rel, i) in seen:
+            return
+        seen.add((rel, i))
+        if i == len(parts):
+            found.add(rel)
+            return
+        part = parts[i]
+        if part == '**':
+            walk(rel, i + 1)
+            for child in _subdirs(root, rel, ignore, follow_symlinks=False):
+                walk(child, i)
+        elif not any(c in part for c in '*?['):
+            child = f'{rel}/{part}' if rel else part
+            if (root / child).is_dir() and not _skipped(child, ignore):
+                walk(child, i + 1)
+        else:
+            for child in _subdirs(root, rel, ignore):
+                if fnmatchcase(child.rsplit('/', 1)[-1], part):
+                    walk(child, i + 1)
+
+    walk('', 0)
+    found.discard('')
+    return found
+
+
+def _expand(root, patterns, ignore):
+    """Workspace globs (`!pattern` excludes) → sorted POSIX-relative package dirs."""
+    included, excluded = set(), set()
+    for pattern in patterns:
+        negate = pattern.startswith('!')
+        pattern = pattern.lstrip('!').strip().rstrip('/')
+        while pattern.startswith('./'):
+            pattern = pattern[2:]
+        if not pattern or pattern == '.' or pattern.startswith('/') or '..' in pattern.split('/'):
+            continue
+        (excluded if negate else included).update(_glob_dirs(root, pattern, ignore))
+    return sorted(rel for rel in included - excluded
+                  if any((root / rel / m).is_file() for m in PACKAGE_MANIFESTS))
+
+
+def detect_workspaces(root, ignore=None):
+    """[{'path', 'name'}] for every workspace package declared at root, sorted by path.
+
+    Empty for a single-package repo. Only directories holding a package
+    manifest count. `ignore` (an IgnoreMatcher) prunes directories the index
+    walker would skip anyway, e.g. a vendored tree, while globs are expanded.
+    """
+    root = Path(root)
+    patterns = (_pnpm_patterns(root) + _npm_patterns(root)
+                + _cargo_patterns(root) + _go_patterns(root))
+    if not patterns:
+        return []
+    return [{'path': rel, 'name': _package_name(root / rel) or rel}
+            for rel in _expand(root, patterns, ignore)]
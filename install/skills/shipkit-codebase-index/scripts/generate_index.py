@@ -10,50 +10,128 @@ Two modes:
       fields and leaves the judgment fields empty for Claude to complete.
       Sets both timestamps and seeds the hash-cache.
 
-  --refresh-mechanical    python generate_index.py --refresh-mechanical
+  --refresh-mechanical    python generate_index.py --refresh-mechanical [--engine git|fs] [--jobs N]
       DETERMINISTIC, NO LLM. Refreshes ONLY the mechanical fields and preserves
       the Claude-judgment fields (framework/entryPoints/concepts/coreFiles/skip)
       byte-for-byte. Skips writing entirely when nothing source-relevant changed
-      (content-hash cache). Never creates a partial index — if no index exists,
-      it exits 0 and does nothing. This is what the commit hook + SessionStart run.
+      (content-hash cache; a per-file stat manifest means unchanged files are
+      only stat'd, never re-read — and inside git, clean tracked files aren't
+      even stat'd: their identity is the index blob SHA). Never creates a
+      partial index — if no index exists, it exits 0 and does nothing. This is
+      what the commit hook + SessionStart run — in-process, by importing this
+      module and calling refresh_mechanical(root) (see find_root()).
+
+  --watch                 python generate_index.py --watch [--interval S]
+      Long-running mechanical refresh: inotify-driven on Linux (polling
+      elsewhere), debounced, with the cache held in memory. While it runs, the
+      commit hook and SessionStart see its heartbeat file and skip their own
+      refresh.
+
+  --symbols               python generate_index.py --symbols
+      Full run that also enables the optional `symbols` layer: exported
+      functions/classes/components per file, written to the sidecar
+      .shipkit/codebase-symbols.json. Once enabled, mechanical refreshes keep it
+      current, re-parsing only files whose content hash changed.
+
+  --find-symbol NAME      python generate_index.py --find-symbol useAuth
+      Look a name up in the symbol sidecar (file:line kind name).
+
+  --imports               python generate_index.py --imports
+      Full run that also builds the file-level import graph (JS/TS, Python, Go)
+      at .shipkit/cache/codebase-imports.json. Once it exists, mechanical
+      refreshes keep it current, re-parsing only files whose hash changed.
+
+  --importers FILE        python generate_index.py --importers src/lib/auth.ts
+  --dependents FILE       ... --dependents src/lib/auth.ts
+  --near FILE [--hops N]  ... --near src/lib/auth.ts --hops 2
+      Query the import graph: direct importers, transitive dependents (blast
+      radius), or every file within N import hops in either direction. Answers
+      from the persisted graph (as fresh as the last refresh); builds it first
+      if missing.
 
 The script ONLY computes what it can do 100% reliably:
 - Git history (recently modified files)
 - package.json scripts
 - Which common directories exist
 - Which config files exist
+- Which names each source file exports (optional symbols layer)
+- Which workspace packages a monorepo declares (one shard per package)
 
 Claude handles the ambiguous fields (framework, concepts, coreFiles, ...) — those
 are refreshed only by a full run inside the /shipkit-codebase-index skill.
 """
 
+import argparse
+import bisect
+import contextlib
 import hashlib
 import json
 import os
+import signal
 import subprocess
 import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: refreshes run uncoordinated (still atomic writes)
+    fcntl = None
+
+sys.path.insert(0, str(Path(__file__).parent))
+from _ignore import IgnoreMatcher  # noqa: E402
+from _imports import Resolver, extract_imports  # noqa: E402
+from _symbols import extract_symbols  # noqa: E402
+from _watch import FALLBACK, OVERFLOW, open_watcher  # noqa: E402
+from _workspaces import WORKSPACE_MARKERS, detect_workspaces  # noqa: E402
+
 OUTPUT_PATH = '.shipkit/codebase-index.json'
 CACHE_PATH = '.shipkit/cache/codebase-index.cache.json'
 CACHE_DIR = '.shipkit/cache'
+CACHE_VERSION = 2
+SYMBOLS_PATH = '.shipkit/codebase-symbols.json'
+SYMBOLS_CACHE_PATH = '.shipkit/cache/codebase-symbols.cache.json'
+IMPORTS_PATH = '.shipkit/cache/codebase-imports.json'
+IMPORTS_VERSION = 1
+INDEX_IGNORE_PATH = '.shipkit/index-ignore'
+WATCH_PID_PATH = '.shipkit/cache/codebase-index.watch.pid'
+SHARDS_DIR = '.shipkit/codebase-shards'
+REFRESH_LOCK_PATH = '.shipkit/cache/codebase-index.lock'
+REFRESH_FLIGHT_PATH = '.shipkit/cache/codebase-index.flight.json'
+SHARDS_CACHE_PATH = '.shipkit/cache/codebase-shards.cache.json'
+WORKSPACES_CACHE_PATH = '.shipkit/cache/codebase-workspaces.cache.json'
+# Root files whose (size, mtime_ns) key the cached workspace detection.
+WORKSPACE_KEY_FILES = WORKSPACE_MARKERS + ('pyproject.toml', 'setup.py')
 
 SOURCE_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx', '.py', '.go', '.rs', '.vue', '.svelte'}
-EXCLUDE_DIRS = {'node_modules', 'dist', '.next', '__pycache__', '.git', 'venv', '.venv', 'build', 'out'}
+# Always excluded, wherever they appear. Project-specific exclusions come from
+# .gitignore, .shipkit/index-ignore and the index's `skip` field (load_ignore).
+EXCLUDE_DIRS = {'node_modules', 'dist', '.next', '__pycache__', '.git', 'venv', '.venv', 'build', 'out',
+                'coverage', '.turbo', '.svelte-kit', '.pytest_cache'}
+
+# recentlyActive reads at most this many commits of history, whatever the
+# --since window holds — bounds the refresh on repos with heavy commit traffic.
+RECENT_MAX_COMMITS = 1000
 
 # Fields the script owns and may overwrite on a mechanical refresh.
 MECHANICAL_FIELDS = ('scripts', 'recentlyActive', 'directories', 'configFiles')
+# Opt-in mechanical fields: only maintained once an index carries them.
+OPTIONAL_MECHANICAL_FIELDS = ('symbols',)
+# Mechanical fields present only while the repo has them (dropped when it stops).
+CONDITIONAL_MECHANICAL_FIELDS = ('workspaces',)
 # Fields that require Claude — a mechanical refresh must NEVER touch these.
 JUDGMENT_FIELDS = ('framework', 'entryPoints', 'concepts', 'coreFiles', 'skip')
 
 
-def run_git(args):
-    """Run git command and return output."""
+def run_git(args, cwd=None, on_error=''):
+    """Run git command and return output (on_error when git fails or is missing)."""
     try:
         result = subprocess.run(
             ['git'] + args,
+            cwd=cwd,
             capture_output=True,
             text=True,
             check=True,
@@ -62,191 +140,914 @@ def run_git(args):
         )
         return result.stdout
     except subprocess.CalledProcessError:
-        return ''
+        return on_error
     except FileNotFoundError:
-        return ''
+        return on_error
 
 
-def get_recently_active(root, days=14, limit=15):
-    """Get recently modified files from git. This is 100% reliable."""
-    since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-    output = run_git(['log', f'--since={since}', '--name-only', '--pretty=format:'])
+def find_root(cwd=None):
+    """Repo root (native separators) for cwd, or None outside a git repo."""
+    root = run_git(['rev-parse', '--show-toplevel'], cwd=cwd).strip()
+    return root.replace('/', os.sep) if root else None
 
-    if not output:
-        return []
+
+def stream_git(args, cwd=None):
+    """Yield git stdout line by line as it is produced (nothing if git fails).
+
+    Reads through a pipe instead of buffering the whole output, so memory stays
+    flat however much history the command walks.
+    """
+    try:
+        proc = subprocess.Popen(
+            ['git'] + args,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+    except OSError:
+        return
+    try:
+        for line in proc.stdout:
+            yield line.rstrip('\n')
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+
+def get_recently_active(root, days=14, limit=15, max_commits=RECENT_MAX_COMMITS, present=None,
+                        paths=None):
+    """Get recently modified files from git. This is 100% reliable.
+
+    Streams `git log --name-only` (capped at max_commits so cost stays bounded
+    however busy the history is) and counts raw paths first. Filtering and the
+    existence check run once per UNIQUE path, against `present` — the set of
+    source files known to exist (from the tree snapshot) — or, failing that, the
+    tracked-file set from one `git ls-files` call; stat is the last resort.
+    `paths` limits the log to those pathspecs (a workspace package's dir).
+    """
+    since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    lines = stream_git(['-c', 'core.quotepath=off', 'log', f'--since={since}',
+                        f'--max-count={max_commits}', '--name-only', '--pretty=format:']
+                       + (['--', *paths] if paths else []),
+                       cwd=root)
 
     counts = defaultdict(int)
-    for line in output.strip().split('\n'):
+    for line in lines:
         line = line.strip()
-        if not line or line.startswith(' '):
-            continue
+        if line:
+            counts[line] += 1
+    if not counts:
+        return []
+
+    if present is None:
+        tracked = _git_z(root, ['ls-files'])
+        present = set(tracked) if tracked is not None else None
 
-        file_path = Path(root) / line
-        if file_path.exists() and Path(line).suffix in SOURCE_EXTENSIONS:
-            if not any(excl in Path(line).parts for excl in EXCLUDE_DIRS):
-                counts[line] += 1
+    def exists(rel):
+        if present is not None:
+            return rel in present
+        return (Path(root) / rel).exists()
 
-    sorted_files = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+    active = [(f, n) for f, n in counts.items() if _is_source_path(f) and exists(f)]
+    sorted_files = sorted(active, key=lambda x: x[1], reverse=True)
     return [f for f, _ in sorted_files[:limit]]
 
 
-def parse_scripts(root):
-    """Parse scripts from package.json. This is 100% reliable."""
-    pkg_path = Path(root) / 'package.json'
-    if not pkg_path.exists():
-        return {}
-
+# Common directory patterns (existence only — their purpose is Claude's call).
+DIRECTORY_CANDIDATES = [
+    'src', 'src/app', 'src/pages', 'src/components', 'src/lib', 'src/utils',
+    'src/services', 'src/hooks', 'src/types', 'src/api', 'src/styles',
+    'app', 'pages', 'components', 'lib', 'utils',
+    'prisma', 'supabase', 'drizzle',
+    'public', 'static', 'assets',
+    'tests', '__tests__', 'test', 'spec',
+    'scripts', 'tools', 'bin',
+    'docs', 'documentation',
+    'config', 'configs',
+]
+
+# Config files Claude uses to detect the framework.
+CONFIG_CANDIDATES = [
+    # JS/TS frameworks
+    'next.config.js', 'next.config.mjs', 'next.config.ts',
+    'vite.config.ts', 'vite.config.js',
+    'remix.config.js',
+    'astro.config.mjs', 'astro.config.ts',
+    'svelte.config.js',
+    'nuxt.config.ts', 'nuxt.config.js',
+    'gatsby-config.js', 'gatsby-config.ts',
+    # Build tools
+    'webpack.config.js', 'rollup.config.js', 'esbuild.config.js',
+    'turbo.json',
+    # Package managers
+    'package.json', 'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lockb',
+    'pnpm-workspace.yaml',
+    # TypeScript
+    'tsconfig.json', 'jsconfig.json',
+    # Linting/Formatting
+    'eslint.config.js', '.eslintrc.js', '.eslintrc.json',
+    'prettier.config.js', '.prettierrc',
+    'biome.json',
+    # Testing
+    'vitest.config.ts', 'jest.config.js', 'playwright.config.ts',
+    # Database
+    'prisma/schema.prisma',
+    'drizzle.config.ts',
+    # Python
+    'pyproject.toml', 'setup.py', 'requirements.txt',
+    # Go
+    'go.mod', 'go.sum', 'go.work',
+    # Rust
+    'Cargo.toml',
+    # Docker
+    'Dockerfile', 'docker-compose.yml', 'docker-compose.yaml',
+    # CI/CD
+    '.github/workflows', '.gitlab-ci.yml',
+    # Misc
+    'tailwind.config.js', 'tailwind.config.ts',
+    'postcss.config.js',
+    '.env.example', '.env.local.example',
+]
+
+# Parent dirs of every candidate above ('' = root). Listing these few dirs once
+# answers every candidate, instead of one exists()/is_dir() probe apiece.
+_PROBE_PARENTS = sorted({c.rpartition('/')[0] for c in DIRECTORY_CANDIDATES + CONFIG_CANDIDATES})
+
+
+def load_ignore(root):
+    """Compiled exclusion rules for the source walk, in gitignore syntax.
+
+    Order (last match wins): EXCLUDE_DIRS, .git/info/exclude, the root
+    .gitignore, .shipkit/index-ignore, then the index's `skip` entries — so the
+    index-specific lists can exclude what git tracks, and `!path` in
+    index-ignore re-includes. Nested .gitignore files are added by the walker
+    (scan_tree / git_source_state) as their directories are reached.
+    """
+    root_path = Path(root)
+    ignore = IgnoreMatcher()
+    ignore.add_lines(f'{name}/' for name in sorted(EXCLUDE_DIRS))
+    ignore.add_file(root_path / '.git' / 'info' / 'exclude')
+    ignore.add_file(root_path / '.gitignore')
+    ignore.add_file(root_path / INDEX_IGNORE_PATH)
+    index = _read_json(root_path / OUTPUT_PATH)
+    skip = index.get('skip') if isinstance(index, dict) else None
+    if isinstance(skip, list):
+        ignore.add_lines(entry for entry in skip if isinstance(entry, str))
+    return ignore
+
+
+def _parse_scripts_file(pkg_path):
     try:
-        data = json.loads(pkg_path.read_text(encoding='utf-8'))
+        data = json.loads(Path(pkg_path).read_text(encoding='utf-8'))
         return data.get('scripts', {})
     except (json.JSONDecodeError, IOError):
         return {}
 
 
-def list_directories(root):
-    """List existing directories (not their purpose - Claude does that)."""
+def _list_entries(path):
+    """(dir names, all names) directly under path; empty when it isn't a dir."""
+    dirs, names = set(), set()
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                names.add(entry.name)
+                try:
+                    if entry.is_dir():
+                        dirs.add(entry.name)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return dirs, names
+
+
+def scan_tree(root, walk_sources=True, ignore=None):
+    """One pass over the tree → snapshot of everything the mechanical layer reads.
+
+    Returns {'source_files', 'directories', 'config_files', 'scripts', 'ignore',
+    'workspaces'}. With
+    walk_sources, a single os.walk yields the source files AND the listings of
+    the candidate parent dirs; without it (the git engine needs no walk) those
+    few parents are scandir'd directly and source_files stays None until
+    compute_source_digest() fills it from git's view of the tree. package.json
+    is parsed once. The digest and build_mechanical both consume this snapshot
+    instead of re-probing the tree. In a monorepo, 'workspaces' lists the
+    declared packages (see _workspaces.py).
+
+    Ignored directories (see load_ignore) are pruned before descent, so a
+    gitignored coverage/ or vendored SDK is never listed, let alone hashed.
+    """
     root_path = Path(root)
-    dirs = []
+    if ignore is None:
+        ignore = load_ignore(root)
+    listings = {}
+    source_files = None
+    if walk_sources:
+        source_files = []
+        wanted = set(_PROBE_PARENTS)
+        for dirpath, dirnames, filenames in os.walk(root_path):
+            rel_dir = Path(dirpath).relative_to(root_path).as_posix()
+            rel_dir = '' if rel_dir == '.' else rel_dir
+            if rel_dir in wanted:
+                # os.walk lists symlinked dirs in dirnames without following them,
+                # matching what is_dir() reported for a candidate.
+                listings[rel_dir] = (set(dirnames), set(dirnames) | set(filenames))
+            prefix = f'{rel_dir}/' if rel_dir else ''
+            if rel_dir and '.gitignore' in filenames:
+                ignore.add_file(Path(dirpath) / '.gitignore', base=rel_dir)
+            # prune ignored dirs in place, before os.walk descends into them
+            dirnames[:] = [d for d in dirnames if not ignore.dir_ignored(prefix + d)]
+            for name in filenames:
+                if Path(name).suffix in SOURCE_EXTENSIONS and not ignore.ignored(prefix + name):
+                    source_files.append(prefix + name)
+
+    snapshot = _probe_candidates(root_path, listings)
+    snapshot['source_files'] = source_files
+    snapshot['ignore'] = ignore
+    snapshot['workspaces'] = (cached_workspaces(root_path, ignore)
+                              if set(WORKSPACE_MARKERS) & set(snapshot['config_files']) else [])
+    return snapshot
+
+
+def _stat_pair(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def cached_workspaces(root_path, ignore):
+    """detect_workspaces(), re-run only when one of its inputs moved.
 
-    # Check common directory patterns
-    candidates = [
-        'src', 'src/app', 'src/pages', 'src/components', 'src/lib', 'src/utils',
-        'src/services', 'src/hooks', 'src/types', 'src/api', 'src/styles',
-        'app', 'pages', 'components', 'lib', 'utils',
-        'prisma', 'supabase', 'drizzle',
-        'public', 'static', 'assets',
-        'tests', '__tests__', 'test', 'spec',
-        'scripts', 'tools', 'bin',
-        'docs', 'documentation',
-        'config', 'configs',
-    ]
+    WORKSPACES_CACHE_PATH keys the last result on the (size, mtime_ns) of the
+    root workspace manifests (WORKSPACE_KEY_FILES) and a digest of the ignore
+    rules the globs were expanded under, plus the mtime_ns of each detected
+    package's parent dir, so a package added next to existing ones is picked up.
+    """
+    rules = hashlib.sha256(repr([(base, negate, dir_only, regex.pattern)
+                                 for base, negate, dir_only, regex in ignore.rules])
+                           .encode('utf-8')).hexdigest()
+    key = {'files': {name: _stat_pair(root_path / name) for name in WORKSPACE_KEY_FILES},
+           'ignore': rules}
+    cached = _read_json(root_path / WORKSPACES_CACHE_PATH)
+    if (isinstance(cached, dict) and cached.get('key') == key
+            and isinstance(cached.get('parents'), dict)
+            and isinstance(cached.get('workspaces'), list)
+            and all(_stat_pair(root_path / rel) == pair for rel, pair in cached['parents'].items())):
+        return cached['workspaces']
+    workspaces = detect_workspaces(root_path, ignore)
+    parents = {}
+    for ws in workspaces:
+        parent = ws['path'].rpartition('/')[0]
+        if parent and parent not in parents:
+            parents[parent] = _stat_pair(root_path / parent)
+    ensure_cache_gitignore(root_path)
+    _atomic_write_json(root_path / WORKSPACES_CACHE_PATH,
+                       {'key': key, 'parents': parents, 'workspaces': workspaces}, indent=None)
+    return workspaces
+
+
+def _probe_candidates(base, listings=None):
+    """{'directories', 'config_files', 'scripts'} present under base.
+
+    listings maps already-known parent dirs to _list_entries() results (the
+    walker fills it for free); the rest of the candidate parents are scandir'd.
+    """
+    listings = {} if listings is None else listings
+
+    def present(candidate, want_dir):
+        parent, _, name = candidate.rpartition('/')
+        if parent not in listings:
+            listings[parent] = _list_entries(base / parent)
+        dirs, names = listings[parent]
+        return name in (dirs if want_dir else names)
+
+    config_files = [c for c in CONFIG_CANDIDATES if present(c, want_dir=False)]
+    return {
+        'directories': [c for c in DIRECTORY_CANDIDATES if present(c, want_dir=True)],
+        'config_files': config_files,
+        'scripts': (_parse_scripts_file(base / 'package.json')
+                    if 'package.json' in config_files else {}),
+    }
+
+
+def parse_scripts(root):
+    """Parse scripts from package.json. This is 100% reliable."""
+    pkg_path = Path(root) / 'package.json'
+    if not pkg_path.exists():
+        return {}
+    return _parse_scripts_file(pkg_path)
 
-    for candidate in candidates:
-        if (root_path / candidate).is_dir():
-            dirs.append(candidate)
 
-    return dirs
+def list_directories(root):
+    """List existing directories (not their purpose - Claude does that)."""
+    return scan_tree(root, walk_sources=False)['directories']
 
 
 def list_config_files(root):
     """List existing config files (Claude uses these to detect framework)."""
-    root_path = Path(root)
-    configs = []
-
-    candidates = [
-        # JS/TS frameworks
-        'next.config.js', 'next.config.mjs', 'next.config.ts',
-        'vite.config.ts', 'vite.config.js',
-        'remix.config.js',
-        'astro.config.mjs', 'astro.config.ts',
-        'svelte.config.js',
-        'nuxt.config.ts', 'nuxt.config.js',
-        'gatsby-config.js', 'gatsby-config.ts',
-        # Build tools
-        'webpack.config.js', 'rollup.config.js', 'esbuild.config.js',
-        'turbo.json',
-        # Package managers
-        'package.json', 'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lockb',
-        # TypeScript
-        'tsconfig.json', 'jsconfig.json',
-        # Linting/Formatting
-        'eslint.config.js', '.eslintrc.js', '.eslintrc.json',
-        'prettier.config.js', '.prettierrc',
-        'biome.json',
-        # Testing
-        'vitest.config.ts', 'jest.config.js', 'playwright.config.ts',
-        # Database
-        'prisma/schema.prisma',
-        'drizzle.config.ts',
-        # Python
-        'pyproject.toml', 'setup.py', 'requirements.txt',
-        # Go
-        'go.mod', 'go.sum',
-        # Rust
-        'Cargo.toml',
-        # Docker
-        'Dockerfile', 'docker-compose.yml', 'docker-compose.yaml',
-        # CI/CD
-        '.github/workflows', '.gitlab-ci.yml',
-        # Misc
-        'tailwind.config.js', 'tailwind.config.ts',
-        'postcss.config.js',
-        '.env.example', '.env.local.example',
-    ]
-
-    for candidate in candidates:
-        path = root_path / candidate
-        if path.exists():
-            configs.append(candidate)
-
-    return configs
-
-
-def build_mechanical(root):
-    """Compute the four mechanical fields (100% reliable, no judgment)."""
+    return scan_tree(root, walk_sources=False)['config_files']
+
+
+def build_mechanical(root, snapshot=None, with_symbols=False):
+    """Compute the four mechanical fields (100% reliable, no judgment).
+
+    with_symbols adds the optional `symbols` summary (see build_symbols).
+    """
+    if snapshot is None:
+        snapshot = scan_tree(root, walk_sources=False)
+    present = set(snapshot['source_files']) if snapshot['source_files'] is not None else None
+    fields = {
+        'scripts': snapshot['scripts'],
+        'recentlyActive': get_recently_active(root, present=present),
+        'directories': snapshot['directories'],
+        'configFiles': snapshot['config_files'],
+    }
+    if with_symbols:
+        fields['symbols'] = build_symbols(root, snapshot)
+    if snapshot.get('workspaces'):
+        fields['workspaces'] = [dict(ws, shard=shard_path(ws['path'])) for ws in snapshot['workspaces']]
+    return fields
+
+
+# ─── Symbol layer (optional, incremental) ───────────────────────────────────
+
+def _read_json(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def build_symbols(root, snapshot):
+    """Refresh the exported-symbol table; return its summary for the index.
+
+    The full table ({file: [[name, kind, line], ...]}) lives in the sidecar at
+    SYMBOLS_PATH so the index stays lean. Parsing is incremental: the symbols
+    cache remembers each file's content identity (the same hash/blob SHA the
+    digest uses), and only files whose identity moved are re-read. The sidecar
+    is rewritten only when the table actually changed.
+    """
+    if 'identities' not in snapshot:
+        compute_source_digest(root, read_cache(root), snapshot=snapshot)
+    identities = snapshot['identities']
+
+    cached = _read_json(Path(root) / SYMBOLS_CACHE_PATH)
+    cached = cached.get('files', {}) if isinstance(cached, dict) else {}
+    entries = {}
+    table = {}
+    for rel in sorted(identities):
+        ident = identities[rel]
+        prev = cached.get(rel)
+        if isinstance(prev, list) and len(prev) == 2 and prev[0] == ident:
+            symbols = prev[1]
+        else:
+            try:
+                text = (Path(root) / rel).read_text(encoding='utf-8', errors='replace')
+            except OSError:
+                continue
+            symbols = extract_symbols(rel, text)
+        entries[rel] = [ident, symbols]
+        if symbols:
+            table[rel] = symbols
+
+    if entries != cached:
+        ensure_cache_gitignore(root)
+        _atomic_write_json(Path(root) / SYMBOLS_CACHE_PATH, {'files': entries}, indent=None)
+    sidecar = _read_json(Path(root) / SYMBOLS_PATH)
+    if not isinstance(sidecar, dict) or sidecar.get('files') != table:
+        # One line per file: greppable, and a diff shows exactly which files moved.
+        lines = [f'  {json.dumps(rel)}: {json.dumps(symbols, ensure_ascii=False)}'
+                 for rel, symbols in table.items()]
+        _atomic_write_text(Path(root) / SYMBOLS_PATH,
+                           '{"files": {\n' + ',\n'.join(lines) + '\n}}\n')
+
     return {
-        'scripts': parse_scripts(root),
-        'recentlyActive': get_recently_active(root),
-        'directories': list_directories(root),
-        'configFiles': list_config_files(root),
+        'path': SYMBOLS_PATH,
+        'files': len(table),
+        'count': sum(len(symbols) for symbols in table.values()),
     }
 
 
+def find_symbol(root, name):
+    """Print file:line for every exported symbol called name; 1 if none."""
+    sidecar = _read_json(Path(root) / SYMBOLS_PATH)
+    if not isinstance(sidecar, dict):
+        print(f"No symbol table at {SYMBOLS_PATH} — run generate_index.py --symbols.")
+        return 1
+    hits = [(rel, line, kind) for rel, symbols in sidecar.get('files', {}).items()
+            for sym_name, kind, line in symbols if sym_name == name]
+    for rel, line, kind in sorted(hits):
+        print(f"{rel}:{line}  {kind}  {name}")
+    return 0 if hits else 1
+
+
+# ─── Import graph (optional, incremental) ────────────────────────────────────
+
+def read_import_graph(root):
+    """Load the persisted graph, or None when missing/unreadable/old format."""
+    graph = _read_json(Path(root) / IMPORTS_PATH)
+    if not isinstance(graph, dict) or graph.get('version') != IMPORTS_VERSION:
+        return None
+    return graph
+
+
+def build_import_graph(root, snapshot, digest=None):
+    """Rebuild the import graph at IMPORTS_PATH and return it.
+
+    Layout (compact JSON, integer node ids = positions in `nodes`):
+      nodes  sorted source paths
+      idents content identity per node (the digest's hash / blob SHA)
+      specs  raw import specifiers per node (what the parser saw)
+      edges  adjacency list — edges[i] = ids node i imports
+
+    Only nodes whose identity moved are re-read and re-parsed; resolution
+    (specifier → file) always re-runs because it depends on which files exist,
+    and it is just set lookups. The file is rewritten only when it changed.
+    """
+    if 'identities' not in snapshot:
+        digest, _ = compute_source_digest(root, read_cache(root), snapshot=snapshot)
+    identities = snapshot['identities']
+
+    previous = read_import_graph(root) or {}
+    cached = {rel: (ident, specs) for rel, ident, specs in
+              zip(previous.get('nodes', []), previous.get('idents', []), previous.get('specs', []))}
+    nodes = sorted(identities)
+    specs = []
+    for rel in nodes:
+        prev = cached.get(rel)
+        if prev and prev[0] == identities[rel]:
+            specs.append(prev[1])
+            continue
+        try:
+            text = (Path(root) / rel).read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            text = ''
+        specs.append(extract_imports(rel, text))
+
+    ids = {rel: i for i, rel in enumerate(nodes)}
+    resolver = Resolver(root, nodes)
+    edges = []
+    for rel, file_specs in zip(nodes, specs):
+        targets = {ids[hit] for spec in file_specs for hit in resolver.resolve(rel, spec)}
+        targets.discard(ids[rel])
+        edges.append(sorted(targets))
+
+    graph = {
+        'version': IMPORTS_VERSION,
+        'sourceDigest': digest,
+        'nodes': nodes,
+        'idents': [identities[rel] for rel in nodes],
+        'specs': specs,
+        'edges': edges,
+    }
+    if graph != previous:
+        ensure_cache_gitignore(root)
+        _atomic_write_json(Path(root) / IMPORTS_PATH, graph, indent=None)
+    return graph
+
+
+def _maintain_import_graph(root, snapshot, digest):
+    """Keep an existing (opted-in) graph in step with the source digest."""
+    graph = read_import_graph(root)
+    if graph is not None and graph.get('sourceDigest') != digest:
+        build_import_graph(root, snapshot, digest)
+
+
+def _graph_node(graph, root, path, cwd):
+    """Map a user-supplied path (relative to cwd, or to root) to a node id."""
+    ids = {rel: i for i, rel in enumerate(graph['nodes'])}
+    candidates = [path.replace(os.sep, '/')]
+    try:
+        candidates.insert(0, Path(os.path.abspath(os.path.join(cwd, path)))
+                          .relative_to(Path(root).resolve()).as_posix())
+    except ValueError:
+        pass
+    for rel in candidates:
+        if rel in ids:
+            return ids[rel]
+    return None
+
+
+def query_import_graph(root, query, path, hops=1, cwd=None):
+    """Answer importers / dependents / near for path; print one file per line.
+
+    importers   files that import path directly
+    dependents  every file that reaches path through imports (blast radius)
+    near        files within `hops` import edges either way, as "<hops> <file>"
+    Returns 1 when path is not a node of the graph.
+    """
+    graph = read_import_graph(root)
+    if graph is None:
+        print("No import graph yet — building it (later refreshes keep it current).",
+              file=sys.stderr)
+        graph = build_import_graph(root, scan_tree(root, walk_sources=False))
+    start = _graph_node(graph, root, path, cwd or root)
+    if start is None:
+        print(f"{path} is not a source file in the import graph.", file=sys.stderr)
+        return 1
+
+    nodes, edges = graph['nodes'], graph['edges']
+    reverse = [[] for _ in nodes]
+    for src, targets in enumerate(edges):
+        for dst in targets:
+            reverse[dst].append(src)
+
+    if query == 'importers':
+        for i in sorted(reverse[start], key=nodes.__getitem__):
+            print(nodes[i])
+        return 0
+
+    if query == 'dependents':
+        neighbours = lambda i: reverse[i]  # noqa: E731
+        limit = None
+    else:
+        neighbours = lambda i: edges[i] + reverse[i]  # noqa: E731
+        limit = hops
+    dist = {start: 0}
+    frontier = [start]
+    while frontier and (limit is None or dist[frontier[0]] < limit):
+        nxt = []
+        for i in frontier:
+            for j in neighbours(i):
+                if j not in dist:
+                    dist[j] = dist[i] + 1
+                    nxt.append(j)
+        frontier = nxt
+    del dist[start]
+    for i, d in sorted(dist.items(), key=lambda item: (item[1], nodes[item[0]])):
+        print(nodes[i] if query == 'dependents' else f"{d} {nodes[i]}")
+    return 0
+
+
+# ─── Workspace shards (monorepos) ───────────────────────────────────────────
+
+def shard_path(package):
+    """Where a workspace package's shard lives, e.g. packages/web → …/packages__web.json."""
+    return f"{SHARDS_DIR}/{package.replace('/', '__')}.json"
+
+
+def maintain_shards(root, snapshot, force=False):
+    """Keep one mechanical shard per workspace package current.
+
+    Each package gets its own source digest — the content identities under its
+    directory plus its own candidate dirs/config files/scripts — kept in
+    SHARDS_CACHE_PATH. Only shards whose digest moved are rebuilt, so a commit
+    in one package leaves the others untouched; a rebuilt shard whose fields
+    came out identical isn't rewritten either. Shards of packages that are no
+    longer declared are removed. Needs snapshot['identities']
+    (compute_source_digest).
+    """
+    root_path = Path(root)
+    workspaces = snapshot.get('workspaces') or []
+    cached = _read_json(root_path / SHARDS_CACHE_PATH)
+    cached = cached if isinstance(cached, dict) and not force else {}
+    if not workspaces and not cached and not (root_path / SHARDS_DIR).is_dir():
+        return
+    identities = snapshot.get('identities') or {}
+    present = set(snapshot['source_files']) if snapshot.get('source_files') is not None else None
+    # Sorted once: each package's files are then one contiguous slice of it,
+    # from `<package>/` up to `<package>0` ('0' sorts right after '/').
+    rels = sorted(identities)
+    digests = {}
+    for ws in workspaces:
+        package = ws['path']
+        probe = _probe_candidates(root_path / package)
+        h = hashlib.sha256()
+        start = bisect.bisect_left(rels, package + '/')
+        end = bisect.bisect_left(rels, package + '0', start)
+        for rel in rels[start:end]:
+            h.update(f'{rel}\0{identities[rel]}\n'.encode('utf-8'))
+        h.update(json.dumps([ws, probe], sort_keys=True).encode('utf-8'))
+        digest = h.hexdigest()
+        entry = cached.get(package)
+        shard_file = root_path / shard_path(package)
+        if isinstance(entry, dict) and entry.get('sourceDigest') == digest and shard_file.exists():
+            digests[package] = entry
+            continue
+        fields = {
+            'package': package,
+            'name': ws['name'],
+            'scripts': probe['scripts'],
+            'recentlyActive': get_recently_active(root, present=present, paths=[package]),
+            'directories': probe['directories'],
+            'configFiles': probe['config_files'],
+        }
+        mech = mechanical_digest(fields)
+        previous = _read_json(shard_file)
+        if not (isinstance(previous, dict) and mechanical_digest(
+                {k: previous.get(k) for k in fields}) == mech):
+            fields['mechanicalRefreshedAt'] = datetime.now().strftime('%Y-%m-%d')
+            _atomic_write_json(shard_file, fields)
+        digests[package] = {'sourceDigest': digest, 'mechanicalDigest': mech}
+
+    keep = {Path(shard_path(ws['path'])).name for ws in workspaces}
+    shards_dir = root_path / SHARDS_DIR
+    if shards_dir.is_dir():
+        for stale in shards_dir.glob('*.json'):
+            if stale.name not in keep:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+    if digests != cached:
+        ensure_cache_gitignore(root)
+        _atomic_write_json(root_path / SHARDS_CACHE_PATH, digests, indent=None)
+
+
 # ─── Incremental change detection (content-hash cache) ──────────────────────
 
 def _iter_source_files(root):
-    """Yield POSIX-relative paths of tracked-shape source files, excluding heavy dirs."""
-    root_path = Path(root)
-    for dirpath, dirnames, filenames in os.walk(root_path):
-        # prune excluded dirs in place (also skips dotdirs like .git/.venv listed above)
-        dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
-        for name in filenames:
-            if Path(name).suffix in SOURCE_EXTENSIONS:
-                rel = Path(dirpath, name).relative_to(root_path).as_posix()
-                yield rel
+    """POSIX-relative paths of tracked-shape source files, excluding heavy dirs."""
+    return scan_tree(root)['source_files']
+
+
+# A manifest entry whose mtime falls this close to the moment it was recorded
+# can't be trusted: a second write inside the same timestamp tick would leave
+# the stat tuple unchanged. Such "racily clean" entries are re-hashed next run
+# (the same guard git applies to its index).
+RACY_WINDOW_NS = 2_000_000_000
+# Files are hashed in fixed-size chunks, so a 50 MB generated bundle costs 1 MiB
+# of memory rather than 50.
+HASH_CHUNK = 1 << 20
+# Hashing threads. hashlib releases the GIL on buffers over 2 KiB and reads block
+# on I/O, so threads scale with cores until the disk saturates; past ~8 they only
+# add contention. --jobs 1 hashes serially on the calling thread.
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+# Below this many files a pool costs more to start than it saves.
+PARALLEL_MIN_FILES = 64
+# Batches per worker: enough to even out a few large files landing in one batch,
+# few enough that per-batch overhead stays off small source files.
+BATCHES_PER_JOB = 4
+
+
+def _hash_file(path, size=None):
+    """sha256 hex of a file's bytes, or None if it can't be read.
+
+    A file stat'd under HASH_CHUNK (nearly every source file) is read in one
+    go; anything larger, or of unknown size, in HASH_CHUNK pieces.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if size is not None and size < HASH_CHUNK:
+                return hashlib.sha256(f.read()).hexdigest()
+            h = hashlib.sha256()
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _hash_files(items, jobs=None):
+    """_hash_file over (path, size) items; results in input order.
+
+    With jobs > 1 and enough files, contiguous batches run on a bounded thread
+    pool and are rejoined in submission order, so the result never depends on
+    which thread finished first.
+    """
+    jobs = DEFAULT_JOBS if jobs is None else max(1, jobs)
+    if jobs == 1 or len(items) < PARALLEL_MIN_FILES:
+        return [_hash_file(path, size) for path, size in items]
+    size = -(-len(items) // (jobs * BATCHES_PER_JOB))
+    batches = [items[i:i + size] for i in range(0, len(items), size)]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(lambda batch: [_hash_file(p, n) for p, n in batch], batches)
+        return [sha for batch in results for sha in batch]
+
+
+def update_manifest(root, rel_paths, previous=None, previous_scanned_ns=0, jobs=None):
+    """Per-file manifest {rel: [size, mtime_ns, inode, sha256]} for rel_paths.
+
+    Files whose (size, mtime_ns, inode) tuple matches the previous manifest reuse
+    the recorded hash without being opened — only files whose stat moved (or that
+    were racily clean last time) are re-read. That makes a no-change refresh
+    O(stat) instead of O(bytes). The re-reads (every file, on a cold cache) are
+    hashed in sorted rel order on `jobs` threads (see _hash_files); the manifest
+    is the same for any job count.
+    """
+    previous = previous or {}
+    # Plain string joins: pathlib's per-file parsing costs more than the hash
+    # of a typical source file.
+    root_str = os.fspath(root)
+    manifest = {}
+    pending = []
+    for rel in rel_paths:
+        path = os.path.join(root_str, rel)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue  # vanished between walk and stat
+        stat_key = [st.st_size, st.st_mtime_ns, st.st_ino]
+        prev = previous.get(rel)
+        if (prev and prev[:3] == stat_key and prev[3]
+                and st.st_mtime_ns < previous_scanned_ns - RACY_WINDOW_NS):
+            manifest[rel] = prev
+            continue
+        manifest[rel] = stat_key
+        pending.append(rel)
+    pending.sort()
+    hashes = _hash_files([(os.path.join(root_str, rel), manifest[rel][0]) for rel in pending], jobs)
+    for rel, sha in zip(pending, hashes):
+        manifest[rel] = manifest[rel] + [sha]
+    return manifest
+
 
+def _has_racy_entries(manifest, scanned_ns):
+    return any(entry[1] >= scanned_ns - RACY_WINDOW_NS for entry in manifest.values())
 
-def compute_source_digest(root):
+
+def _is_source_path(rel, ignore=None):
+    """True for a POSIX-relative path the filesystem walker would also yield.
+
+    Without an ignore matcher only EXCLUDE_DIRS is applied.
+    """
+    parts = rel.split('/')
+    if Path(parts[-1]).suffix not in SOURCE_EXTENSIONS:
+        return False
+    if ignore is not None:
+        return not ignore.ignored(rel)
+    return not any(part in EXCLUDE_DIRS for part in parts[:-1])
+
+
+def _git_z(root, args):
+    """NUL-separated git output as a list of entries, or None when git fails."""
+    out = run_git(args + ['-z'], cwd=root, on_error=None)
+    if out is None:
+        return None
+    return [entry for entry in out.split('\0') if entry]
+
+
+def git_source_state(root, ignore=None):
+    """Source-file identity from git plumbing — no tree walk, no file reads.
+
+    Clean tracked files are identified by their index blob SHA (`git ls-files
+    -s`). Only the dirty set (worktree differs from the index, or an unresolved
+    merge) and untracked, non-ignored files need the filesystem. Returns None
+    when git can't answer, so callers fall back to the walker.
+
+    The same exclusion rules as the walker apply, tracked files included, so
+    both engines index the same file set.
+    """
+    staged = _git_z(root, ['ls-files', '-s'])
+    modified = _git_z(root, ['diff', '--name-only'])
+    untracked = _git_z(root, ['ls-files', '--others', '--exclude-standard'])
+    if staged is None or modified is None or untracked is None:
+        return None
+    if ignore is None:
+        ignore = load_ignore(root)
+
+    entries = []
+    nested = []
+    for entry in staged:
+        meta, _, rel = entry.partition('\t')
+        fields = meta.split(' ')
+        if len(fields) != 3 or fields[0] == '160000':  # malformed / submodule
+            continue
+        entries.append((fields, rel))
+        if rel.endswith('/.gitignore'):
+            nested.append(rel)
+    nested.extend(rel for rel in untracked if rel.endswith('/.gitignore'))
+    # Shallow files first, so a subdirectory's rules follow (and win over) its parent's.
+    for rel in sorted(set(nested), key=lambda rel: rel.count('/')):
+        ignore.add_file(Path(root) / rel, base=rel.rpartition('/')[0])
+
+    blobs = {}
+    conflicted = set()
+    for fields, rel in entries:
+        if not _is_source_path(rel, ignore):
+            continue
+        if fields[2] != '0':
+            conflicted.add(rel)
+        blobs[rel] = fields[1]
+
+    return {
+        'head': run_git(['rev-parse', '--verify', '-q', 'HEAD'], cwd=root).strip(),
+        'blobs': blobs,
+        'dirty': {rel for rel in modified if rel in blobs} | conflicted,
+        'untracked': [rel for rel in untracked if _is_source_path(rel, ignore)],
+    }
+
+
+def compute_source_digest(root, cache=None, engine='auto', snapshot=None, jobs=None):
     """Deterministic digest of everything the mechanical fields derive from.
 
     Captures: source-file contents (add/remove/edit), the structural shape
     (which dirs/config files exist), and package.json scripts. Deliberately
     EXCLUDES recentlyActive (time-windowed — it drifts without a real change,
     and is cheap to recompute when something else moves).
+
+    Two engines supply per-file content identity:
+      git  — blob SHAs for clean tracked files; only the dirty set and untracked
+             files go through the stat manifest. Used by `auto` inside a repo.
+      fs   — os.walk + the stat manifest for every file (see update_manifest).
+    Either way unchanged files are never re-read, and the ones that are get
+    hashed on `jobs` threads (see update_manifest). Pass the scan_tree() snapshot
+    the caller will also feed to build_mechanical() so the tree is probed once.
+
+    Returns (digest, state) — state is the engine's cache payload (manifest,
+    and for git the indexed HEAD + dirty set).
     """
+    cache = cache or {}
+    previous = cache.get('files')
+    previous_scanned_ns = cache.get('scannedAtNs', 0)
+    ignore = snapshot['ignore'] if snapshot is not None else load_ignore(root)
+    git = git_source_state(root, ignore) if engine in ('auto', 'git') else None
+    if snapshot is None or (git is None and snapshot['source_files'] is None):
+        snapshot = scan_tree(root, walk_sources=git is None, ignore=ignore)
+
+    identities = {}
+    if git is None:
+        state = {'engine': 'fs'}
+        manifest = update_manifest(root, snapshot['source_files'], previous,
+                                   previous_scanned_ns, jobs)
+    else:
+        state = {'engine': 'git', 'gitHead': git['head'], 'dirty': sorted(git['dirty'])}
+        for rel, sha in git['blobs'].items():
+            if rel not in git['dirty']:
+                identities[rel] = b'git:' + bytes.fromhex(sha)
+        manifest = update_manifest(root, state['dirty'] + git['untracked'],
+                                   previous, previous_scanned_ns, jobs)
+    for rel, entry in manifest.items():
+        identities[rel] = bytes.fromhex(entry[3]) if entry[3] else b'<unreadable>'
+    state['files'] = manifest
+    if snapshot['source_files'] is None:
+        # Git told us exactly which source files exist (clean tracked + stat'd
+        # dirty/untracked); record it so recentlyActive needs no stat either.
+        snapshot['source_files'] = sorted(identities)
+    # Per-file content identity, for layers that rebuild incrementally
+    # (symbols, import graph).
+    snapshot['identities'] = {rel: ident.hex() for rel, ident in identities.items()}
+
     h = hashlib.sha256()
-    for rel in sorted(_iter_source_files(root)):
+    for rel in sorted(identities):
         h.update(rel.encode('utf-8'))
         h.update(b'\0')
-        try:
-            with open(Path(root) / rel, 'rb') as f:
-                h.update(hashlib.sha256(f.read()).digest())
-        except OSError:
-            h.update(b'<unreadable>')
+        h.update(identities[rel])
         h.update(b'\n')
     # Structural shape: a new dir or config file must bust the cache even if no
     # source file changed (e.g. adding tsconfig.json or a prisma/ folder).
-    h.update(json.dumps(list_directories(root), sort_keys=True).encode('utf-8'))
-    h.update(json.dumps(list_config_files(root), sort_keys=True).encode('utf-8'))
-    h.update(json.dumps(parse_scripts(root), sort_keys=True).encode('utf-8'))
-    return h.hexdigest()
+    h.update(json.dumps(snapshot['directories'], sort_keys=True).encode('utf-8'))
+    h.update(json.dumps(snapshot['config_files'], sort_keys=True).encode('utf-8'))
+    h.update(json.dumps(snapshot['scripts'], sort_keys=True).encode('utf-8'))
+    if snapshot.get('workspaces'):
+        h.update(json.dumps(snapshot['workspaces'], sort_keys=True).encode('utf-8'))
+    return h.hexdigest(), state
+
+
+def mechanical_digest(fields):
+    """Digest of the mechanical fields as written to the index.
+
+    Distinct from the source digest: that one moves on any content edit, this
+    one only when the index output itself would change. It is kept in the cache
+    as `mechanicalDigest` for consumers that only care about the latter.
+    """
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()
 
 
 def read_cache(root):
+    """Load the cache payload ({} when missing/unreadable/pre-manifest shape)."""
     cache_file = Path(root) / CACHE_PATH
     if not cache_file.exists():
-        return None
+        return {}
     try:
-        return json.loads(cache_file.read_text(encoding='utf-8')).get('sourceDigest')
+        data = json.loads(cache_file.read_text(encoding='utf-8'))
     except Exception:
-        return None
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if not isinstance(data.get('files'), dict):
+        data['files'] = {}  # pre-manifest cache: digest still valid, hashes rebuilt once
+    return data
 
 
-def write_cache(root, digest):
+def _cache_is_stale(cache, state):
+    """True when the digest matched but the cache still needs rewriting: the
+    manifest or git state moved, or entries are racily clean."""
+    if any(cache.get(key) != value for key, value in state.items()):
+        return True
+    return _has_racy_entries(state['files'], cache.get('scannedAtNs', 0))
+
+
+def write_cache(root, digest, state, scanned_ns):
+    """Persist the cache payload and return it (the watcher keeps it in memory)."""
     cache_dir = Path(root) / CACHE_DIR
     cache_dir.mkdir(parents=True, exist_ok=True)
-    payload = {'sourceDigest': digest, 'computedAt': datetime.now().isoformat()}
-    _atomic_write_json(Path(root) / CACHE_PATH, payload)
+    payload = {
+        'version': CACHE_VERSION,
+        'sourceDigest': digest,
+        'computedAt': datetime.now().isoformat(),
+        'scannedAtNs': scanned_ns,
+    }
+    payload.update(state)
+    # Compact: the manifest has one entry per source file, so indentation would
+    # roughly double its size on a large repo.
+    _atomic_write_json(Path(root) / CACHE_PATH, payload, indent=None)
+    return payload
 
 
 def ensure_cache_gitignore(root):
@@ -267,30 +1068,109 @@ def ensure_cache_gitignore(root):
             pass
 
 
+# ─── Single-flight refresh (hook storms across fork depths) ─────────────────
+
+# How long a refresh waits for an in-flight one before giving up. A caller with
+# its own time budget (the PostToolUse hook, which refreshes in-process) passes
+# refresh_mechanical() a deadline, and the wait stops there if that's sooner.
+REFRESH_WAIT_SECONDS = 15
+
+
+def _read_flight(root):
+    flight = _read_json(Path(root) / REFRESH_FLIGHT_PATH)
+    if not isinstance(flight, dict):
+        return 0, 0
+    return int(flight.get('started', 0)), int(flight.get('completed', 0))
+
+
+@contextlib.contextmanager
+def _single_flight(root, wait=REFRESH_WAIT_SECONDS):
+    """Serialise concurrent refreshes; yields False when this one can piggyback.
+
+    An advisory flock on REFRESH_LOCK_PATH admits one refresher at a time, and
+    REFRESH_FLIGHT_PATH counts refreshes started/completed. A caller notes the
+    `started` count on arrival; once it holds the lock, a `completed` count past
+    that means a refresh that began after it arrived has already finished — its
+    result covers this caller too, so there's nothing to redo. N concurrent hook
+    runs therefore cost at most two refreshes, not N. A caller that can't get the
+    lock within `wait` seconds gives up (the holder is doing the work). Without
+    fcntl (Windows) every caller refreshes, as before.
+    """
+    if fcntl is None:
+        yield True
+        return
+    lock_path = Path(root) / REFRESH_LOCK_PATH
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    arrived, _ = _read_flight(root)
+    with open(lock_path, 'a+') as lock:
+        deadline = time.monotonic() + wait
+        while True:
+            try:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(0.05)
+        try:
+            started, completed = _read_flight(root)
+            if completed > arrived:
+                yield False
+                return
+            _atomic_write_json(Path(root) / REFRESH_FLIGHT_PATH,
+                               {'started': started + 1, 'completed': completed}, indent=None)
+            yield True
+            _atomic_write_json(Path(root) / REFRESH_FLIGHT_PATH,
+                               {'started': started + 1, 'completed': started + 1}, indent=None)
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
 # ─── Atomic write (fork-safe: PostToolUse hooks fire at every fork depth) ────
 
-def _atomic_write_json(path, data):
+def _atomic_write_text(path, text):
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + f'.tmp.{os.getpid()}')
     with open(tmp, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+        f.write(text)
     os.replace(tmp, path)  # atomic on POSIX and Windows
 
 
+def _atomic_write_json(path, data, indent=2):
+    separators = None if indent is not None else (',', ':')
+    _atomic_write_text(path, json.dumps(data, indent=indent, separators=separators))
+
+
 # ─── Modes ──────────────────────────────────────────────────────────────────
 
-def generate_full(root):
-    """Rebuild the base index; leave judgment fields empty for Claude."""
+def generate_full(root, engine='auto', symbols=False, imports=False, jobs=None):
+    """Rebuild the base index; leave judgment fields empty for Claude.
+
+    The optional symbols layer stays enabled if the previous index had it, and
+    the import graph is rebuilt if it already exists.
+    """
     print("Generating codebase index (base data)...")
     now = datetime.now().strftime('%Y-%m-%d')
+    previous = _read_json(Path(root) / OUTPUT_PATH)
+    symbols = symbols or (isinstance(previous, dict) and 'symbols' in previous)
 
     index = {
         'generated': now,
         'fullRefreshedAt': now,
         'mechanicalRefreshedAt': now,
     }
-    index.update(build_mechanical(root))
+    scanned_ns = time.time_ns()
+    snapshot = scan_tree(root, walk_sources=(engine == 'fs'))
+    digest, state = compute_source_digest(root, read_cache(root), engine, snapshot, jobs)
+    mechanical = build_mechanical(root, snapshot, with_symbols=symbols)
+    index.update(mechanical)
+    state['mechanicalDigest'] = mechanical_digest(mechanical)
+    graph = None
+    if imports or read_import_graph(root) is not None:
+        graph = build_import_graph(root, snapshot, digest)
+    maintain_shards(root, snapshot, force=True)
     # Judgment fields — Claude fills these in the skill flow.
     index.update({
         'framework': '',
@@ -302,13 +1182,21 @@ def generate_full(root):
 
     _atomic_write_json(Path(root) / OUTPUT_PATH, index)
     ensure_cache_gitignore(root)
-    write_cache(root, compute_source_digest(root))
+    write_cache(root, digest, state, scanned_ns)
 
     print(f"OK Base index created at {OUTPUT_PATH}")
     print(f"   Scripts: {len(index['scripts'])}")
     print(f"   Recently active: {len(index['recentlyActive'])} files")
     print(f"   Directories: {len(index['directories'])}")
     print(f"   Config files: {len(index['configFiles'])}")
+    if symbols:
+        print(f"   Symbols: {index['symbols']['count']} in {index['symbols']['files']} files "
+              f"({SYMBOLS_PATH})")
+    if snapshot['workspaces']:
+        print(f"   Workspaces: {len(snapshot['workspaces'])} package shards ({SHARDS_DIR}/)")
+    if graph is not None:
+        print(f"   Import graph: {sum(map(len, graph['edges']))} edges between "
+              f"{len(graph['nodes'])} files ({IMPORTS_PATH})")
     print()
     print("Claude will now analyze this and add:")
     print("   - Framework detection")
@@ -318,18 +1206,51 @@ def generate_full(root):
     return 0
 
 
-def refresh_mechanical(root):
-    """Deterministic refresh of mechanical fields only. No LLM. No partial creation."""
+def refresh_mechanical(root, engine='auto', deadline=None, jobs=None):
+    """Deterministic refresh of mechanical fields only. No LLM. No partial creation.
+
+    Safe to call in-process (the hooks import this module): everything is
+    anchored at root, nothing changes the working directory, and progress goes
+    to stdout only — callers that own stdout redirect it. `deadline` (a
+    time.monotonic() value) caps the wait for a concurrent refresh; bounding
+    the refresh itself is up to the caller.
+    """
     index_path = Path(root) / OUTPUT_PATH
     if not index_path.exists():
         # Never create a partial index from the hook — a full skill run owns creation.
         print("No codebase-index.json yet — nothing to refresh (run /shipkit-codebase-index).")
         return 0
+    wait = REFRESH_WAIT_SECONDS
+    if deadline is not None:
+        wait = max(0.0, min(wait, deadline - time.monotonic()))
+    with _single_flight(root, wait) as needed:
+        if needed:
+            _refresh(root, read_cache(root), engine, jobs)
+        else:
+            print("Codebase index refreshed by a concurrent run — skipped.")
+    return 0
 
-    digest = compute_source_digest(root)
-    if read_cache(root) == digest:
-        print("Codebase index up to date (no source change) — skipped.")
-        return 0
+
+def _refresh(root, cache, engine='auto', jobs=None, quiet_skip=False):
+    """One mechanical refresh against `cache`; returns the cache payload now on disk."""
+    index_path = Path(root) / OUTPUT_PATH
+    scanned_ns = time.time_ns()
+    snapshot = scan_tree(root, walk_sources=(engine == 'fs'))
+    digest, state = compute_source_digest(root, cache, engine, snapshot, jobs)
+    if cache.get('sourceDigest') == digest:
+        # Persist re-stat'd / racily-clean entries (e.g. a touched-but-identical
+        # file) and the latest indexed HEAD so the next run doesn't redo that
+        # work; the index itself is untouched.
+        if 'mechanicalDigest' in cache:
+            state['mechanicalDigest'] = cache['mechanicalDigest']
+        if _cache_is_stale(cache, state):
+            ensure_cache_gitignore(root)
+            cache = write_cache(root, digest, state, scanned_ns)
+        _maintain_import_graph(root, snapshot, digest)
+        maintain_shards(root, snapshot)
+        if not quiet_skip:
+            print("Codebase index up to date (no source change) — skipped.")
+        return cache
 
     try:
         existing = json.loads(index_path.read_text(encoding='utf-8'))
@@ -337,10 +1258,26 @@ def refresh_mechanical(root):
             raise ValueError("index is not an object")
     except Exception as e:
         print(f"Existing index unreadable ({e}) — leaving it untouched.")
-        return 0
+        return cache
 
     # Refresh mechanical fields; preserve judgment fields byte-for-byte.
-    existing.update(build_mechanical(root))
+    mechanical = build_mechanical(root, snapshot, with_symbols='symbols' in existing)
+    _maintain_import_graph(root, snapshot, digest)
+    maintain_shards(root, snapshot)
+    dropped = [k for k in CONDITIONAL_MECHANICAL_FIELDS if k in existing and k not in mechanical]
+    state['mechanicalDigest'] = mechanical_digest(mechanical)
+    if not dropped and state['mechanicalDigest'] == mechanical_digest(
+            {k: existing.get(k) for k in mechanical}):
+        # Content moved but the derived fields didn't (e.g. a function body was
+        # edited): leave the index — and its mtime, and git diff — alone.
+        ensure_cache_gitignore(root)
+        cache = write_cache(root, digest, state, scanned_ns)
+        if not quiet_skip:
+            print("Codebase index mechanical fields unchanged — not rewritten.")
+        return cache
+    existing.update(mechanical)
+    for field in dropped:
+        del existing[field]
     existing['mechanicalRefreshedAt'] = datetime.now().strftime('%Y-%m-%d')
     # Back-compat: pre-existing indexes won't have fullRefreshedAt. Seed it from
     # `generated` so the SessionStart staleness check has something to key off.
@@ -349,22 +1286,170 @@ def refresh_mechanical(root):
 
     _atomic_write_json(index_path, existing)
     ensure_cache_gitignore(root)
-    write_cache(root, digest)
+    cache = write_cache(root, digest, state, scanned_ns)
     print(f"OK Codebase index mechanical fields refreshed ({existing['mechanicalRefreshedAt']}).")
+    return cache
+
+
+# ─── Watch mode (long-running, event-driven refresh) ────────────────────────
+
+# Hooks treat the watcher as live while its pid file is younger than this; the
+# watcher rewrites it every WATCH_HEARTBEAT seconds, so a killed watcher stops
+# suppressing hook refreshes within WATCH_STALE seconds.
+WATCH_HEARTBEAT = 10
+WATCH_STALE = 30
+
+
+def watcher_alive(root):
+    """True when a --watch process is keeping this index fresh (fresh heartbeat)."""
+    try:
+        age = time.time() - os.stat(Path(root) / WATCH_PID_PATH).st_mtime
+    except OSError:
+        return False
+    return age < WATCH_STALE
+
+
+def _write_heartbeat(root, mode):
+    _atomic_write_json(Path(root) / WATCH_PID_PATH,
+                       {'pid': os.getpid(), 'mode': mode, 'beatAt': datetime.now().isoformat()})
+
+
+# Workspace packages carry their own config files (packages/web/package.json).
+_CONFIG_NAMES = {c.rpartition('/')[2] for c in CONFIG_CANDIDATES}
+
+
+def _watch_relevant(rel):
+    """Could a change at rel (dir events end in '/') move a mechanical field?"""
+    if rel.endswith('/'):
+        return not rel.startswith('.shipkit/')
+    if rel.startswith(CACHE_DIR + '/') or rel == OUTPUT_PATH:
+        return False  # our own writes
+    name = rel.rpartition('/')[2]
+    return (Path(name).suffix in SOURCE_EXTENSIONS or name == '.gitignore'
+            or rel in CONFIG_CANDIDATES or name in _CONFIG_NAMES or rel == INDEX_IGNORE_PATH
+            or rel in ('.git/index', '.git/HEAD'))
+
+
+def _watch_refresh(root, cache, engine, jobs, quiet_skip=True):
+    """_refresh for the watcher, single-flighted like refresh_mechanical() so it
+    never races a hook-driven refresh. When one covered this change, the cache
+    it left on disk becomes the watcher's."""
+    with _single_flight(root) as needed:
+        if needed:
+            return _refresh(root, cache, engine, jobs, quiet_skip=quiet_skip)
+    return read_cache(root)
+
+
+def watch(root, engine='auto', jobs=None, interval=2.0, debounce=0.5):
+    """Keep the mechanical fields fresh until interrupted.
+
+    Subscribes to inotify where available (see _watch.py) and otherwise polls
+    every `interval` seconds — cheap, since an unchanged tree costs a stat per
+    file. Bursts of events (a checkout, a formatter run) are debounced: the
+    refresh runs once the tree has been quiet for `debounce` seconds. The cache
+    stays in memory between refreshes, so the manifest is never re-read, and
+    the index is rewritten (atomically) only when the digest moved. If inotify
+    runs out of watches mid-run, the loop carries on polling. While running,
+    the heartbeat file at WATCH_PID_PATH tells the commit and SessionStart hooks
+    to skip their own refresh; refreshes are single-flighted with theirs anyway,
+    for a hook that started before the heartbeat did.
+    """
+    if not (Path(root) / OUTPUT_PATH).exists():
+        print("No codebase-index.json yet — nothing to watch (run /shipkit-codebase-index).")
+        return 0
+    if watcher_alive(root):
+        print(f"A watcher is already running ({WATCH_PID_PATH}) — exiting.")
+        return 0
+
+    cache = _watch_refresh(root, read_cache(root), engine, jobs, quiet_skip=False)
+    watcher = open_watcher(root, load_ignore(root), extra_dirs=('.git',))
+    mode = 'inotify' if watcher is not None else 'poll'
+    print(f"Watching {root} ({mode}) — Ctrl-C to stop.")
+    # SIGTERM unwinds like Ctrl-C, so the heartbeat file is removed either way.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    _write_heartbeat(root, mode)
+    last_beat = time.monotonic()
+    try:
+        while True:
+            if watcher is None:
+                time.sleep(interval)
+                cache = _watch_refresh(root, cache, engine, jobs)
+            else:
+                changed = watcher.wait(WATCH_HEARTBEAT)
+                if changed is not FALLBACK and (
+                        changed is OVERFLOW or any(_watch_relevant(rel) for rel in changed)):
+                    # Drain the burst, then refresh once.
+                    changed = watcher.wait(debounce)
+                    while changed and changed is not FALLBACK:
+                        changed = watcher.wait(debounce)
+                    cache = _watch_refresh(root, cache, engine, jobs)
+                if changed is FALLBACK:
+                    # Out of inotify watches (the watcher closed itself): poll from
+                    # here on, starting with a refresh for what it couldn't see.
+                    watcher, mode = None, 'poll'
+                    print("inotify watch limit reached — switching to polling.")
+                    _write_heartbeat(root, mode)
+                    cache = _watch_refresh(root, cache, engine, jobs)
+            if time.monotonic() - last_beat >= WATCH_HEARTBEAT:
+                _write_heartbeat(root, mode)
+                last_beat = time.monotonic()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        if watcher is not None:
+            watcher.close()
+        try:
+            os.unlink(Path(root) / WATCH_PID_PATH)
+        except OSError:
+            pass
     return 0
 
 
 def main(argv):
-    root = run_git(['rev-parse', '--show-toplevel']).strip()
+    parser = argparse.ArgumentParser(description="Generate / refresh .shipkit/codebase-index.json")
+    parser.add_argument('--refresh-mechanical', action='store_true',
+                        help="refresh only the mechanical fields (no LLM); skip when unchanged")
+    parser.add_argument('--engine', choices=('auto', 'git', 'fs'), default='auto',
+                        help="change-detection engine: git plumbing or filesystem walk "
+                             "(default: auto — git, falling back to fs)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help=f"threads for hashing changed files (default: {DEFAULT_JOBS}; 1 = serial)")
+    parser.add_argument('--symbols', action='store_true',
+                        help="full run: also build the optional exported-symbol layer")
+    parser.add_argument('--find-symbol', metavar='NAME',
+                        help="look NAME up in the symbol sidecar and print file:line")
+    parser.add_argument('--imports', action='store_true',
+                        help="full run: also build the import graph")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument('--importers', metavar='FILE', help="files that import FILE directly")
+    query.add_argument('--dependents', metavar='FILE',
+                       help="files that depend on FILE, transitively")
+    query.add_argument('--near', metavar='FILE',
+                       help="files within --hops import edges of FILE (either direction)")
+    parser.add_argument('--hops', type=int, default=1, help="radius for --near (default: 1)")
+    parser.add_argument('--watch', action='store_true',
+                        help="stay running and refresh the mechanical fields as files change")
+    parser.add_argument('--interval', type=float, default=2.0,
+                        help="--watch polling interval in seconds when inotify is unavailable (default: 2)")
+    args = parser.parse_args(argv)
+
+    root = find_root()
     if not root:
         print("Error: Not a git repository")
         return 1
-    root = root.replace('/', os.sep)
+    cwd = os.getcwd()
     os.chdir(root)
 
-    if '--refresh-mechanical' in argv:
-        return refresh_mechanical(root)
-    return generate_full(root)
+    if args.find_symbol:
+        return find_symbol(root, args.find_symbol)
+    for query in ('importers', 'dependents', 'near'):
+        if getattr(args, query):
+            return query_import_graph(root, query, getattr(args, query), args.hops, cwd)
+    if args.watch:
+        return watch(root, args.engine, args.jobs, args.interval)
+    if args.refresh_mechanical:
+        return refresh_mechanical(root, args.engine, jobs=args.jobs)
+    return generate_full(root, args.engine, args.symbols, args.imports, args.jobs)
 
 
 if __name__ == '__main__':
@@ -582,6 +582,11 @@ def install_shared_core(repo_root, target_dir, language, edition):
 
     # Install shipkit hooks
     shutil.copy2(hooks_src / "shipkit-session-start.py", hooks_dest / "session-start.py")
+    shutil.copy2(hooks_src / "shipkit_runtime.py", hooks_dest / "shipkit_runtime.py")
+    shutil.copy2(hooks_src / "shipkit_usage.py", hooks_dest / "shipkit_usage.py")
+    shutil.copy2(hooks_src / "shipkit-hook.py", hooks_dest / "shipkit-hook.py")
+    shutil.copy2(hooks_src / "shipkit-hookd.py", hooks_dest / "shipkit-hookd.py")
+    shutil.copy2(hooks_src / "shipkit-artifacts.py", hooks_dest / "shipkit-artifacts.py")
     shutil.copy2(hooks_src / "shipkit-track-skill-usage.py", hooks_dest / "shipkit-track-skill-usage.py")
     shutil.copy2(hooks_src / "shipkit-teammate-idle-hook.py", hooks_dest / "shipkit-teammate-idle-hook.py")
     shutil.copy2(hooks_src / "shipkit-task-completed-hook.py", hooks_dest / "shipkit-task-completed-hook.py")
@@ -845,7 +850,7 @@ def _build_hooks_config():
                 "hooks": [
                     {
                         "type": "command",
-                        "command": "python -X utf8 .claude/hooks/session-start.py"
+                        "command": "python -X utf8 .claude/hooks/shipkit-hook.py session-start.py"
                     }
                 ]
             }
@@ -856,7 +861,7 @@ def _build_hooks_config():
                 "hooks": [
                     {
                         "type": "command",
-                        "command": "python -X utf8 .claude/hooks/shipkit-track-skill-usage.py"
+                        "command": "python -X utf8 .claude/hooks/shipkit-hook.py shipkit-track-skill-usage.py"
                     }
                 ]
             }
@@ -878,7 +883,7 @@ def _build_hooks_config():
                 "hooks": [
                     {
                         "type": "command",
-                        "command": "python -X utf8 .claude/hooks/shipkit-teammate-idle-hook.py"
+                        "command": "python -X utf8 .claude/hooks/shipkit-hook.py shipkit-teammate-idle-hook.py"
                     }
                 ]
             }
@@ -888,7 +893,7 @@ def _build_hooks_config():
                 "hooks": [
                     {
                         "type": "command",
-                        "command": "python -X utf8 .claude/hooks/shipkit-task-completed-hook.py",
+                        "command": "python -X utf8 .claude/hooks/shipkit-hook.py shipkit-task-completed-hook.py",
                         "timeout": 120
                     }
                 ]